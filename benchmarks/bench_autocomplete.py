@@ -0,0 +1,53 @@
+"""Benchmarks PrefixIndex.complete, which serves the job number and parcel
+ID suggestions on every pause in typing, against the number of stored
+values. Each lookup should take well under 5 ms.
+
+Run from the repository root with:
+    python -m benchmarks.bench_autocomplete
+"""
+
+import random
+import timeit
+
+from helpers.autocomplete import PrefixIndex
+
+from .bench_job_number_index import build_job_storage
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+REPEATS = 10_000
+
+
+def main() -> None:
+    print(
+        f"{'stored values':>15} {'build (s)':>10} "
+        f"{'complete (us)':>14} {'worst prefix (us)':>18}"
+    )
+    for size in SIZES:
+        job_numbers = list(build_job_storage(size).current_year_job_numbers)
+        build_seconds = timeit.timeit(
+            lambda: PrefixIndex(job_numbers), number=1
+        )
+        index = PrefixIndex(job_numbers)
+
+        randomizer = random.Random(size)
+        prefixes = [
+            job_number[: randomizer.randrange(1, 9)]
+            for job_number in randomizer.choices(job_numbers, k=REPEATS)
+        ]
+        prefix_iterator = iter(prefixes)
+        seconds = timeit.timeit(
+            lambda: index.complete(next(prefix_iterator)), number=REPEATS
+        )
+        # A single character matches a tenth of the stored values.
+        worst_seconds = timeit.timeit(
+            lambda: index.complete("2"), number=REPEATS
+        )
+        print(
+            f"{size:>15,} {build_seconds:>10.2f} "
+            f"{seconds / REPEATS * 1_000_000:>14.2f} "
+            f"{worst_seconds / REPEATS * 1_000_000:>18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmarks JobNumberGenerator.unused_job_number and memory use against
+the number of stored job numbers, for both storage backends.
+
+Run from the repository root with:
+    python -m benchmarks.bench_job_number_index
+"""
+
+import random
+import timeit
+
+from helpers.compact_job_number_storage import CompactJobNumbers
+from helpers.job_number_generator import JobNumberGenerator
+from helpers.job_number_storage import JobNumbers
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+REPEATS = 1_000
+
+
+def build_job_storage(size: int, storage_class=JobNumbers) -> JobNumbers:
+    """Returns a job storage object filled with `size` random job numbers
+    spread over the last hundred years."""
+    randomizer = random.Random(size)
+    job_numbers = set()
+    while len(job_numbers) < size:
+        year = randomizer.randrange(100)
+        month = randomizer.randrange(1, 13)
+        sequence = randomizer.randrange(10_000)
+        job_numbers.add(f"{year:02d}{month:02d}{sequence:04d}")
+
+    job_storage = storage_class()
+    job_storage.add_current_year_job_numbers(
+        [(job_number,) for job_number in job_numbers]
+    )
+    return job_storage
+
+
+def main() -> None:
+    print(
+        f"{'backend':>18} {'stored numbers':>15} "
+        f"{'unused_job_number (us)':>24} {'memory (MB)':>12}"
+    )
+    for storage_class in (JobNumbers, CompactJobNumbers):
+        for size in SIZES:
+            job_storage = build_job_storage(size, storage_class)
+            job_generator = JobNumberGenerator(job_storage)
+            seconds = timeit.timeit(
+                lambda: job_generator.unused_job_number, number=REPEATS
+            )
+            print(
+                f"{storage_class.__name__:>18} {size:>15,} "
+                f"{seconds / REPEATS * 1_000_000:>24.2f} "
+                f"{job_storage.memory_usage() / 1_000_000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Benchmarks the job number, form input and database paths against
+synthetic datasets, using a SQLite database with the same tables as the
+Access database. Results are saved per commit, so a later run can be
+compared against them.
+
+Run from the repository root with:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --sizes 10000 --compare <commit>
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+from typing import Callable
+
+from helpers.job_number_generator import JobNumberGenerator
+from helpers.job_number_storage import JobNumbers
+from helpers.sqlite_database import SQLiteDatabaseConnection
+
+from .datasets import generate_job_numbers, generate_job_records
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# Jobs submitted through insert_new_job at each size.
+SUBMITTED_JOBS = 200
+LOAD_BATCH_SIZE = 10_000
+# A benchmark this many times slower than before is a regression.
+REGRESSION_THRESHOLD = 1.25
+
+
+class BenchmarkSkipped(Exception):
+    """Raised when a benchmark cannot run in this environment."""
+
+
+def measure(function: Callable, number: int, repeat: int = 5) -> float:
+    """Returns the fastest time, in seconds, of one call of a function
+    over several repeats."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def bench_job_number_adds(job_numbers: list[str]) -> float:
+    """Times adding every job number to a JobNumbers object in bulk."""
+    rows = [(job_number,) for job_number in job_numbers]
+    return measure(
+        lambda: JobNumbers().add_existing_job_numbers(rows), 1, repeat=3
+    )
+
+
+def bench_unused_job_number(job_numbers: list[str]) -> float:
+    """Times finding the next unused job number."""
+    job_storage = JobNumbers()
+    job_storage.add_existing_job_numbers(
+        [(job_number,) for job_number in job_numbers]
+    )
+    job_generator = JobNumberGenerator(job_storage)
+    return measure(lambda: job_generator.unused_job_number, 1_000)
+
+
+def bench_user_inputs() -> float:
+    """Times reading the values of the main window's form."""
+    try:
+        import ttkbootstrap as ttk
+
+        from helpers.user_input_storage import UserInputStorage
+
+        app = ttk.Window()
+    except Exception as error:
+        # ttkbootstrap is missing or there is no display to open.
+        raise BenchmarkSkipped(str(error)) from error
+
+    try:
+        app.withdraw()
+        input_objects = {
+            "job_date": ttk.DateEntry(app),
+            "fieldwork_date": ttk.DateEntry(app),
+        }
+        for name in ("job_number", "parcel_id", "entry_by", "inhouse_status"):
+            input_objects[name] = ttk.Entry(app)
+            input_objects[name].insert(0, name)
+        for name in ("requested_services", "contact_info", "additional_info"):
+            input_objects[name] = ttk.Text(app)
+            input_objects[name].insert("1.0", f"{name}\n" * 5)
+        input_storage = UserInputStorage(input_objects)
+        return measure(lambda: input_storage.inputs, 1_000)
+    finally:
+        app.destroy()
+
+
+def bench_database(
+    job_numbers: list[str], submitted_job_numbers: list[str]
+) -> dict[str, float]:
+    """Loads the job numbers into a SQLite database, then times submitting
+    new jobs and submitting existing jobs again through insert_new_job.
+    The parcel data is passed in, so no county lookups are made."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        database = SQLiteDatabaseConnection(
+            os.path.join(directory, "jobs.sqlite")
+        )
+        try:
+            records = generate_job_records(job_numbers)
+            started_at = timeit.default_timer()
+            while True:
+                batch = list(itertools.islice(records, LOAD_BATCH_SIZE))
+                if not batch:
+                    break
+                database.insert_jobs(batch)
+            results["sqlite.insert_jobs"] = (
+                timeit.default_timer() - started_at
+            ) / len(job_numbers)
+
+            for name, submitted, exists in (
+                ("sqlite.insert_new_job", submitted_job_numbers, False),
+                (
+                    "sqlite.insert_new_job.update",
+                    job_numbers[:SUBMITTED_JOBS],
+                    True,
+                ),
+            ):
+                records = list(generate_job_records(submitted, seed=1))
+                started_at = timeit.default_timer()
+                for record in records:
+                    database.insert_new_job(
+                        record, dict(record), True, exists, exists
+                    )
+                results[name] = (
+                    timeit.default_timer() - started_at
+                ) / len(records)
+        finally:
+            database.close()
+    return results
+
+
+def run_benchmarks(sizes: list[int]) -> dict:
+    """Runs every benchmark and returns the results, in seconds per
+    call, keyed by benchmark name and dataset size."""
+    results = {}
+    skipped = {}
+
+    def add_result(name: str, size: int | None, seconds: float) -> None:
+        key = "any" if size is None else str(size)
+        results.setdefault(name, {})[key] = seconds
+        print(f"{name:>40} {key:>10} {seconds * 1_000_000:>14.2f} us")
+
+    try:
+        add_result("user_input_storage.inputs", None, bench_user_inputs())
+    except BenchmarkSkipped as error:
+        skipped["user_input_storage.inputs"] = str(error)
+        print(f"{'user_input_storage.inputs':>40} skipped: {error}")
+
+    for size in sizes:
+        job_numbers = generate_job_numbers(size + SUBMITTED_JOBS, seed=size)
+        job_numbers, submitted_job_numbers = (
+            job_numbers[:size],
+            job_numbers[size:],
+        )
+        add_result(
+            "job_numbers.add_existing",
+            size,
+            bench_job_number_adds(job_numbers),
+        )
+        add_result(
+            "job_number_generator.unused_job_number",
+            size,
+            bench_unused_job_number(job_numbers),
+        )
+        for name, seconds in bench_database(
+            job_numbers, submitted_job_numbers
+        ).items():
+            add_result(name, size, seconds)
+
+    return {
+        "commit": current_commit(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def current_commit() -> str:
+    """Returns the short hash of the checked out commit, ending in
+    "-dirty" if tracked files have been changed since."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if changes else commit
+
+
+def results_path(reference: str) -> str:
+    """Returns the path of a results file, given either its path or the
+    commit it was recorded at."""
+    if os.path.isfile(reference):
+        return reference
+    return os.path.join(RESULTS_DIRECTORY, f"{reference}.json")
+
+
+def compare_results(
+    current: dict, previous: dict, threshold: float = REGRESSION_THRESHOLD
+) -> list[str]:
+    """Prints how each benchmark changed since a previous run, and returns
+    the benchmarks that became slower by more than the threshold."""
+    regressions = []
+    print(f"\nCompared with {previous['commit']}:")
+    for name, sizes in sorted(current["results"].items()):
+        for size, seconds in sizes.items():
+            previous_seconds = previous["results"].get(name, {}).get(size)
+            if not previous_seconds:
+                continue
+            ratio = seconds / previous_seconds
+            flag = ""
+            if ratio > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name}[{size}]")
+            print(f"{name:>40} {size:>10} {ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES
+    )
+    parser.add_argument(
+        "--output",
+        help="Where to save the results. Defaults to "
+        "benchmarks/results/<commit>.json.",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="COMMIT_OR_FILE",
+        help="Compare with the results saved for a commit.",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=REGRESSION_THRESHOLD
+    )
+    arguments = parser.parse_args()
+
+    current = run_benchmarks(arguments.sizes)
+
+    output_path = arguments.output or results_path(current["commit"])
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as results_file:
+        json.dump(current, results_file, indent=2)
+    print(f"\nSaved results to {output_path}")
+
+    if arguments.compare:
+        with open(
+            results_path(arguments.compare), encoding="utf-8"
+        ) as results_file:
+            previous = json.load(results_file)
+        if compare_results(current, previous, arguments.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
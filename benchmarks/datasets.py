@@ -0,0 +1,80 @@
+"""Generates synthetic job records for the benchmarks. Records hold every
+Existing Jobs and Active Jobs column, and the same job numbers and seed
+always give the same records."""
+
+import random
+from typing import Iterable, Iterator
+
+from config import ACTIVE_DB_COLUMN_ORDER, EXISTING_DB_COLUMN_ORDER
+
+STREETS = ["Main St", "Oak Ave", "Palm Dr", "Ocean Blvd", "Lake Rd"]
+SUBDIVISIONS = ["Harbor Pines", "Sunset Estates", "River Oaks", "Bayside"]
+COUNTIES = ["Brevard", "Volusia", "Indian River", "Orange"]
+ENTERED_BY = ["AB", "CD", "EF", "GH"]
+SERVICES = ["Boundary Survey", "Elevation Certificate", "Topographic Survey"]
+STATUSES = ["Not Started", "In Progress", "Complete"]
+
+
+def generate_job_numbers(size: int, seed: int = 0) -> list[str]:
+    """Returns `size` unique job numbers spread over the last hundred
+    years, in random order."""
+    randomizer = random.Random(seed)
+    job_numbers = set()
+    while len(job_numbers) < size:
+        year = randomizer.randrange(100)
+        month = randomizer.randrange(1, 13)
+        sequence = randomizer.randrange(10_000)
+        job_numbers.add(f"{year:02d}{month:02d}{sequence:04d}")
+    job_numbers = sorted(job_numbers)
+    randomizer.shuffle(job_numbers)
+    return job_numbers
+
+
+def generate_job_record(
+    job_number: str, randomizer: random.Random
+) -> dict[str, str]:
+    """Returns a job record with a value for every database column."""
+    year, month = int(job_number[:2]), int(job_number[2:4])
+    address_number = str(randomizer.randrange(1, 10_000))
+    street = randomizer.choice(STREETS)
+    record = {column: "" for column in EXISTING_DB_COLUMN_ORDER}
+    record.update({column: "" for column in ACTIVE_DB_COLUMN_ORDER})
+    record.update(
+        {
+            "job_date": f"{month:02d}/01/20{year:02d}",
+            "job_number": job_number,
+            "parcel_id": f"{randomizer.randrange(20, 30)}-"
+            f"{randomizer.randrange(34, 38)}-"
+            f"{randomizer.randrange(1, 37):02d}-"
+            f"{randomizer.randrange(100):02d}-"
+            f"{randomizer.randrange(1, 500)}",
+            "address_number": address_number,
+            "street": street,
+            "address": f"{address_number} {street}",
+            "zip_code": str(randomizer.randrange(32901, 32976)),
+            "county": randomizer.choice(COUNTIES),
+            "subdivision": randomizer.choice(SUBDIVISIONS),
+            "lot": str(randomizer.randrange(1, 200)),
+            "block": str(randomizer.randrange(1, 30)),
+            "plat_book": str(randomizer.randrange(1, 80)),
+            "plat_page": str(randomizer.randrange(1, 100)),
+            "legal_description": f"Lot {randomizer.randrange(1, 200)}"
+            " of a recorded plat",
+            "entry_by": randomizer.choice(ENTERED_BY),
+            "requested_services": randomizer.choice(SERVICES),
+            "inhouse_status": randomizer.choice(STATUSES),
+            "invoice_status": randomizer.choice(STATUSES),
+            "contact_info": f"555-{randomizer.randrange(10_000):04d}",
+        }
+    )
+    return record
+
+
+def generate_job_records(
+    job_numbers: Iterable[str], seed: int = 0
+) -> Iterator[dict[str, str]]:
+    """Yields a job record for each job number. Records are generated one
+    at a time, so a million of them never have to fit in memory."""
+    randomizer = random.Random(seed)
+    for job_number in job_numbers:
+        yield generate_job_record(job_number, randomizer)
@@ -1,10 +1,137 @@
 """This module contains the configuration variables for the application."""
+import os
 
 WINDOW_WIDTH = 500
-WINDOW_HEIGHT = 600
+WINDOW_HEIGHT = 720
 
 DATABASE_PATH = r"\\Server\access\Database Backup\MainDB_be.accdb"
 
+# Local application data, such as cached job numbers.
+APP_DATA_DIRECTORY = os.path.join(
+    os.path.expanduser("~"), ".job_record_manager"
+)
+JOB_NUMBER_SNAPSHOT_PATH = os.path.join(
+    APP_DATA_DIRECTORY, "job_numbers.json"
+)
+# Number of hours between full reloads of the job number tables, which
+# pick up job numbers deleted from the database.
+FULL_SYNC_INTERVAL_HOURS = 24
+# Parcel lookups are cached locally so recently seen parcels skip the
+# remote county lookup.
+PARCEL_CACHE_PATH = os.path.join(APP_DATA_DIRECTORY, "parcel_cache.sqlite3")
+PARCEL_CACHE_MAX_ENTRIES = 5000
+PARCEL_CACHE_TTL_HOURS = 72
+# Parcel IDs matching this pattern are looked up in the background once
+# the operator has stopped typing for PARCEL_PREFETCH_DELAY_MS.
+PARCEL_ID_PATTERN = r"[0-9A-Za-z][0-9A-Za-z.\-]{9,}"
+PARCEL_PREFETCH_DELAY_MS = 600
+# Bulk imports commit once per batch of this many rows, and look up
+# parcels for a batch on this many threads at once.
+BULK_IMPORT_BATCH_SIZE = 200
+BULK_IMPORT_PARCEL_WORKERS = 8
+# pyodbc's fast_executemany sends a whole batch in one call, but not every
+# ODBC driver supports it. Enable it only if the Access driver in use does.
+FAST_EXECUTEMANY = False
+# Exports fetch and write this many rows at a time.
+EXPORT_BATCH_SIZE = 1000
+# Database connection pool. Connections idle for longer than
+# POOL_HEALTH_CHECK_AFTER_SECONDS are checked before reuse; set it to 0 to
+# check on every checkout at the cost of an extra round trip per query.
+POOL_MAX_SIZE = 4
+POOL_IDLE_TIMEOUT_SECONDS = 300
+POOL_CHECKOUT_TIMEOUT_SECONDS = 30
+POOL_HEALTH_CHECK_AFTER_SECONDS = 10
+POOL_CONNECT_RETRIES = 3
+POOL_CONNECT_BACKOFF_SECONDS = 0.5
+# Recently fetched Existing Jobs rows are kept in memory. When warm-up is
+# enabled, the current month's jobs are loaded in the background at start.
+ROW_CACHE_MAX_ENTRIES = 500
+ROW_CACHE_WARM_UP = True
+# Existing Jobs columns indexed for the job search panel, and the most
+# results it shows.
+SEARCH_COLUMNS = [
+    "job_number",
+    "address_number",
+    "street",
+    "parcel_id",
+    "subdivision",
+    "contact_info",
+]
+SEARCH_MAX_RESULTS = 50
+# Shorter search words only match whole words, as a prefix of one or two
+# characters matches most of the index.
+SEARCH_MIN_PREFIX_LENGTH = 3
+SEARCH_DELAY_MS = 150
+# Suggestions shown under the job number and parcel ID entries, and how
+# long typing must pause before they are refreshed.
+AUTOCOMPLETE_MAX_SUGGESTIONS = 8
+AUTOCOMPLETE_DELAY_MS = 80
+# Timings of database calls, parcel lookups and actions are logged as JSON
+# lines, and a summary with percentiles is written when the app closes
+# (as Prometheus text if the path ends in .prom). Use None to turn either
+# off. The log is rotated at METRICS_LOG_MAX_BYTES, keeping
+# METRICS_LOG_BACKUP_COUNT old files. METRICS_SAMPLE_SIZE recent timings
+# per operation are kept.
+METRICS_LOG_PATH = os.path.join(APP_DATA_DIRECTORY, "timings.log")
+METRICS_LOG_MAX_BYTES = 5 * 1024 * 1024
+METRICS_LOG_BACKUP_COUNT = 2
+METRICS_DUMP_PATH = os.path.join(APP_DATA_DIRECTORY, "metrics.json")
+METRICS_SAMPLE_SIZE = 1000
+# Job numbers are reserved in aligned blocks in a shared table, so
+# workstations never hand out the same number. Unused reservations expire.
+RESERVATION_BLOCK_SIZE = 10
+RESERVATION_TTL_HOURS = 12
+RESERVATION_MAX_ATTEMPTS = 100
+# Submissions are written to a local journal first and copied to the
+# database in batches by a background thread, retrying with a growing
+# delay while the share cannot be reached. A job that fails for its own
+# reason, such as a failed parcel lookup, is set aside after
+# JOURNAL_MAX_ATTEMPTS tries and kept in the journal.
+SUBMISSION_JOURNAL_PATH = os.path.join(
+    APP_DATA_DIRECTORY, "submission_journal.sqlite3"
+)
+JOURNAL_BATCH_SIZE = 50
+JOURNAL_RETRY_SECONDS = 2
+JOURNAL_MAX_RETRY_SECONDS = 60
+JOURNAL_MAX_ATTEMPTS = 5
+JOURNAL_POLL_MS = 500
+# The GUI can use a job records service running on this computer, which
+# keeps the job numbers, search index and database connections warm
+# between sessions, instead of loading them itself. Start it with
+# `python -m jobrecords serve` and set SERVICE_URL to its address, e.g.
+# "http://127.0.0.1:8765"; use None to connect to the database directly.
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_URL = None
+SERVICE_TIMEOUT_SECONDS = 30
+# The Active Jobs browser reads rows a page at a time, keeps the most
+# recently viewed pages in memory and shows this many rows at once. It can
+# be sorted by the job number or any of the filter columns, and shows the
+# browser columns.
+ACTIVE_JOBS_PAGE_SIZE = 200
+ACTIVE_JOBS_CACHED_PAGES = 20
+ACTIVE_JOBS_VISIBLE_ROWS = 20
+ACTIVE_JOBS_FILTER_COLUMNS = [
+    "inhouse_status",
+    "invoice_status",
+    "fieldwork_date",
+]
+ACTIVE_JOBS_BROWSER_COLUMNS = [
+    "job_number",
+    "job_date",
+    "address",
+    "fieldwork_date",
+    "inhouse_status",
+    "invoice_status",
+]
+# The workload dashboard's counts are taken once, at start up if
+# WORKLOAD_COUNT_ON_START is set and otherwise when it is first opened,
+# and kept up to date as jobs are written. It shows this many months.
+WORKLOAD_COUNT_ON_START = True
+WORKLOAD_MONTHS_SHOWN = 24
+# Store job numbers as one bitmap per month instead of sets of strings.
+COMPACT_JOB_NUMBER_STORAGE = False
+
 EXISTING_DB_COLUMN_ORDER = [
     "job_date",
     "address_number",
@@ -24,6 +151,28 @@ EXISTING_DB_COLUMN_ORDER = [
     "benchmark",
 ]
 
+# Access column names for each field. Column order for inserts comes
+# from the lists below; these names are used to build UPDATE and SELECT
+# statements.
+EXISTING_DB_COLUMN_NAMES = {
+    "job_date": "Job Date",
+    "address_number": "Address Number",
+    "street": "Street",
+    "job_number": "Job Number",
+    "parcel_id": "Parcel ID",
+    "subdivision": "subdivision",
+    "lot": "Lot",
+    "block": "block",
+    "plat_book": "Plat Book",
+    "plat_page": "Plat Page",
+    "legal_description": "Legal Description",
+    "entry_by": "Entry By",
+    "additional_info": "Additional Information",
+    "contact_info": "Customer Contact Information",
+    "requested_services": "Requested Services",
+    "benchmark": "Benchmark",
+}
+
 ACTIVE_DB_COLUMN_ORDER = [
     "job_date",
     "job_number",
@@ -44,3 +193,38 @@ ACTIVE_DB_COLUMN_ORDER = [
     "subdivision",
     "deed",
 ]
+
+ACTIVE_DB_COLUMN_NAMES = {
+    "job_date": "Job Date",
+    "job_number": "Job Number",
+    "parcel_id": "Parcel ID",
+    "county": "County",
+    "address": "Address",
+    "zip_code": "Zip Code",
+    "requested_services": "Requested Services",
+    "fieldwork_date": "Fieldwork Date",
+    "inhouse_status": "Inhouse Status",
+    "invoice_status": "Invoice Status",
+    "contact_info": "Customer Contact Information",
+    "legal_description": "Legal Description",
+    "additional_info": "Additional Information",
+    "property_appraiser": "Property Appraiser",
+    "map": "Map",
+    "fema_map": "FEMA Map",
+    "subdivision": "Subdivision",
+    "deed": "Deed",
+}
+
+RESERVATION_DB_COLUMN_ORDER = [
+    "block_start",
+    "workstation",
+    "reserved_at",
+    "expires_at",
+]
+
+RESERVATION_DB_COLUMN_NAMES = {
+    "block_start": "Block Start",
+    "workstation": "Workstation",
+    "reserved_at": "Reserved At",
+    "expires_at": "Expires At",
+}
@@ -0,0 +1,267 @@
+"""This module contains the ActiveJobPages class, which reads the Active
+Jobs table a page at a time for the jobs browser. Sorting and filtering
+are done by the database, and each page is found from the last row of
+the page before it, so a page costs the same however far down it is."""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from config import (
+    ACTIVE_DB_COLUMN_ORDER,
+    ACTIVE_JOBS_CACHED_PAGES,
+    ACTIVE_JOBS_FILTER_COLUMNS,
+    ACTIVE_JOBS_PAGE_SIZE,
+)
+
+from .records import record_type
+from .sql_statements import ACTIVE_JOBS, count_statement, page_statement
+
+KEY_COLUMN = "job_number"
+SORT_COLUMNS = (KEY_COLUMN, *ACTIVE_JOBS_FILTER_COLUMNS)
+FILTER_OPERATORS = ("=", "<", "<=", ">", ">=", "LIKE")
+
+
+class ActiveJobPages:
+    """This class serves Active Jobs rows by position for a sort order and
+    a set of filters. The position of every page read so far is kept as
+    the (sort value, job number) of its last row, so pages can be read
+    again in any order, and recently read pages are kept in memory.
+    Pages may be read on a background thread while the GUI thread reads
+    the cached ones."""
+
+    def __init__(
+        self,
+        database,
+        columns: Iterable[str] = None,
+        page_size: int = ACTIVE_JOBS_PAGE_SIZE,
+        max_cached_pages: int = ACTIVE_JOBS_CACHED_PAGES,
+    ):
+        """
+        Initializes the ActiveJobPages object.
+
+        Args:
+            database (DatabaseConnection): The database to read from.
+            columns (Iterable[str], optional): The columns of each row.
+                Defaults to every Active Jobs column.
+            page_size (int, optional): Rows read per query.
+            max_cached_pages (int, optional): Pages kept in memory.
+        """
+        self.database = database
+        self.columns = tuple(columns or ACTIVE_DB_COLUMN_ORDER)
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self.lock = threading.Lock()
+        # Incremented on every change of query, so pages read for an
+        # earlier query are not stored.
+        self.generation = 0
+        self.set_query()
+
+    def set_query(
+        self,
+        sort_column: str = KEY_COLUMN,
+        descending: bool = False,
+        filters: Iterable[tuple[str, str, object]] = (),
+    ) -> None:
+        """
+        Sets the order and filters of the rows, forgetting every page
+        read so far.
+
+        Args:
+            sort_column (str, optional): The column to sort by, one of
+                SORT_COLUMNS. Ties are sorted by job number.
+            descending (bool, optional): Whether to sort in descending
+                order.
+            filters (Iterable[tuple[str, str, object]], optional):
+                (column, operator, value) conditions every row must meet,
+                e.g. ("inhouse_status", "=", "Drafting"). The columns
+                must be in ACTIVE_JOBS_FILTER_COLUMNS.
+        """
+        filters = tuple(filters)
+        if sort_column not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort Active Jobs by {sort_column}")
+        for column, operator, _ in filters:
+            if column not in ACTIVE_JOBS_FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter Active Jobs by {column}")
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unknown filter operator {operator}")
+
+        selected = self.columns + tuple(
+            column
+            for column in dict.fromkeys((sort_column, KEY_COLUMN))
+            if column not in self.columns
+        )
+        with self.lock:
+            self.generation += 1
+            self.sort_column = sort_column
+            self.descending = descending
+            self.where = tuple(
+                (column, operator) for column, operator, _ in filters
+            )
+            self.filter_values = tuple(value for _, _, value in filters)
+            self.selected_columns = selected
+            self.make_record = record_type(ACTIVE_JOBS, selected)._make
+            self.total = None
+            self.pages = OrderedDict()
+            # boundaries[index] is the (sort value, job number) of the
+            # last row of page index, known for every full page read.
+            self.boundaries = []
+
+    def count(self) -> int:
+        """Returns the number of rows matching the filters."""
+        with self.lock:
+            if self.total is not None:
+                return self.total
+            generation = self.generation
+            statement = count_statement(ACTIVE_JOBS, self.where)
+            parameters = self.filter_values
+        total = self.database.execute_query(statement, parameters)[0][0]
+        with self.lock:
+            if generation == self.generation:
+                self.total = total
+        return total
+
+    def cached_rows(self, start: int, stop: int) -> list[tuple] | None:
+        """Returns the rows from position start up to stop if every page
+        holding them is in memory, or None if any must be read first."""
+        rows = []
+        with self.lock:
+            for index in self.page_indexes(start, stop):
+                page = self.pages.get(index)
+                if page is None:
+                    return None
+                self.pages.move_to_end(index)
+                rows.extend(page)
+            first_index = start // self.page_size
+        offset = start - first_index * self.page_size
+        return rows[offset : offset + stop - start]
+
+    def rows(self, start: int, stop: int) -> list[tuple]:
+        """Returns the rows from position start up to stop, reading the
+        pages that are not in memory. Fewer rows are returned past the
+        end."""
+        rows = []
+        for index in self.page_indexes(start, stop):
+            page = self.page(index)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                break
+        offset = start - start // self.page_size * self.page_size
+        return rows[offset : offset + stop - start]
+
+    def page_indexes(self, start: int, stop: int) -> range:
+        """Returns the indexes of the pages holding the rows from position
+        start up to stop."""
+        if stop <= start:
+            return range(0)
+        return range(start // self.page_size, (stop - 1) // self.page_size + 1)
+
+    def page(self, index: int) -> list[tuple]:
+        """Returns the rows of a page, reading it if it is not in
+        memory."""
+        with self.lock:
+            if index in self.pages:
+                self.pages.move_to_end(index)
+                return self.pages[index]
+            generation = self.generation
+
+        if index > 0 and not self.seek(index - 1):
+            # The page is past the last row.
+            return []
+        with self.lock:
+            if generation != self.generation:
+                return []
+            after = self.boundaries[index - 1] if index else None
+            statement, parameters = self.statement(
+                self.selected_columns, after
+            )
+            make_record = self.make_record
+
+        _, batches = self.database.stream_query(
+            statement, parameters, batch_size=self.page_size
+        )
+        try:
+            rows = next(batches, [])
+        finally:
+            batches.close()
+        page = [make_record(row) for row in rows]
+
+        with self.lock:
+            if generation != self.generation:
+                return page
+            if len(page) == self.page_size and len(self.boundaries) == index:
+                self.boundaries.append(self.key(page[-1]))
+            self.pages[index] = page
+            while len(self.pages) > self.max_cached_pages:
+                self.pages.popitem(last=False)
+        return page
+
+    def seek(self, index: int) -> bool:
+        """
+        Finds the last row of a page without reading the pages before it
+        in full: only the sort value and job number of the rows after the
+        last known page are read. Returns False if the table ends before
+        that page is full.
+        """
+        with self.lock:
+            if index < len(self.boundaries):
+                return True
+            generation = self.generation
+            known = len(self.boundaries)
+            after = self.boundaries[-1] if known else None
+            key_columns = tuple(
+                dict.fromkeys((self.sort_column, KEY_COLUMN))
+            )
+            statement, parameters = self.statement(key_columns, after)
+
+        boundaries = []
+        rows_read = 0
+        _, batches = self.database.stream_query(
+            statement, parameters, batch_size=self.page_size
+        )
+        try:
+            for rows in batches:
+                for row in rows:
+                    rows_read += 1
+                    if rows_read % self.page_size == 0:
+                        boundaries.append((row[0], row[-1]))
+                if known + len(boundaries) > index:
+                    break
+        finally:
+            batches.close()
+
+        with self.lock:
+            if generation != self.generation:
+                return False
+            if len(self.boundaries) == known:
+                self.boundaries.extend(boundaries)
+            return index < len(self.boundaries)
+
+    def statement(
+        self, columns: tuple[str, ...], after: tuple | None
+    ) -> tuple[str, tuple]:
+        """Returns the statement and parameters reading rows after a
+        (sort value, job number) position, or from the first row. Must be
+        called with the lock held."""
+        if after is None:
+            kind, keyset_parameters = None, ()
+        elif self.sort_column == KEY_COLUMN:
+            kind, keyset_parameters = "value", (after[1],)
+        elif after[0] is None:
+            kind, keyset_parameters = "null", (after[1],)
+        else:
+            kind, keyset_parameters = "value", (after[0], after[0], after[1])
+        statement = page_statement(
+            ACTIVE_JOBS,
+            columns,
+            self.where,
+            self.sort_column,
+            KEY_COLUMN,
+            self.descending,
+            kind,
+        )
+        return statement, self.filter_values + keyset_parameters
+
+    def key(self, record: tuple) -> tuple:
+        """Returns the (sort value, job number) position of a row."""
+        return getattr(record, self.sort_column), record.job_number
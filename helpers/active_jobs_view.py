@@ -0,0 +1,242 @@
+"""This module contains the ActiveJobsView class, which shows the Active
+Jobs table in a Treeview that only ever holds the visible rows, so the
+table scrolls smoothly however many jobs there are."""
+
+from typing import Callable
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import END
+
+from config import ACTIVE_JOBS_VISIBLE_ROWS
+
+from .active_job_pages import SORT_COLUMNS, ActiveJobPages
+from .background_worker import BackgroundWorker
+
+# Rows moved by one notch of the mouse wheel.
+WHEEL_ROWS = 3
+
+
+class ActiveJobsView:
+    """This class fills a fixed set of Treeview rows with the jobs at the
+    current scroll position. Rows that are not in memory are read on the
+    background worker and shown when they arrive, and the scrollbar is
+    positioned from the number of matching jobs rather than from the
+    rows the Treeview holds."""
+
+    def __init__(
+        self,
+        treeview: ttk.Treeview,
+        scrollbar: ttk.Scrollbar,
+        pages: ActiveJobPages,
+        worker: BackgroundWorker,
+        count_label: ttk.Label = None,
+        on_select: Callable[[str], None] = None,
+        on_error: Callable[[Exception], None] = print,
+        visible_rows: int = ACTIVE_JOBS_VISIBLE_ROWS,
+    ):
+        """
+        Initializes the ActiveJobsView object.
+
+        Args:
+            treeview (ttk.Treeview): The table, with a column for each of
+                the pages' columns.
+            scrollbar (ttk.Scrollbar): The scrollbar beside the table.
+            pages (ActiveJobPages): The rows to show.
+            worker (BackgroundWorker): Reads rows off the GUI thread.
+            count_label (ttk.Label, optional): Shows how many jobs match.
+            on_select (Callable[[str], None], optional): Called with the
+                job number of a row that is double-clicked.
+            on_error (Callable[[Exception], None], optional): Called with
+                errors reading the rows.
+            visible_rows (int, optional): Rows shown at once.
+        """
+        self.treeview = treeview
+        self.scrollbar = scrollbar
+        self.pages = pages
+        self.worker = worker
+        self.count_label = count_label
+        self.on_select = on_select
+        self.on_error = on_error
+        self.visible_rows = visible_rows
+        self.offset = 0
+        self.total = None
+        self.filters = ()
+
+        treeview.configure(height=visible_rows, selectmode="browse")
+        # The same items are reused for whatever rows are visible.
+        self.row_ids = [
+            treeview.insert("", END, iid=f"row{index}", values=())
+            for index in range(visible_rows)
+        ]
+        scrollbar.configure(command=self.on_scrollbar)
+        for column in treeview["columns"]:
+            if column in SORT_COLUMNS:
+                treeview.heading(
+                    column, command=lambda column=column: self.sort_by(column)
+                )
+
+        treeview.bind("<MouseWheel>", self.on_mouse_wheel)
+        treeview.bind("<Button-4>", lambda event: self.scroll(-WHEEL_ROWS))
+        treeview.bind("<Button-5>", lambda event: self.scroll(WHEEL_ROWS))
+        treeview.bind("<Up>", lambda event: self.scroll(-1) or "break")
+        treeview.bind("<Down>", lambda event: self.scroll(1) or "break")
+        treeview.bind(
+            "<Prior>", lambda event: self.scroll(-visible_rows) or "break"
+        )
+        treeview.bind(
+            "<Next>", lambda event: self.scroll(visible_rows) or "break"
+        )
+        treeview.bind("<Home>", lambda event: self.scroll_to(0) or "break")
+        treeview.bind(
+            "<End>", lambda event: self.scroll_to(self.total or 0) or "break"
+        )
+        treeview.bind("<Double-1>", self.select_row)
+        treeview.bind("<Return>", self.select_row)
+
+    def refresh(
+        self, filters: tuple[tuple[str, str, object], ...] = None
+    ) -> None:
+        """Reads the jobs again from the top, with new filters if given,
+        keeping the sort order."""
+        if filters is not None:
+            self.filters = tuple(filters)
+        self.set_query(self.pages.sort_column, self.pages.descending)
+
+    def sort_by(self, column: str) -> None:
+        """Sorts by a column, or reverses the order if the jobs are
+        already sorted by it."""
+        descending = (
+            not self.pages.descending
+            if column == self.pages.sort_column
+            else False
+        )
+        self.set_query(column, descending)
+
+    def set_query(self, sort_column: str, descending: bool) -> None:
+        """Shows the jobs in a new order from the top, counting them on
+        the background worker."""
+        try:
+            self.pages.set_query(sort_column, descending, self.filters)
+        except ValueError as error:
+            self.on_error(error)
+            return
+        for column in self.treeview["columns"]:
+            heading = self.treeview.heading(column, "text").rstrip(" ▲▼")
+            if column == sort_column:
+                heading += " ▼" if descending else " ▲"
+            self.treeview.heading(column, text=heading)
+        self.offset = 0
+        self.total = None
+        self.show_rows([])
+        self.set_count_text("Loading...")
+        self.worker.submit(
+            "count_active_jobs",
+            self.pages.count,
+            on_success=self.show_count,
+            on_error=self.on_error,
+        )
+
+    def show_count(self, total: int) -> None:
+        """Shows the number of matching jobs and the first rows."""
+        self.total = total
+        self.set_count_text(f"{total:,} jobs")
+        self.render()
+
+    def set_count_text(self, text: str) -> None:
+        if self.count_label:
+            self.count_label.config(text=text)
+
+    def render(self) -> None:
+        """Shows the rows at the scroll position, reading them first if
+        they are not in memory."""
+        if self.total is None or not self.treeview.winfo_exists():
+            return
+        stop = min(self.offset + self.visible_rows, self.total)
+        rows = self.pages.cached_rows(self.offset, stop)
+        if rows is None:
+            # Coalesced while a read is pending; when it finishes the
+            # rows at the latest scroll position are read in turn.
+            request = (self.pages.generation, self.offset, stop)
+            self.worker.submit(
+                "read_active_jobs",
+                self.pages.rows,
+                self.offset,
+                stop,
+                on_success=lambda rows: self.finish_reading(request, rows),
+                on_error=self.on_error,
+            )
+        else:
+            self.show_rows(rows)
+        self.update_scrollbar()
+
+    def finish_reading(self, request: tuple, rows: list) -> None:
+        """Shows the rows at the scroll position once rows were read."""
+        generation, start, stop = request
+        if (
+            generation == self.pages.generation
+            and self.total is not None
+            and len(rows) < stop - start
+        ):
+            # Jobs were removed since they were counted.
+            self.total = min(self.total, start + len(rows))
+            self.set_count_text(f"{self.total:,} jobs")
+            self.offset = min(
+                self.offset, max(self.total - self.visible_rows, 0)
+            )
+        self.render()
+
+    def show_rows(self, rows: list[tuple]) -> None:
+        """Puts rows in the Treeview's items, emptying the items left
+        over."""
+        for index, row_id in enumerate(self.row_ids):
+            if index < len(rows):
+                values = [
+                    "" if value is None else value for value in rows[index]
+                ]
+                self.treeview.item(row_id, values=values)
+            else:
+                self.treeview.item(row_id, values=())
+
+    def update_scrollbar(self) -> None:
+        if not self.total:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(
+            self.offset / self.total,
+            min(self.offset + self.visible_rows, self.total) / self.total,
+        )
+
+    def scroll_to(self, offset: int) -> None:
+        """Shows the rows from a position, kept within the jobs."""
+        last_offset = max((self.total or 0) - self.visible_rows, 0)
+        offset = min(max(offset, 0), last_offset)
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def scroll(self, rows: int) -> None:
+        self.scroll_to(self.offset + rows)
+
+    def on_scrollbar(self, action: str, amount: str, unit: str = None):
+        """Scrolls as the scrollbar is dragged or its arrows clicked."""
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * (self.total or 0)))
+        elif unit == "pages":
+            self.scroll(int(amount) * self.visible_rows)
+        else:
+            self.scroll(int(amount))
+
+    def on_mouse_wheel(self, event) -> str:
+        self.scroll(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+        return "break"
+
+    def select_row(self, event=None) -> None:
+        """Passes the job number of the selected row to on_select."""
+        selection = self.treeview.selection()
+        if not selection or not self.on_select:
+            return
+        values = self.treeview.item(selection[0], "values")
+        if not values:
+            return
+        columns = list(self.treeview["columns"])
+        self.on_select(str(values[columns.index("job_number")]))
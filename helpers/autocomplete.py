@@ -0,0 +1,99 @@
+"""This module contains the PrefixIndex class, a sorted list of values
+used to suggest completions for the job number and parcel ID entries."""
+
+import bisect
+import threading
+from typing import Iterable
+
+from config import AUTOCOMPLETE_MAX_SUGGESTIONS, EXPORT_BATCH_SIZE
+
+from .sql_statements import select_statement
+
+# Sorts after any character that can follow a prefix.
+HIGHEST_CHARACTER = chr(0x10FFFF)
+
+
+class PrefixIndex:
+    """This class keeps unique values in sorted order, so the values
+    starting with a prefix are found with two binary searches however
+    many values are stored."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values = sorted(set(values))
+        self.added_values = []
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: str) -> bool:
+        index = bisect.bisect_left(self.values, value)
+        return self.values[index : index + 1] == [value]
+
+    def add(self, value: str) -> None:
+        """Adds a single value, e.g. the job number of a submitted job."""
+        if not value:
+            return
+        with self.lock:
+            self._insert(self.values, value)
+            self.added_values.append(value)
+
+    def update(self, values: Iterable[str]) -> None:
+        """Adds many values. They are sorted into a new list without
+        holding the lock, so lookups and single additions made meanwhile
+        are never blocked by a large update."""
+        new_values = {str(value).strip() for value in values if value}
+        new_values.discard("")
+        with self.lock:
+            current_values = self.values
+            self.added_values = []
+        new_values.update(current_values)
+        sorted_values = sorted(new_values)
+
+        with self.lock:
+            # Values added while sorting are carried over to the new list.
+            for value in self.added_values:
+                self._insert(sorted_values, value)
+            self.values = sorted_values
+
+    def complete(
+        self, prefix: str, limit: int = AUTOCOMPLETE_MAX_SUGGESTIONS
+    ) -> list[str]:
+        """Returns up to `limit` values starting with a prefix, in sorted
+        order."""
+        if not prefix:
+            return []
+        values = self.values
+        start = bisect.bisect_left(values, prefix)
+        end = bisect.bisect_left(
+            values,
+            prefix + HIGHEST_CHARACTER,
+            start,
+            min(start + limit, len(values)),
+        )
+        return values[start:end]
+
+    def load(
+        self,
+        database,
+        table: str,
+        column: str,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> int:
+        """Adds every value of a table column, streamed from the database
+        a batch at a time. Returns the number of stored values."""
+        _, batches = database.stream_query(
+            select_statement(table, (column,)), batch_size=batch_size
+        )
+        values = set()
+        for rows in batches:
+            values.update(row[0] for row in rows)
+        self.update(values)
+        return len(self)
+
+    @staticmethod
+    def _insert(values: list[str], value: str) -> None:
+        """Inserts a value into a sorted list unless it is already there."""
+        index = bisect.bisect_left(values, value)
+        if values[index : index + 1] != [value]:
+            values.insert(index, value)
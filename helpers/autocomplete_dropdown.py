@@ -0,0 +1,162 @@
+"""This module contains the AutocompleteDropdown class, which shows a list
+of suggestions under an entry while the user types."""
+
+import tkinter as tk
+from typing import Callable
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import END
+
+from config import AUTOCOMPLETE_DELAY_MS, AUTOCOMPLETE_MAX_SUGGESTIONS
+
+# Keys that move through or close the suggestions rather than edit text.
+NAVIGATION_KEYS = {"Up", "Down", "Return", "Escape", "Tab"}
+
+
+class AutocompleteDropdown:
+    """This class attaches a suggestion list to an entry. Suggestions are
+    refreshed once typing pauses, so a burst of keystrokes costs a single
+    lookup and never stalls the event loop."""
+
+    def __init__(
+        self,
+        entry: ttk.Entry,
+        complete: Callable[[str, int], list[str]],
+        on_select: Callable[[str], None] = None,
+        delay_ms: int = AUTOCOMPLETE_DELAY_MS,
+        max_suggestions: int = AUTOCOMPLETE_MAX_SUGGESTIONS,
+    ):
+        """
+        Initializes the AutocompleteDropdown object.
+
+        Args:
+            entry (ttk.Entry): The entry to suggest values for.
+            complete (Callable[[str, int], list[str]]): Returns up to the
+                given number of suggestions for the entry's text.
+            on_select (Callable[[str], None], optional): Called with a
+                suggestion after it is chosen.
+            delay_ms (int, optional): Milliseconds typing must pause
+                before the suggestions are refreshed.
+            max_suggestions (int, optional): The most suggestions shown.
+        """
+        self.entry = entry
+        self.complete = complete
+        self.on_select = on_select
+        self.delay_ms = delay_ms
+        self.max_suggestions = max_suggestions
+        self.timer = None
+        self.popup = None
+        self.listbox = None
+
+        # add="+" keeps bindings the entry already has, such as the
+        # parcel prefetch.
+        entry.bind("<KeyRelease>", self.schedule_update, add="+")
+        entry.bind("<Down>", self.focus_suggestions, add="+")
+        entry.bind("<Escape>", self.close, add="+")
+        entry.bind("<FocusOut>", self.hide_unless_focused, add="+")
+
+    def schedule_update(self, event=None) -> None:
+        """Restarts the timer that refreshes the suggestions."""
+        if event is not None and event.keysym in NAVIGATION_KEYS:
+            return
+        if self.timer:
+            self.entry.after_cancel(self.timer)
+        self.timer = self.entry.after(self.delay_ms, self.update_suggestions)
+
+    def update_suggestions(self) -> None:
+        """Shows the suggestions for the entry's current text."""
+        self.timer = None
+        text = self.entry.get().strip()
+        suggestions = self.complete(text, self.max_suggestions)
+        if not suggestions or suggestions == [text]:
+            self.hide()
+            return
+        self.show(suggestions)
+
+    def show(self, suggestions: list[str]) -> None:
+        """Shows a list of suggestions directly under the entry."""
+        if self.popup is None:
+            self.create_popup()
+
+        self.listbox.delete(0, END)
+        for suggestion in suggestions:
+            self.listbox.insert(END, suggestion)
+        self.listbox.config(height=len(suggestions))
+
+        width = self.entry.winfo_width()
+        height = self.listbox.winfo_reqheight()
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f"{width}x{height}+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def create_popup(self) -> None:
+        """Creates the borderless window holding the suggestion list."""
+        self.popup = ttk.Toplevel(self.entry)
+        self.popup.overrideredirect(True)
+        self.popup.withdraw()
+        self.listbox = tk.Listbox(
+            self.popup, font=self.entry.cget("font"), exportselection=False
+        )
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<ButtonRelease-1>", self.select)
+        self.listbox.bind("<Return>", self.select)
+        self.listbox.bind("<Escape>", self.return_to_entry)
+        self.listbox.bind("<FocusOut>", self.hide_unless_focused)
+
+    def focus_suggestions(self, event=None) -> None:
+        """Moves the keyboard focus to the first suggestion."""
+        if self.popup is None or not self.popup.winfo_viewable():
+            return
+        self.listbox.focus_set()
+        self.listbox.selection_clear(0, END)
+        self.listbox.selection_set(0)
+        self.listbox.activate(0)
+
+    def select(self, event=None) -> None:
+        """Puts the chosen suggestion in the entry."""
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        value = self.listbox.get(selection[0])
+        self.entry.delete(0, END)
+        self.entry.insert(0, value)
+        self.return_to_entry()
+        if self.on_select:
+            self.on_select(value)
+
+    def return_to_entry(self, event=None) -> None:
+        """Hides the suggestions and gives the focus back to the
+        entry."""
+        self.hide()
+        self.entry.focus_set()
+        self.entry.icursor(END)
+
+    def hide_unless_focused(self, event=None) -> None:
+        """Hides the suggestions once neither the entry nor the list has
+        the focus. Checked after the focus has settled, so clicking a
+        suggestion still selects it."""
+
+        def hide_if_focus_left() -> None:
+            focused = self.entry.focus_get()
+            if focused not in (self.entry, self.listbox):
+                self.hide()
+
+        self.entry.after(100, hide_if_focus_left)
+
+    def close(self, event=None) -> str | None:
+        """Hides the suggestions when Esc is pressed in the entry. If they
+        were showing, the key goes no further, so it does not also
+        cancel the window's background tasks."""
+        visible = self.popup is not None and self.popup.winfo_viewable()
+        self.hide()
+        return "break" if visible else None
+
+    def hide(self, event=None) -> None:
+        """Hides the suggestions."""
+        if self.timer:
+            self.entry.after_cancel(self.timer)
+            self.timer = None
+        if self.popup is not None:
+            self.popup.withdraw()
@@ -0,0 +1,166 @@
+"""This module contains the BackgroundWorker class, which runs slow calls
+such as database queries and parcel lookups off the Tk event loop."""
+
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class Task:
+    """A call queued on the background worker."""
+
+    key: str
+    function: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    on_success: Optional[Callable[[Any], None]] = None
+    on_error: Optional[Callable[[Exception], None]] = None
+    cancelled: bool = False
+
+
+class BackgroundWorker:
+    """This class runs tasks one at a time on a background thread and
+    hands their results back to the GUI thread with `after()`.
+
+    Tasks are identified by a key. Submitting a task while another task
+    with the same key is still pending does nothing, so repeated clicks
+    on the same button are coalesced into a single call."""
+
+    def __init__(
+        self,
+        scheduler,
+        poll_interval: int = 50,
+        on_busy_change: Optional[Callable[[bool], None]] = None,
+    ):
+        """
+        Initializes the BackgroundWorker object.
+
+        Args:
+            scheduler: Any object with a Tk-style `after(ms, callback)`
+                method, normally the main application window.
+            poll_interval (int, optional): How often, in milliseconds,
+                finished tasks are checked for. Defaults to 50.
+            on_busy_change (Callable[[bool], None], optional): Called on
+                the GUI thread whenever the worker becomes busy or idle.
+        """
+        self.scheduler = scheduler
+        self.poll_interval = poll_interval
+        self.on_busy_change = on_busy_change
+        self.pending_tasks = {}
+        self.task_queue = queue.Queue()
+        self.result_queue = queue.Queue()
+        self.polling = False
+        self.reported_busy = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @property
+    def busy(self) -> bool:
+        """Returns True while any task is queued or running."""
+        return bool(self.pending_tasks)
+
+    def submit(
+        self,
+        key: str,
+        function: Callable,
+        *args,
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        **kwargs,
+    ) -> Optional[Task]:
+        """
+        Queues a function to run on the background thread. Must be called
+        from the GUI thread.
+
+        Args:
+            key (str): Identifies the task for coalescing and cancelling.
+            function (Callable): The function to run.
+            on_success (Callable[[Any], None], optional): Called on the
+                GUI thread with the function's return value.
+            on_error (Callable[[Exception], None], optional): Called on
+                the GUI thread with any exception the function raised.
+
+        Returns:
+            Optional[Task]: The queued task, or None if a task with the
+                same key was already pending.
+        """
+        if key in self.pending_tasks:
+            return None
+
+        task = Task(key, function, args, kwargs, on_success, on_error)
+        self.pending_tasks[key] = task
+        self.task_queue.put(task)
+
+        self._report_busy_state()
+        if not self.polling:
+            self.polling = True
+            self.scheduler.after(self.poll_interval, self._poll)
+        return task
+
+    def cancel(self, key: str) -> None:
+        """Cancels a pending task. A task that has not started yet is
+        skipped. A task that is already running finishes, but its
+        callbacks are not called."""
+        task = self.pending_tasks.pop(key, None)
+        if task:
+            task.cancelled = True
+            self._report_busy_state()
+
+    def cancel_all(self) -> None:
+        """Cancels every pending task."""
+        for key in list(self.pending_tasks):
+            self.cancel(key)
+
+    def stop(self) -> None:
+        """Stops the background thread after the queued tasks finish."""
+        self.task_queue.put(None)
+
+    def _run(self) -> None:
+        """Runs queued tasks on the background thread."""
+        while True:
+            task = self.task_queue.get()
+            if task is None:
+                return
+            if task.cancelled:
+                continue
+            try:
+                result = task.function(*task.args, **task.kwargs)
+            except Exception as error:  # Reported on the GUI thread.
+                self.result_queue.put((task, None, error))
+            else:
+                self.result_queue.put((task, result, None))
+
+    def _poll(self) -> None:
+        """Delivers finished tasks to their callbacks on the GUI thread."""
+        while True:
+            try:
+                task, result, error = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if task.cancelled:
+                continue
+            self.pending_tasks.pop(task.key, None)
+
+            if error is not None:
+                if task.on_error:
+                    task.on_error(error)
+                else:
+                    print(error)
+            elif task.on_success:
+                task.on_success(result)
+
+        self._report_busy_state()
+        if self.busy:
+            self.scheduler.after(self.poll_interval, self._poll)
+        else:
+            self.polling = False
+
+    def _report_busy_state(self) -> None:
+        """Calls on_busy_change when the worker becomes busy or idle."""
+        if self.busy != self.reported_busy:
+            self.reported_busy = self.busy
+            if self.on_busy_change:
+                self.on_busy_change(self.busy)
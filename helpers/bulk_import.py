@@ -0,0 +1,310 @@
+"""This module contains the BulkImporter class, which loads batches of jobs
+from CSV or Excel files straight into the database."""
+
+import argparse
+import csv
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from config import (
+    ACTIVE_DB_COLUMN_NAMES,
+    ACTIVE_DB_COLUMN_ORDER,
+    BULK_IMPORT_BATCH_SIZE,
+    BULK_IMPORT_PARCEL_WORKERS,
+    DATABASE_PATH,
+    EXISTING_DB_COLUMN_NAMES,
+    EXISTING_DB_COLUMN_ORDER,
+)
+
+from .job_number_storage import JobNumbers
+
+DATABASE_COLUMNS = set(EXISTING_DB_COLUMN_ORDER + ACTIVE_DB_COLUMN_ORDER)
+
+
+@dataclass
+class ImportFailure:
+    """A row that could not be imported."""
+
+    row_number: int
+    job_number: str
+    error: str
+
+
+@dataclass
+class ImportReport:
+    """The outcome of a bulk import."""
+
+    rows_read: int = 0
+    rows_inserted: int = 0
+    failures: list[ImportFailure] = field(default_factory=list)
+    # Headings that are not database columns, whose values were skipped.
+    unknown_columns: list[str] = field(default_factory=list)
+
+
+def normalize_column_name(column_name: str) -> str:
+    """Converts a column heading such as "Job Number" to lower case with
+    underscores, e.g. "job_number"."""
+    return column_name.strip().lower().replace(" ", "_")
+
+
+# The column for each normalized heading: the Access column names, as in
+# an export, and the column names themselves.
+HEADING_COLUMNS = {
+    **{column: column for column in DATABASE_COLUMNS},
+    **{
+        normalize_column_name(name): column
+        for names in (ACTIVE_DB_COLUMN_NAMES, EXISTING_DB_COLUMN_NAMES)
+        for column, name in names.items()
+    },
+}
+
+
+def heading_column(heading: str) -> str | None:
+    """Returns the database column for a heading such as "Job Number" or
+    "Customer Contact Information", or None if it is not a column."""
+    return HEADING_COLUMNS.get(normalize_column_name(heading))
+
+
+def read_csv_rows(file_path: str) -> Iterator[dict]:
+    """Yields the rows of a CSV file as dictionaries, one at a time."""
+    with open(file_path, newline="", encoding="utf-8-sig") as csv_file:
+        yield from csv.DictReader(csv_file)
+
+
+def read_xlsx_rows(file_path: str) -> Iterator[dict]:
+    """Yields the rows of the first sheet of an Excel workbook as
+    dictionaries, one at a time."""
+    try:
+        import openpyxl
+    except ImportError as error:
+        raise ImportError(
+            "Importing Excel files requires openpyxl: pip install openpyxl"
+        ) from error
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [str(header or "") for header in next(rows, [])]
+        for values in rows:
+            yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(
+    file_path: str, unknown_columns: list[str] = None
+) -> Iterator[dict]:
+    """
+    Yields the rows of a CSV or Excel file as dictionaries keyed by
+    database column name.
+
+    Args:
+        file_path (str): The CSV or Excel file.
+        unknown_columns (list[str], optional): Headings that are not
+            database columns are added to this list. Their values are
+            not imported.
+    """
+    if file_path.lower().endswith((".xlsx", ".xlsm")):
+        rows = read_xlsx_rows(file_path)
+    else:
+        rows = read_csv_rows(file_path)
+
+    columns = None
+    for row in rows:
+        if columns is None:
+            columns = {heading: heading_column(heading) for heading in row}
+            if unknown_columns is not None:
+                unknown_columns.extend(
+                    heading
+                    for heading, column in columns.items()
+                    if heading and column is None
+                )
+        yield {
+            columns[heading]: value
+            for heading, value in row.items()
+            if columns.get(heading)
+        }
+
+
+class BulkImporter:
+    """This class inserts jobs in batches, looking up the parcels of a
+    batch concurrently and committing each batch in one transaction."""
+
+    def __init__(
+        self,
+        database,
+        job_storage: JobNumbers = None,
+        batch_size: int = BULK_IMPORT_BATCH_SIZE,
+        parcel_workers: int = BULK_IMPORT_PARCEL_WORKERS,
+        enrich_parcels: bool = True,
+    ):
+        """
+        Initializes the BulkImporter object.
+
+        Args:
+            database (DatabaseConnection): The database to import into.
+            job_storage (JobNumbers, optional): Known job numbers. Rows
+                whose job number already exists are reported as failures
+                up front instead of failing their whole batch.
+            batch_size (int, optional): Rows committed per transaction.
+            parcel_workers (int, optional): Parcels looked up at once.
+            enrich_parcels (bool, optional): Whether to look up county
+                parcel data for each row. Defaults to True.
+        """
+        self.database = database
+        self.job_storage = job_storage
+        self.batch_size = batch_size
+        self.parcel_workers = parcel_workers
+        self.enrich_parcels = enrich_parcels
+
+    def import_file(self, file_path: str) -> ImportReport:
+        """Imports every row of a CSV or Excel file. Headings that are not
+        database columns are listed in the report."""
+        report = ImportReport()
+        return self.import_rows(
+            read_rows(file_path, report.unknown_columns), report
+        )
+
+    def import_rows(
+        self, rows: Iterable[dict], report: ImportReport = None
+    ) -> ImportReport:
+        """Imports rows keyed by database column name."""
+        report = report or ImportReport()
+        numbered_rows = enumerate(rows, start=1)
+        with ThreadPoolExecutor(self.parcel_workers) as executor:
+            while True:
+                batch = list(itertools.islice(numbered_rows, self.batch_size))
+                if not batch:
+                    break
+                report.rows_read += len(batch)
+                self.import_batch(batch, executor, report)
+        return report
+
+    def import_batch(
+        self,
+        batch: list[tuple[int, dict]],
+        executor: ThreadPoolExecutor,
+        report: ImportReport,
+    ) -> None:
+        """Enriches and inserts one batch of rows, recording the rows that
+        fail in the report."""
+        valid_rows = []
+        for row_number, row in batch:
+            job_number = str(row.get("job_number") or "").strip()
+            if not job_number:
+                self.record_failure(report, row_number, "", "No job number")
+            elif (
+                self.job_storage
+                and job_number in self.job_storage.get_existing_job_numbers()
+            ):
+                self.record_failure(
+                    report, row_number, job_number, "Job number exists"
+                )
+            else:
+                row["job_number"] = job_number
+                valid_rows.append((row_number, row))
+
+        records = []
+        for (row_number, row), result in zip(
+            valid_rows, executor.map(self.create_record, valid_rows)
+        ):
+            if isinstance(result, Exception):
+                self.record_failure(
+                    report, row_number, row["job_number"], result
+                )
+            else:
+                records.append((row_number, result))
+
+        if not records:
+            return
+        try:
+            self.database.insert_jobs([record for _, record in records])
+        except Exception:
+            # Find the rows that broke the batch by inserting them one at
+            # a time, so the rest of the batch still goes in.
+            for row_number, record in records:
+                try:
+                    self.database.insert_jobs([record])
+                except Exception as error:
+                    self.record_failure(
+                        report, row_number, record["job_number"], error
+                    )
+                else:
+                    self.record_success(report, record)
+        else:
+            for _, record in records:
+                self.record_success(report, record)
+
+    def create_record(self, numbered_row: tuple[int, dict]) -> dict:
+        """Returns the full set of database values for a row, or the
+        exception raised while looking up its parcel."""
+        _, row = numbered_row
+        try:
+            parcel_data = {}
+            if self.enrich_parcels and row.get("parcel_id"):
+                parcel_data = self.database.fetch_parcel_data(row["parcel_id"])
+            self.database.merge_user_inputs_into_parcel_data(row, parcel_data)
+        except Exception as error:
+            return error
+        return parcel_data
+
+    def record_success(self, report: ImportReport, record: dict) -> None:
+        """Counts an inserted row and remembers its job number."""
+        report.rows_inserted += 1
+        if self.job_storage:
+            self.job_storage.add_job_number(record["job_number"])
+
+    @staticmethod
+    def record_failure(
+        report: ImportReport, row_number: int, job_number: str, error
+    ) -> None:
+        """Adds a failed row to the report."""
+        report.failures.append(
+            ImportFailure(row_number, job_number, str(error))
+        )
+
+
+def main() -> None:
+    """Imports a CSV or Excel file given on the command line."""
+    # Imported here so the importer can be used without the Access driver.
+    from .database_connector import DatabaseConnection
+    from .parcel_cache import ParcelCache
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("file_path", help="CSV or XLSX file to import")
+    parser.add_argument(
+        "--batch-size", type=int, default=BULK_IMPORT_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--skip-parcels",
+        action="store_true",
+        help="Do not look up county parcel data",
+    )
+    args = parser.parse_args()
+
+    database = DatabaseConnection(DATABASE_PATH, parcel_cache=ParcelCache())
+    importer = BulkImporter(
+        database,
+        batch_size=args.batch_size,
+        enrich_parcels=not args.skip_parcels,
+    )
+    report = importer.import_file(args.file_path)
+    database.close()
+
+    print(f"Read {report.rows_read} rows, inserted {report.rows_inserted}.")
+    if report.unknown_columns:
+        print(
+            "Columns not imported, as they are not database columns: "
+            + ", ".join(report.unknown_columns)
+        )
+    for failure in report.failures:
+        print(
+            f"Row {failure.row_number} ({failure.job_number}):"
+            f" {failure.error}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""This module contains the CompactJobNumbers class, a drop-in
+replacement for JobNumbers that stores job numbers as bitmaps instead of
+sets of strings."""
+
+import sys
+from collections.abc import Iterable, MutableSet
+
+from .job_number_storage import JobNumbers, split_job_number
+
+# Every YYMM prefix has 10,000 possible sequence numbers (0000-9999).
+SEQUENCES_PER_PREFIX = 10_000
+BITMAP_SIZE = SEQUENCES_PER_PREFIX // 8
+
+
+class JobNumberBitmap(MutableSet):
+    """This class is a set of job numbers stored as one fixed-size bitmap
+    per YYMM prefix. Job numbers that are not in the YYMMNNNN format are
+    kept in a regular set."""
+
+    def __init__(self, job_numbers: Iterable[str] = ()):
+        self.bitmaps = {}
+        self.other_job_numbers = set()
+        self.count = 0
+        self.update(job_numbers)
+
+    def __contains__(self, job_number: object) -> bool:
+        if not isinstance(job_number, str):
+            return False
+        parts = split_job_number(job_number)
+        if parts is None:
+            return job_number in self.other_job_numbers
+        prefix, sequence = parts
+        bitmap = self.bitmaps.get(prefix)
+        if bitmap is None:
+            return False
+        return bool(bitmap[sequence >> 3] & (1 << (sequence & 7)))
+
+    def __iter__(self):
+        for prefix in sorted(self.bitmaps):
+            for sequence in self.sequences(prefix):
+                yield f"{prefix}{sequence:04d}"
+        yield from self.other_job_numbers
+
+    def __len__(self) -> int:
+        return self.count + len(self.other_job_numbers)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} job numbers)"
+
+    def add(self, job_number: str) -> None:
+        """Adds a job number to the set."""
+        parts = split_job_number(job_number)
+        if parts is None:
+            self.other_job_numbers.add(job_number)
+            return
+        prefix, sequence = parts
+        bitmap = self.bitmaps.get(prefix)
+        if bitmap is None:
+            bitmap = self.bitmaps[prefix] = bytearray(BITMAP_SIZE)
+        mask = 1 << (sequence & 7)
+        if not bitmap[sequence >> 3] & mask:
+            bitmap[sequence >> 3] |= mask
+            self.count += 1
+
+    def discard(self, job_number: str) -> None:
+        """Removes a job number from the set if it is present."""
+        parts = split_job_number(job_number)
+        if parts is None:
+            self.other_job_numbers.discard(job_number)
+            return
+        prefix, sequence = parts
+        bitmap = self.bitmaps.get(prefix)
+        if bitmap is None:
+            return
+        mask = 1 << (sequence & 7)
+        if bitmap[sequence >> 3] & mask:
+            bitmap[sequence >> 3] &= ~mask
+            self.count -= 1
+
+    def clear(self) -> None:
+        """Removes every job number from the set."""
+        self.bitmaps.clear()
+        self.other_job_numbers.clear()
+        self.count = 0
+
+    def update(self, job_numbers: Iterable[str]) -> None:
+        """Adds every job number in an iterable to the set."""
+        for job_number in job_numbers:
+            self.add(job_number)
+
+    def issuperset(self, job_numbers: Iterable[str]) -> bool:
+        """Returns True if every given job number is in the set."""
+        return all(job_number in self for job_number in job_numbers)
+
+    def prefix_bits(self, prefix: str) -> int:
+        """Returns the bitmap for a YYMM prefix as an integer, where bit
+        n is set if sequence number n is taken."""
+        bitmap = self.bitmaps.get(prefix)
+        if bitmap is None:
+            return 0
+        return int.from_bytes(bitmap, "little")
+
+    def sequences(self, prefix: str) -> list[int]:
+        """Returns the sorted sequence numbers stored for a YYMM prefix."""
+        bitmap = self.bitmaps.get(prefix)
+        if bitmap is None:
+            return []
+        return [
+            byte_index * 8 + bit
+            for byte_index, byte in enumerate(bitmap)
+            if byte
+            for bit in range(8)
+            if byte & (1 << bit)
+        ]
+
+    def memory_usage(self) -> int:
+        """Returns the approximate number of bytes used by the set."""
+        total = sys.getsizeof(self.bitmaps)
+        total += sum(sys.getsizeof(bitmap) for bitmap in self.bitmaps.values())
+        total += sys.getsizeof(self.other_job_numbers)
+        total += sum(
+            sys.getsizeof(job_number) for job_number in self.other_job_numbers
+        )
+        return total
+
+
+class CompactJobNumbers(JobNumbers):
+    """This class stores job numbers like JobNumbers, but as bitmaps.
+    Each category costs 1,250 bytes per month that has job numbers,
+    instead of roughly 100 bytes per job number."""
+
+    def create_job_number_set(self) -> JobNumberBitmap:
+        """Returns an empty bitmap for one category of job numbers."""
+        return JobNumberBitmap()
+
+    def combined_bits(self, prefix: str) -> int:
+        """Returns the taken sequence numbers of a YYMM prefix across all
+        categories as an integer bitmap."""
+        return (
+            self.current_year_job_numbers.prefix_bits(prefix)
+            | self.existing_job_numbers.prefix_bits(prefix)
+            | self.active_job_numbers.prefix_bits(prefix)
+        )
+
+    def highest_sequence(self, prefix: str) -> int | None:
+        """Returns the highest sequence number stored for a YYMM prefix,
+        or None if there are no job numbers with that prefix."""
+        bits = self.combined_bits(prefix)
+        if not bits:
+            return None
+        return bits.bit_length() - 1
+
+    def next_free_sequence(self, prefix: str, start: int = 0) -> int | None:
+        """Returns the lowest unused sequence number for a YYMM prefix
+        that is greater than or equal to start, or None if every
+        sequence number from start to 9999 is taken."""
+        free_bits = ~self.combined_bits(prefix) >> start
+        candidate = start + (free_bits & -free_bits).bit_length() - 1
+        if candidate >= SEQUENCES_PER_PREFIX:
+            return None
+        return candidate
+
+    def missing_sequences(self, prefix: str) -> list[int]:
+        """Returns the unused sequence numbers of a YYMM prefix that lie
+        between its lowest and highest stored sequence numbers."""
+        bits = self.combined_bits(prefix)
+        if not bits:
+            return []
+        lowest = (bits & -bits).bit_length() - 1
+        highest = bits.bit_length() - 1
+        return [
+            sequence
+            for sequence in range(lowest, highest)
+            if not bits >> sequence & 1
+        ]
+
+    def memory_usage(self) -> int:
+        """Returns the approximate number of bytes used to store the job
+        numbers."""
+        return sum(
+            job_numbers.memory_usage()
+            for job_numbers in (
+                self.current_year_job_numbers,
+                self.existing_job_numbers,
+                self.active_job_numbers,
+            )
+        )
+
+    def _index_job_numbers(self, job_numbers) -> None:
+        """The bitmaps already act as the prefix index."""
+
+    def _unindex_job_number(self, job_number: str) -> None:
+        """The bitmaps already act as the prefix index."""
@@ -0,0 +1,263 @@
+"""This module contains the ConnectionPool class, which shares a small
+number of database connections between threads and replaces connections
+that stop working."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from config import (
+    POOL_CHECKOUT_TIMEOUT_SECONDS,
+    POOL_CONNECT_BACKOFF_SECONDS,
+    POOL_CONNECT_RETRIES,
+    POOL_HEALTH_CHECK_AFTER_SECONDS,
+    POOL_IDLE_TIMEOUT_SECONDS,
+    POOL_MAX_SIZE,
+)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available in time."""
+
+
+class PooledConnection:
+    """This class wraps a database connection with the bookkeeping used by
+    the pool. Attribute access is passed through to the connection, so it
+    can be used wherever the connection itself would be."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # Cursors kept open for reuse, keyed by statement text.
+        self.prepared_cursors = {}
+
+    def __getattr__(self, name: str):
+        return getattr(self.connection, name)
+
+    def close(self) -> None:
+        """Closes the connection, ignoring errors from broken ones."""
+        try:
+            for cursor in self.prepared_cursors.values():
+                cursor.close()
+            self.connection.close()
+        except Exception:
+            pass
+        self.prepared_cursors.clear()
+
+
+class ConnectionPool:
+    """This class hands out connections one thread at a time. Connections
+    are opened lazily, checked before reuse, reopened with backoff when
+    the database cannot be reached, and closed after sitting idle."""
+
+    def __init__(
+        self,
+        connect: Callable,
+        is_alive: Callable = None,
+        max_size: int = POOL_MAX_SIZE,
+        idle_timeout: float = POOL_IDLE_TIMEOUT_SECONDS,
+        checkout_timeout: float = POOL_CHECKOUT_TIMEOUT_SECONDS,
+        health_check_after: float = POOL_HEALTH_CHECK_AFTER_SECONDS,
+        connect_retries: int = POOL_CONNECT_RETRIES,
+        connect_backoff: float = POOL_CONNECT_BACKOFF_SECONDS,
+    ):
+        """
+        Initializes the ConnectionPool object.
+
+        Args:
+            connect (Callable): Opens and returns a new connection.
+            is_alive (Callable, optional): Returns False if a connection
+                no longer works. Defaults to assuming it does.
+            max_size (int, optional): The most connections open at once.
+            idle_timeout (float, optional): Seconds an unused connection
+                is kept open.
+            checkout_timeout (float, optional): Seconds to wait for a
+                free connection before raising PoolTimeoutError.
+            health_check_after (float, optional): Connections idle for
+                longer than this many seconds are checked with is_alive
+                before being handed out. Use 0 to check every checkout.
+            connect_retries (int, optional): Extra attempts made when a
+                connection cannot be opened.
+            connect_backoff (float, optional): Seconds to wait before the
+                first retry, doubling for each later one.
+        """
+        self.connect = connect
+        self.is_alive = is_alive or (lambda connection: True)
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+        self.connect_retries = connect_retries
+        self.connect_backoff = connect_backoff
+
+        self.idle_connections = []
+        self.size = 0
+        self.condition = threading.Condition()
+        self.metrics = {
+            "checkouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "connects": 0,
+            "connect_seconds_total": 0.0,
+            "connect_seconds_max": 0.0,
+            "connect_failures": 0,
+            "health_check_failures": 0,
+            "idle_evictions": 0,
+        }
+
+    @property
+    def stats(self) -> dict:
+        """Returns the pool's metrics along with its current size."""
+        with self.condition:
+            return {
+                **self.metrics,
+                "size": self.size,
+                "idle": len(self.idle_connections),
+            }
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Checks out a connection for the duration of a with block. Any
+        uncommitted work is rolled back if the block raises."""
+        pooled = self.acquire()
+        try:
+            yield pooled
+        except Exception:
+            self.release(pooled, failed=True)
+            raise
+        else:
+            self.release(pooled)
+
+    def acquire(self) -> PooledConnection:
+        """Checks out a connection, opening one if none are idle. Must be
+        returned with release()."""
+        wait_started = time.perf_counter()
+        deadline = time.monotonic() + self.checkout_timeout
+        pooled = None
+        with self.condition:
+            self._evict_idle_connections()
+            while True:
+                if self.idle_connections:
+                    pooled = self.idle_connections.pop()
+                    break
+                if self.size < self.max_size:
+                    # Reserve a slot; the connection is opened outside the
+                    # lock so other threads are not blocked meanwhile.
+                    self.size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No database connection free after "
+                        f"{self.checkout_timeout} seconds"
+                    )
+                self.condition.wait(remaining)
+
+            wait_seconds = time.perf_counter() - wait_started
+            self.metrics["checkouts"] += 1
+            self.metrics["wait_seconds_total"] += wait_seconds
+            self.metrics["wait_seconds_max"] = max(
+                self.metrics["wait_seconds_max"], wait_seconds
+            )
+
+        if pooled is not None and not self._passes_health_check(pooled):
+            pooled.close()
+            pooled = None
+
+        if pooled is None:
+            try:
+                pooled = self._connect_with_backoff()
+            except Exception:
+                with self.condition:
+                    self.size -= 1
+                    self.condition.notify()
+                raise
+        return pooled
+
+    def release(self, pooled: PooledConnection, failed: bool = False) -> None:
+        """Returns a connection to the pool. After a failure the
+        connection is rolled back, and discarded if it no longer works."""
+        discard = False
+        if failed:
+            try:
+                pooled.rollback()
+            except Exception:
+                discard = True
+            else:
+                discard = not self._is_alive(pooled)
+
+        with self.condition:
+            if discard:
+                pooled.close()
+                self.size -= 1
+            else:
+                pooled.last_used = time.monotonic()
+                self.idle_connections.append(pooled)
+            self.condition.notify()
+
+    def close_all(self) -> None:
+        """Closes every idle connection. Connections that are checked out
+        stay open until they are released and evicted."""
+        with self.condition:
+            for pooled in self.idle_connections:
+                pooled.close()
+            self.size -= len(self.idle_connections)
+            self.idle_connections.clear()
+
+    def _connect_with_backoff(self) -> PooledConnection:
+        """Opens a connection, retrying with exponential backoff."""
+        for attempt in range(self.connect_retries + 1):
+            connect_started = time.perf_counter()
+            try:
+                connection = self.connect()
+            except Exception:
+                with self.condition:
+                    self.metrics["connect_failures"] += 1
+                if attempt == self.connect_retries:
+                    raise
+                time.sleep(self.connect_backoff * 2**attempt)
+                continue
+
+            connect_seconds = time.perf_counter() - connect_started
+            with self.condition:
+                self.metrics["connects"] += 1
+                self.metrics["connect_seconds_total"] += connect_seconds
+                self.metrics["connect_seconds_max"] = max(
+                    self.metrics["connect_seconds_max"], connect_seconds
+                )
+            return PooledConnection(connection)
+
+    def _passes_health_check(self, pooled: PooledConnection) -> bool:
+        """Checks a connection that has been idle for a while."""
+        idle_seconds = time.monotonic() - pooled.last_used
+        if idle_seconds < self.health_check_after:
+            return True
+        return self._is_alive(pooled)
+
+    def _is_alive(self, pooled: PooledConnection) -> bool:
+        """Returns False, and counts a failure, if a connection is
+        broken."""
+        try:
+            alive = self.is_alive(pooled.connection)
+        except Exception:
+            alive = False
+        if not alive:
+            with self.condition:
+                self.metrics["health_check_failures"] += 1
+        return alive
+
+    def _evict_idle_connections(self) -> None:
+        """Closes connections that have been idle for too long. Must be
+        called with the condition held."""
+        now = time.monotonic()
+        kept_connections = []
+        for pooled in self.idle_connections:
+            if now - pooled.last_used > self.idle_timeout:
+                pooled.close()
+                self.size -= 1
+                self.metrics["idle_evictions"] += 1
+            else:
+                kept_connections.append(pooled)
+        self.idle_connections = kept_connections
@@ -2,14 +2,72 @@
 The Controller class is used to manage the application's data and user
 input. It is responsible for updating the GUI and the database."""
 
+import datetime
+import queue
+import time
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import END
+from ttkbootstrap.dialogs import Messagebox
 
-from config import DATABASE_PATH
+from config import (
+    ACTIVE_JOBS_BROWSER_COLUMNS,
+    COMPACT_JOB_NUMBER_STORAGE,
+    DATABASE_PATH,
+    JOURNAL_POLL_MS,
+    ROW_CACHE_WARM_UP,
+    SEARCH_DELAY_MS,
+    SERVICE_URL,
+    WORKLOAD_COUNT_ON_START,
+    WORKLOAD_MONTHS_SHOWN,
+)
+from helpers.active_job_pages import ActiveJobPages
+from helpers.active_jobs_view import ActiveJobsView
+from helpers.autocomplete import PrefixIndex
+from helpers.background_worker import BackgroundWorker
+from helpers.compact_job_number_storage import CompactJobNumbers
 from helpers.database_connector import DatabaseConnection
+from helpers.instrumentation import metrics
 from helpers.job_number_generator import JobNumberGenerator
+from helpers.job_number_reservation import JobNumberReservations
 from helpers.job_number_storage import JobNumbers
+from helpers.job_number_sync import JobNumberSynchronizer
+from helpers.job_search import JobSearchIndex
+from helpers.parcel_cache import ParcelCache
+from helpers.parcel_prefetch import ParcelPrefetcher
+from helpers.sql_statements import EXISTING_JOBS
+from helpers.submission_journal import JournalFlusher, SubmissionJournal
 from helpers.user_input_storage import UserInputStorage
+from jobrecords.client import JobRecordsClient
+
+# The (column, operator) each Active Jobs filter entry sets, and the
+# formats accepted in the fieldwork date filters.
+ACTIVE_JOB_FILTERS = {
+    "inhouse_status": ("inhouse_status", "="),
+    "invoice_status": ("invoice_status", "="),
+    "fieldwork_date_from": ("fieldwork_date", ">="),
+    "fieldwork_date_to": ("fieldwork_date", "<="),
+}
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y")
+
+# The Existing Jobs fields filled in when a job number is looked up.
+DISPLAYED_JOB_FIELDS = (
+    "parcel_id",
+    "entry_by",
+    "contact_info",
+    "additional_info",
+)
+
+
+def parse_date(text: str) -> datetime.date:
+    """Returns the date typed in a filter entry, in any of the
+    DATE_FORMATS."""
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"{text} is not a date, e.g. 2023-01-31 or 1/31/2023")
 
 
 class Controller:
@@ -18,20 +76,257 @@ class Controller:
 
     def __init__(self):
         self.input_storage = UserInputStorage()
-        self.job_storage = JobNumbers()
+        if COMPACT_JOB_NUMBER_STORAGE:
+            self.job_storage = CompactJobNumbers()
+        else:
+            self.job_storage = JobNumbers()
         self.job_generator = JobNumberGenerator(self.job_storage)
-        self.database = DatabaseConnection(DATABASE_PATH)
+        # With a job records service running, the window asks it for job
+        # numbers, jobs and searches, and submits through it, instead of
+        # connecting to the database and loading everything itself.
+        self.service = JobRecordsClient(SERVICE_URL) if SERVICE_URL else None
+        if self.service:
+            self.database = self.service
+        else:
+            self.database = DatabaseConnection(
+                DATABASE_PATH, parcel_cache=ParcelCache()
+            )
+        self.reservations = JobNumberReservations(
+            self.database, self.job_storage
+        )
+        self.journal = SubmissionJournal()
+        self.journal_flusher = None
+
+        self.app = None
+        self.worker = None
+        self.prefetch_worker = None
+        self.status_label = None
+        # Shown in the status label whenever the worker is not busy.
+        self.idle_status = ""
+        self.queue_label = None
+        self.parcel_prefetcher = None
+        self.search_index = JobSearchIndex()
+        self.search_worker = None
+        self.query_worker = None
+        self.search_entry = None
+        self.search_results = None
+        self.search_timer = None
+        self.active_jobs_worker = None
+        self.active_jobs_view = None
+        self.active_job_filters = {}
+        self.workload_tables = {}
+        self.workload_label = None
+        self.job_number_completions = PrefixIndex()
+        self.parcel_id_completions = PrefixIndex()
+        self.data_buttons = []
+
+    def start_worker(
+        self,
+        app: ttk.Window,
+        status_label: ttk.Label = None,
+        data_buttons: list[ttk.Button] = (),
+        queue_label: ttk.Label = None,
+    ) -> None:
+        """
+        Starts the background workers that run database and parcel calls
+        off the GUI thread, and starts loading the job numbers.
+
+        Args:
+            app (ttk.Window): The main application window.
+            status_label (ttk.Label, optional): A label that shows when
+                the worker is busy.
+            data_buttons (list[ttk.Button], optional): Buttons that need
+                the job numbers, disabled until they have loaded.
+            queue_label (ttk.Label, optional): A label that shows how
+                many submissions are waiting to be written.
+        """
+        self.app = app
+        self.status_label = status_label
+        self.queue_label = queue_label
+        self.data_buttons = list(data_buttons)
+        self.worker = BackgroundWorker(app, on_busy_change=self.set_busy)
+        # Prefetches run on their own thread so a slow county lookup never
+        # delays the buttons or shows the busy state while typing.
+        self.prefetch_worker = BackgroundWorker(app)
+        # Searches get a thread of their own too, so a slow service or a
+        # search of the index while it loads never freezes typing, and
+        # never waits behind the start up loads.
+        self.query_worker = BackgroundWorker(app)
+        self.parcel_prefetcher = ParcelPrefetcher(
+            app,
+            self.prefetch_worker,
+            lambda: self.input_storage.input_objects["parcel_id"].get(),
+            self.database.fetch_parcel_data,
+        )
+
+        if ROW_CACHE_WARM_UP and not self.service:
+            # This month's jobs are the ones most often looked up, so load
+            # them into the row cache while the user starts typing.
+            self.prefetch_worker.submit(
+                "warm_job_cache",
+                self.database.warm_job_cache,
+                self.job_generator.get_job_number_prefix(),
+                on_error=print,
+            )
+
+        # Start up work that scans whole tables gets a thread of its own,
+        # starting with the job numbers the buttons are waiting for. The
+        # service generates and checks job numbers itself, so a window
+        # using it does not load them.
+        self.search_worker = BackgroundWorker(app)
+        if not self.service:
+            self.set_data_buttons_state("disabled")
+            self.set_idle_status("Loading job numbers...")
+            self.search_worker.submit(
+                "load_job_numbers",
+                self.load_job_numbers,
+                on_success=self.finish_loading_job_numbers,
+                on_error=self.show_load_error,
+            )
+            self.search_worker.submit(
+                "check_schema",
+                self.database.missing_columns,
+                on_success=self.report_missing_columns,
+                on_error=print,
+            )
+            # The service keeps its own search index.
+            self.search_worker.submit(
+                "load_search_index",
+                self.search_index.load,
+                self.database,
+                on_error=print,
+            )
+            self.search_worker.submit(
+                "load_parcel_id_completions",
+                self.parcel_id_completions.load,
+                self.database,
+                EXISTING_JOBS,
+                "parcel_id",
+                on_error=print,
+            )
+            if WORKLOAD_COUNT_ON_START:
+                self.search_worker.submit(
+                    "count_workload",
+                    self.database.workload.build,
+                    self.database,
+                    on_error=print,
+                )
+
+        # Submissions left in the journal by an earlier session are
+        # written as soon as the database can be reached.
+        self.journal_flusher = JournalFlusher(self.journal, self.database)
+        self.journal_flusher.start()
+        self.poll_journal()
+
+    def load_job_numbers(self) -> None:
+        """Brings the job numbers up to date with the database."""
+        with metrics.timed("startup.load_job_numbers"):
+            JobNumberSynchronizer(self.database, self.job_storage).sync()
 
-        active_jobs = self.database.execute_query(
-            "SELECT [Job Number] FROM [Active Jobs]"
+    def finish_loading_job_numbers(self, result=None) -> None:
+        """Enables the buttons that need the job numbers once they have
+        loaded."""
+        self.set_data_buttons_state("normal")
+        self.set_idle_status("")
+        # The job numbers are copied here, on the GUI thread, and sorted on
+        # the search worker.
+        self.search_worker.submit(
+            "load_job_number_completions",
+            self.job_number_completions.update,
+            list(self.job_storage.get_existing_job_numbers())
+            + list(self.job_storage.get_active_job_numbers()),
+            on_error=print,
         )
 
-        existing_jobs = self.database.execute_query(
-            "SELECT [Job Number] FROM [Existing Jobs]"
+    def report_missing_columns(self, missing: dict) -> None:
+        """Shows the column names in config.py that the database does
+        not have, since reading or writing those columns fails."""
+        if not missing:
+            return
+        self.show_error(
+            Exception(
+                "These columns in config.py are not in the database:\n"
+                + "\n".join(
+                    f"{table}: {', '.join(names)}"
+                    for table, names in missing.items()
+                )
+            )
         )
 
-        self.job_storage.add_active_job_numbers(active_jobs)
-        self.job_storage.add_existing_job_numbers(existing_jobs)
+    def show_load_error(self, error: Exception) -> None:
+        """Reports job numbers that could not be loaded. The buttons that
+        need them stay disabled."""
+        self.set_idle_status("Could not load job numbers. Restart to retry.")
+        self.show_error(error)
+
+    def set_data_buttons_state(self, state: str) -> None:
+        """Enables ("normal") or disables ("disabled") the buttons that
+        need the job numbers."""
+        for button in self.data_buttons:
+            button.config(state=state)
+
+    def set_status(self, status: str) -> None:
+        """Shows a message in the status label."""
+        if self.status_label:
+            self.status_label.config(text=status)
+
+    def set_idle_status(self, status: str) -> None:
+        """Shows a message in the status label that stays, or comes back,
+        whenever the background worker is not busy."""
+        self.idle_status = status
+        # While busy, set_busy shows it once the worker finishes.
+        if not (self.worker and self.worker.reported_busy):
+            self.set_status(status)
+
+    def set_busy(self, busy: bool) -> None:
+        """Shows a busy cursor and status while the background worker is
+        running, and the idle status once it finishes."""
+        if self.app:
+            self.app.config(cursor="watch" if busy else "")
+        self.set_status(
+            "Working... (Esc to cancel)" if busy else self.idle_status
+        )
+
+    def run_in_background(
+        self, key: str, function, *args, on_success=None, **kwargs
+    ) -> None:
+        """
+        Runs a function on the background worker and passes its result to
+        on_success on the GUI thread. Falls back to running the function
+        directly if the worker has not been started.
+        """
+        # Actions are timed from the click until their result is shown.
+        started_at = time.perf_counter()
+
+        def finish(result) -> None:
+            if on_success:
+                on_success(result)
+            metrics.record(
+                f"action.{key}", time.perf_counter() - started_at
+            )
+
+        def fail(error: Exception) -> None:
+            metrics.record(
+                f"action.{key}", time.perf_counter() - started_at, error=True
+            )
+            self.show_error(error)
+
+        if self.worker is None:
+            finish(function(*args, **kwargs))
+            return
+
+        self.worker.submit(
+            key, function, *args, on_success=finish, on_error=fail, **kwargs
+        )
+
+    def cancel_background_tasks(self) -> None:
+        """Cancels any queued or running background tasks."""
+        if self.worker:
+            self.worker.cancel_all()
+
+    def show_error(self, error: Exception) -> None:
+        """Shows an error raised by a background task."""
+        Messagebox.show_error(str(error), title="Error", parent=self.app)
 
     def clear_input_fields(self, excluded_elements=[]) -> None:
         """
@@ -62,14 +357,109 @@ class Controller:
 
     def submit_user_input(self) -> None:
         """
-        Submits the user input to the database by calling the
-        'insert_new_job' method.
-
-        Note:
-            The 'insert_new_job' method is responsible for adding the user
-            input to the database.
+        Submits the user input. The submission is stored in the local
+        journal and acknowledged at once; the journal flusher writes it
+        to the database with 'insert_new_job' in the background, so a
+        slow or unreachable share never loses an entry.
         """
-        self.database.insert_new_job(self.input_storage.inputs)
+        started_at = time.perf_counter()
+        # Widget values must be read on the GUI thread.
+        user_inputs = self.input_storage.inputs
+        job_number = user_inputs["job_number"]
+        # The stored job numbers decide whether each table is updated or
+        # inserted into. Only a job that is known to exist may be
+        # updated; any other clash means the number was taken elsewhere,
+        # and must not overwrite that job. With a service, only the jobs
+        # looked up or submitted in this window are stored.
+        in_existing_jobs = (
+            job_number in self.job_storage.get_existing_job_numbers()
+        )
+        in_active_jobs = (
+            job_number in self.job_storage.get_active_job_numbers()
+        )
+        # An existing job only has the fields the operator changed
+        # rewritten.
+        changed_fields = (
+            self.input_storage.dirty_fields if in_existing_jobs else None
+        )
+        try:
+            self.journal.append(
+                user_inputs,
+                self.take_prefetched_parcel(user_inputs["parcel_id"]),
+                allow_update=in_existing_jobs,
+                in_existing_jobs=in_existing_jobs,
+                in_active_jobs=in_active_jobs,
+                changed_fields=changed_fields,
+            )
+        except Exception as error:
+            metrics.record(
+                "action.submit", time.perf_counter() - started_at, error=True
+            )
+            self.show_error(error)
+            return
+        metrics.record("action.submit", time.perf_counter() - started_at)
+
+        # The number is taken as soon as it is queued, so it is never
+        # generated again while it waits.
+        self.job_storage.add_job_number(job_number)
+        self.input_storage.mark_clean()
+        self.show_queue_depth()
+        if self.journal_flusher:
+            self.journal_flusher.notify()
+
+    def poll_journal(self) -> None:
+        """Records the jobs the journal flusher has written, reports the
+        ones it gave up on, and shows how many are still waiting."""
+        while True:
+            try:
+                result, error = self.journal_flusher.results.get_nowait()
+            except queue.Empty:
+                break
+            if error is None:
+                self.record_submitted_job(result)
+            else:
+                self.show_error(
+                    Exception(
+                        f"Job {result} was not saved: {error}\n"
+                        "It is kept in the submission journal."
+                    )
+                )
+        self.show_queue_depth()
+        self.app.after(JOURNAL_POLL_MS, self.poll_journal)
+
+    def show_queue_depth(self) -> None:
+        """Shows how many submissions are waiting to be written."""
+        if not self.queue_label:
+            return
+        depth = self.journal.depth
+        if depth == 0:
+            text = ""
+        elif self.journal_flusher and self.journal_flusher.last_error:
+            text = f"{depth} queued - database unreachable, retrying"
+        else:
+            text = f"{depth} queued"
+        self.queue_label.config(text=text)
+
+    def record_submitted_job(self, parcel_data: dict) -> None:
+        """Stores a submitted job's number and adds the job to the search
+        index and the entry suggestions."""
+        self.job_storage.add_job_number(parcel_data["job_number"])
+        self.search_index.add_job(parcel_data)
+        self.job_number_completions.add(parcel_data["job_number"])
+        self.parcel_id_completions.add(parcel_data["parcel_id"])
+
+    def schedule_parcel_prefetch(self, event=None) -> None:
+        """Restarts the parcel prefetch timer whenever the parcel ID entry
+        changes."""
+        if self.parcel_prefetcher:
+            self.parcel_prefetcher.schedule(event)
+
+    def take_prefetched_parcel(self, parcel_id: str) -> dict | None:
+        """Returns the prefetched parcel data if it belongs to the given
+        parcel ID, or None if it has not been prefetched."""
+        if self.parcel_prefetcher is None:
+            return None
+        return self.parcel_prefetcher.take(parcel_id)
 
     def retrieve_existing_job_data(self) -> None:
         """
@@ -87,47 +477,269 @@ class Controller:
             ]
         )
 
+        # The service is asked directly, as its job numbers are not
+        # stored here.
         existing_job_numbers = self.job_storage.get_existing_job_numbers()
-
-        if job_number in existing_job_numbers:
-            existing_job_data = self.database.execute_query(
-                f"SELECT * FROM [Existing Jobs]\
-    WHERE [Job Number] = '{job_number}'"
-            )[0]
-        else:
+        if not self.service and job_number not in existing_job_numbers:
             return
 
-        field_mapping = {
-            "parcel_id": existing_job_data[4],
-            "entry_by": existing_job_data[11],
-            "contact_info": existing_job_data[13],
-            "additional_info": existing_job_data[12],
-        }
+        self.run_in_background(
+            "retrieve",
+            self.database.get_existing_job,
+            job_number,
+            on_success=self.display_existing_job_data,
+        )
+
+    def display_existing_job_data(self, existing_job) -> None:
+        """Updates the input fields with the data of an existing job."""
+        if not existing_job:
+            return
+        # Known to exist from now on, so a submit may update it.
+        self.job_storage.add_existing_job_numbers([(existing_job.job_number,)])
+        input_objects = self.input_storage.input_objects
 
-        for field, data in field_mapping.items():
+        loaded_values = {"job_number": existing_job.job_number}
+        for field in DISPLAYED_JOB_FIELDS:
+            data = getattr(existing_job, field)
+            loaded_values[field] = "" if data is None else str(data)
             if data:
                 self.update_input_value(input_objects[field], data)
+        # The loaded values are recorded rather than read back from the
+        # fields, so text typed while the job loaded is still submitted.
+        self.input_storage.mark_loaded(loaded_values)
+
+    def set_search_widgets(
+        self, search_entry: ttk.Entry, search_results: ttk.Treeview
+    ) -> None:
+        """Stores the widgets of the job search window."""
+        self.search_entry = search_entry
+        self.search_results = search_results
+
+    def schedule_search(self, event=None) -> None:
+        """Restarts the search timer whenever the search entry changes, so
+        the results are only refreshed once the operator pauses."""
+        if self.app is None:
+            self.run_search()
+            return
+        if self.search_timer:
+            self.app.after_cancel(self.search_timer)
+        self.search_timer = self.app.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self) -> None:
+        """Shows the jobs matching the search entry in the results
+        table."""
+        self.search_timer = None
+        if self.search_results is None:
+            return
+        if not self.search_results.winfo_exists():
+            return
+
+        query = self.search_entry.get()
+        if self.query_worker is None:
+            try:
+                self.show_search_results(self.search_jobs(query))
+            except OSError as error:
+                self.show_search_error(error)
+        else:
+            # A search already running blocks this one, so the results
+            # shown check that they are still for the query typed.
+            self.query_worker.submit(
+                "search",
+                self.search_jobs,
+                query,
+                on_success=self.show_search_results,
+                on_error=self.show_search_error,
+            )
+
+    def search_jobs(self, query: str) -> tuple[str, list]:
+        """Returns the query with the jobs that match it."""
+        if self.service:
+            return query, self.service.search(query)
+        return query, self.search_index.search(query)
+
+    def show_search_results(self, result: tuple[str, list]) -> None:
+        """Shows the jobs found by search_jobs in the results table, or
+        searches again if the search entry changed in the meantime."""
+        query, matching_jobs = result
+        if self.search_results is None:
+            return
+        if not self.search_results.winfo_exists():
+            return
+        if query != self.search_entry.get():
+            self.run_search()
+            return
+        self.search_results.delete(*self.search_results.get_children())
+        for job in matching_jobs:
+            self.search_results.insert(
+                "",
+                END,
+                iid=job.job_number,
+                values=["" if value is None else value for value in job],
+            )
+
+    def show_search_error(self, error: Exception) -> None:
+        """Reports a search that failed, e.g. because the job records
+        service did not answer, in the status label."""
+        self.set_status(f"Search failed: {error}")
+
+    def select_search_result(self, event=None) -> None:
+        """Fills in the selected job's number and gathers its data."""
+        selection = self.search_results.selection()
+        if not selection:
+            return
+        self.update_input_value(
+            self.input_storage.input_objects["job_number"], selection[0]
+        )
+        self.retrieve_existing_job_data()
 
     def update_job_number_display(self) -> None:
         """
-        Updates the job number input field with the next unused job number,
-        generated based on the current year and existing job numbers in the
-        database.
+        Updates the job number input field with the next unused job number.
+        The number is worked out from the stored job numbers and reserved
+        in the database, so no other workstation can hand it out.
         """
+        if self.service:
+            self.run_in_background(
+                "generate",
+                self.service.generate_job_number,
+                on_success=self.display_unused_job_number,
+            )
+            return
+
+        unused_job_number = self.job_generator.unused_job_number
+
+        self.run_in_background(
+            "generate",
+            self.reservations.reserve_job_number,
+            unused_job_number[:4],
+            int(unused_job_number[4:]),
+            on_success=self.display_unused_job_number,
+        )
+
+    def display_unused_job_number(self, unused_job_number: str) -> None:
+        """Stores the reserved job number and shows it in the job number
+        input field."""
         input_objects = self.input_storage.input_objects
-        current_year = self.job_generator.year
 
-        existing_current_year_jobs = self.database.execute_query(
-            f"SELECT [Job Number] FROM [Existing Jobs] WHERE [Job Number]\
-    LIKE '{current_year}%'"
+        self.job_storage.add_unused_job_number(unused_job_number)
+
+        input_objects["job_number"].delete(0, END)
+        input_objects["job_number"].insert(0, unused_job_number)
+
+    def set_active_jobs_widgets(
+        self,
+        treeview: ttk.Treeview,
+        scrollbar: ttk.Scrollbar,
+        count_label: ttk.Label,
+        filter_entries: dict,
+    ) -> None:
+        """Shows the Active Jobs in the browser window's table, a page at
+        a time, and reads the first page."""
+        if self.service:
+            self.show_error(
+                Exception(
+                    "Active Jobs cannot be browsed through the job"
+                    " records service."
+                )
+            )
+            return
+        if self.active_jobs_worker is None:
+            # Pages are read on their own thread, so scrolling never waits
+            # behind start up work or a submit.
+            self.active_jobs_worker = BackgroundWorker(self.app)
+        self.active_job_filters = filter_entries
+        self.active_jobs_view = ActiveJobsView(
+            treeview,
+            scrollbar,
+            ActiveJobPages(self.database, ACTIVE_JOBS_BROWSER_COLUMNS),
+            self.active_jobs_worker,
+            count_label=count_label,
+            on_select=self.select_active_job,
+            on_error=self.show_error,
         )
-        self.job_storage.add_current_year_job_numbers(
-            existing_current_year_jobs
+        self.active_jobs_view.refresh()
+
+    def filter_active_jobs(self, event=None) -> None:
+        """Shows the Active Jobs matching the filter entries."""
+        if self.active_jobs_view is None:
+            return
+        filters = []
+        for name, entry in self.active_job_filters.items():
+            value = entry.get().strip()
+            if not value:
+                continue
+            column, operator = ACTIVE_JOB_FILTERS[name]
+            if column == "fieldwork_date":
+                try:
+                    value = parse_date(value)
+                except ValueError as error:
+                    self.show_error(error)
+                    return
+            filters.append((column, operator, value))
+        self.active_jobs_view.refresh(filters)
+
+    def select_active_job(self, job_number: str) -> None:
+        """Fills in a job number chosen in the Active Jobs browser and
+        gathers its data."""
+        self.update_input_value(
+            self.input_storage.input_objects["job_number"], job_number
         )
-        self.job_storage.add_unused_job_number(
-            self.job_generator.unused_job_number
+        self.retrieve_existing_job_data()
+
+    def set_workload_widgets(
+        self, tables: dict, label: ttk.Label, recount_button: ttk.Button
+    ) -> None:
+        """Shows the workload counts in the dashboard window's tables."""
+        self.workload_tables = tables
+        self.workload_label = label
+        recount_button.config(command=lambda: self.show_workload(True))
+        self.show_workload()
+
+    def show_workload(self, recount: bool = False) -> None:
+        """
+        Shows the workload counts. Counts that are already taken are shown
+        at once; otherwise, or for a recount, the jobs are counted on the
+        search worker, behind any count still running from start up.
+        """
+        if not recount and not self.service:
+            workload = self.database.workload.snapshot()
+            if workload is not None:
+                self.display_workload(workload)
+                return
+        if self.workload_label:
+            self.workload_label.config(text="Counting jobs...")
+        self.search_worker.submit(
+            "read_workload",
+            self.read_workload,
+            recount,
+            on_success=self.display_workload,
+            on_error=self.show_error,
         )
-        unused_job_number = self.job_storage.unused_job_number
 
-        input_objects["job_number"].delete(0, END)
-        input_objects["job_number"].insert(0, unused_job_number)
+    def read_workload(self, recount: bool = False) -> dict:
+        """Returns the workload counts, counting the jobs first if they
+        have not been counted or a recount is asked for."""
+        if self.service:
+            return self.service.workload(recount)
+        workload = self.database.workload
+        if recount or not workload.built:
+            workload.build(self.database)
+        return workload.snapshot()
+
+    def display_workload(self, workload: dict) -> None:
+        """Fills the dashboard's tables with the workload counts."""
+        if not self.workload_label or not self.workload_label.winfo_exists():
+            return
+        for name, table in self.workload_tables.items():
+            rows = list(workload[name].items())
+            if name == "jobs_per_month":
+                rows = rows[:WORKLOAD_MONTHS_SHOWN]
+            table.delete(*table.get_children())
+            for label, count in rows:
+                table.insert("", END, values=(label, f"{count:,}"))
+        counted_at = workload["counted_at"].replace("T", " ")
+        self.workload_label.config(
+            text=f"{workload['existing_jobs']:,} jobs,"
+            f" {workload['active_jobs']:,} active."
+            f" Counted {counted_at}, with jobs saved since."
+        )
@@ -1,17 +1,155 @@
-"""This module contains the DatabaseConnection class."""
-import pyodbc
-from parcel_data_collector.county_property_data import ParcelDataCollection
+"""This module contains the DatabaseConnection class.
+pyodbc and parcel_data_collector are slow to import, so they are imported
+when they are first used, after the window is already showing."""
+import datetime
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Iterable, Iterator
 
-from config import ACTIVE_DB_COLUMN_ORDER, EXISTING_DB_COLUMN_ORDER
+from config import (
+    ACTIVE_DB_COLUMN_ORDER,
+    EXISTING_DB_COLUMN_ORDER,
+    EXPORT_BATCH_SIZE,
+    FAST_EXECUTEMANY,
+)
+
+from .connection_pool import ConnectionPool, PooledConnection
+from .instrumentation import instrumented, metrics
+from .parcel_cache import ParcelCache
+from .records import has_fields, project, to_records
+from .row_cache import JobRowCache
+from .sql_statements import (
+    ACTIVE_JOBS,
+    EXISTING_JOBS,
+    RESERVATIONS,
+    TABLE_COLUMN_NAMES,
+    TABLE_COLUMN_ORDERS,
+    delete_statement,
+    insert_statement,
+    select_statement,
+    update_statement,
+)
+from .workload_counters import STATUS_COLUMNS, WorkloadCounters
+
+# The Existing Jobs columns rewritten when a job is submitted again.
+EXISTING_UPDATE_COLUMNS = (
+    "job_date",
+    "parcel_id",
+    "subdivision",
+    "lot",
+    "block",
+    "plat_book",
+    "plat_page",
+    "legal_description",
+    "entry_by",
+    "additional_info",
+    "contact_info",
+)
+
+# The Active Jobs columns rewritten when a job is submitted again. The
+# invoice status is not on the form, so it is left as the office set it.
+ACTIVE_UPDATE_COLUMNS = tuple(
+    column
+    for column in ACTIVE_DB_COLUMN_ORDER
+    if column not in ("job_number", "invoice_status")
+)
+
+UPDATE_COLUMNS = {
+    EXISTING_JOBS: EXISTING_UPDATE_COLUMNS,
+    ACTIVE_JOBS: ACTIVE_UPDATE_COLUMNS,
+}
+
+# The columns entered on the form. The other columns of a job are filled
+# from the parcel lookup.
+FORM_COLUMNS = frozenset(
+    (
+        "job_date",
+        "fieldwork_date",
+        "job_number",
+        "parcel_id",
+        "entry_by",
+        "inhouse_status",
+        "requested_services",
+        "contact_info",
+        "additional_info",
+    )
+)
+
+# The columns rewritten from a new parcel lookup when a job's parcel ID
+# changes.
+PARCEL_UPDATE_COLUMNS = {
+    table: tuple(column for column in columns if column not in FORM_COLUMNS)
+    for table, columns in UPDATE_COLUMNS.items()
+}
+
+# The Existing Jobs columns shown when a job is looked up.
+EXISTING_LOOKUP_COLUMNS = (
+    "job_number",
+    "parcel_id",
+    "entry_by",
+    "additional_info",
+    "contact_info",
+)
+
+RESERVATION_TABLE_DEFINITION = (
+    f"CREATE TABLE [{RESERVATIONS}] ("
+    "[Block Start] TEXT(8) PRIMARY KEY, "
+    "[Workstation] TEXT(64), "
+    "[Reserved At] DATETIME, "
+    "[Expires At] DATETIME)"
+)
+
+
+def changed_columns(
+    table: str, changed_fields: Iterable[str] = None
+) -> tuple[str, ...] | None:
+    """
+    Returns the columns of a table to rewrite when a job is submitted
+    again, or None to rewrite every column.
+
+    Args:
+        table (str): The table being updated.
+        changed_fields (Iterable[str], optional): The fields changed since
+            the job was loaded, or None if unknown. A changed parcel ID
+            also rewrites the columns that come from the parcel lookup.
+    """
+    if changed_fields is None:
+        return None
+    changed_fields = set(changed_fields)
+    parcel_changed = "parcel_id" in changed_fields
+    return tuple(
+        column
+        for column in UPDATE_COLUMNS[table]
+        if column in changed_fields
+        or (parcel_changed and column in PARCEL_UPDATE_COLUMNS[table])
+    )
+
+
+class JobNumberTakenError(Exception):
+    """Raised when a new job's number already belongs to another job."""
 
 
 class DatabaseConnection:
     """This class is used to manage the database connection and execute
     queries."""
 
-    def __init__(self, database_path: str):
+    # A cheap query that still has to reach the database file.
+    HEALTH_CHECK_QUERY = "SELECT COUNT(*) FROM [Existing Jobs] WHERE 1=0"
+
+    def __init__(self, database_path: str, parcel_cache: ParcelCache = None):
         self.database_path = database_path
-        self.connection = self.connect()
+        self.parcel_cache = parcel_cache
+        self.job_cache = JobRowCache()
+        # Built on request; kept up to date by every job written.
+        self.workload = WorkloadCounters()
+        # Connections are opened lazily by the pool on first use.
+        self.pool = ConnectionPool(self.connect, self.is_alive)
+        self.local = threading.local()
+        # Parcel lookups in progress, keyed by parcel ID, so a second
+        # request for the same parcel waits for the first lookup.
+        self.parcel_lookups = {}
+        self.parcel_lookups_lock = threading.Lock()
 
     def connect(self) -> None:
         """Connects to the Microsoft Access database."""
@@ -19,57 +157,532 @@ class DatabaseConnection:
             r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};"
             f"DBQ={self.database_path};"
         )
-        return pyodbc.connect(connection_str)
+        return self.driver().connect(connection_str)
+
+    def driver(self):
+        """Returns the DB-API module of the database driver, whose Error
+        and IntegrityError exceptions are caught."""
+        import pyodbc
+
+        return pyodbc
+
+    def is_alive(self, connection) -> bool:
+        """Returns True if a connection can still reach the database."""
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self.HEALTH_CHECK_QUERY)
+            cursor.fetchall()
+        finally:
+            cursor.close()
+        return True
 
     def close(self) -> None:
-        """Closes the database connection."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Closes the database connections."""
+        self.pool.close_all()
+
+    @contextmanager
+    def checkout(self) -> Iterator[PooledConnection]:
+        """Checks out a connection from the pool. Nested checkouts on the
+        same thread share one connection. Sharing it does not make them
+        one transaction by itself: execute_non_query leaves statements
+        run inside a checkout uncommitted, and transaction() commits
+        them together."""
+        current_connection = getattr(self.local, "connection", None)
+        if current_connection is not None:
+            yield current_connection
+            return
+
+        with self.pool.connection() as connection:
+            self.local.connection = connection
+            try:
+                yield connection
+            finally:
+                self.local.connection = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[PooledConnection]:
+        """Runs the statements of a with block as one transaction, which
+        is committed once at the end and rolled back if the block raises.
+        A transaction inside another one joins the outer transaction."""
+        if getattr(self.local, "connection", None) is not None:
+            with self.checkout() as connection:
+                yield connection
+            return
+
+        self.local.on_commit = []
+        try:
+            with self.checkout() as connection:
+                try:
+                    yield connection
+                except BaseException:
+                    connection.rollback()
+                    raise
+                connection.commit()
+            on_commit = self.local.on_commit
+        finally:
+            self.local.on_commit = None
+        for function, args in on_commit:
+            function(*args)
+
+    def after_commit(self, function, *args) -> None:
+        """Calls a function once the current transaction is committed, or
+        at once outside a transaction. It is not called if the transaction
+        is rolled back."""
+        on_commit = getattr(self.local, "on_commit", None)
+        if on_commit is None:
+            function(*args)
+        else:
+            on_commit.append((function, args))
+
+    def table_columns(self, table: str) -> list[str]:
+        """Returns the names of a table's columns as the database has
+        them, without reading any rows."""
+        with self.checkout() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"SELECT * FROM [{table}] WHERE 1=0")
+                return [column[0] for column in cursor.description]
+            finally:
+                cursor.close()
+
+    def missing_columns(
+        self, tables: Iterable[str] = (EXISTING_JOBS, ACTIVE_JOBS)
+    ) -> dict[str, list[str]]:
+        """Returns the column names in config.py that are not in the
+        database, for each table missing any. Statements naming these
+        columns fail, so they must be corrected in config.py. Access
+        compares column names without regard to case."""
+        missing = {}
+        for table in tables:
+            columns = {name.lower() for name in self.table_columns(table)}
+            names = [
+                name
+                for name in TABLE_COLUMN_NAMES[table].values()
+                if name.lower() not in columns
+            ]
+            if names:
+                missing[table] = names
+        return missing
+
+    def prepared_cursor(self, connection: PooledConnection, query: str):
+        """Returns a cursor dedicated to one statement on a connection.
+        Executing the same statement text on the same cursor lets the
+        driver reuse the prepared statement instead of parsing it again."""
+        cursor = connection.prepared_cursors.get(query)
+        if cursor is None:
+            cursor = connection.cursor()
+            connection.prepared_cursors[query] = cursor
+        return cursor
 
     def execute_query(self, query: str, parameters: tuple = None) -> [tuple]:
         """Executes a query and returns the results."""
-        with self.connection.cursor() as cursor:
-            if parameters:
-                cursor.execute(query, parameters)
-            else:
-                cursor.execute(query)
-            return cursor.fetchall()
+        with metrics.timed("db.execute_query") as timing:
+            with self.checkout() as connection:
+                cursor = self.prepared_cursor(connection, query)
+                if parameters:
+                    cursor.execute(query, parameters)
+                else:
+                    cursor.execute(query)
+                rows = cursor.fetchall()
+            timing["rows"] = len(rows)
+            return rows
+
+    def stream_query(
+        self,
+        query: str,
+        parameters: tuple = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> tuple[tuple, Iterator[list[tuple]]]:
+        """
+        Executes a query and returns its column descriptions along with a
+        generator that fetches the results a batch at a time, so large
+        results never have to fit in memory.
 
-    def execute_non_query(self, query: str, parameters: tuple = None) -> None:
-        """Executes a query that does not return any results."""
-        with self.connection.cursor() as cursor:
+        Returns:
+            tuple[tuple, Iterator[list[tuple]]]: The cursor description
+                and a generator of row batches.
+        """
+        # The connection stays checked out until the generator finishes,
+        # so callers must exhaust or close it.
+        connection = self.pool.acquire()
+        cursor = None
+        try:
+            cursor = connection.cursor()
             if parameters:
                 cursor.execute(query, parameters)
             else:
                 cursor.execute(query)
-            self.connection.commit()
+        except Exception:
+            if cursor is not None:
+                cursor.close()
+            self.pool.release(connection, failed=True)
+            raise
 
-    def insert_new_job(self, user_inputs: dict) -> None:
-        """Inserts a new job into the database."""
-        parcel = ParcelDataCollection(user_inputs["parcel_id"])
-        parcel_data = parcel.parcel_data
-        parcel_data["county"] = parcel.county
+        def fetch_batches() -> Iterator[list[tuple]]:
+            # Timed from the first fetch, so a generator that is never
+            # read does not count.
+            with metrics.timed("db.stream_query") as timing:
+                timing["rows"] = 0
+                try:
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        timing["rows"] += len(rows)
+                        yield rows
+                finally:
+                    cursor.close()
+                    self.pool.release(connection)
+
+        return cursor.description, fetch_batches()
+
+    def execute_non_query(self, query: str, parameters: tuple = None) -> int:
+        """Executes a query that does not return any results, and returns
+        the number of rows it changed. Inside a transaction the query is
+        committed along with the rest of the transaction."""
+        in_transaction = getattr(self.local, "connection", None) is not None
+        with metrics.timed("db.execute_non_query") as timing:
+            with self.checkout() as connection:
+                cursor = self.prepared_cursor(connection, query)
+                if parameters:
+                    cursor.execute(query, parameters)
+                else:
+                    cursor.execute(query)
+                if not in_transaction:
+                    connection.commit()
+                timing["rows"] = cursor.rowcount
+            return timing["rows"]
+
+    def fetch_records(
+        self,
+        table: str,
+        columns: tuple[str, ...] = None,
+        where: tuple[tuple[str, str], ...] = (),
+        parameters: tuple = (),
+    ) -> list[tuple]:
+        """
+        Returns the rows of a table as named records, selecting only the
+        given columns.
+
+        Args:
+            table (str): The table to select from.
+            columns (tuple[str, ...], optional): The columns to select.
+                Selects every column if not given.
+            where (tuple[tuple[str, str], ...], optional): (column,
+                operator) pairs compared with the parameters.
+            parameters (tuple, optional): The values for the conditions.
+        """
+        rows = self.execute_query(
+            select_statement(table, columns, where), parameters
+        )
+        return to_records(table, rows, columns)
+
+    def get_existing_job(
+        self,
+        job_number: str,
+        columns: tuple[str, ...] = EXISTING_LOOKUP_COLUMNS,
+    ) -> tuple | None:
+        """Returns a record of the given Existing Jobs columns for a job
+        number, or None if there is no such job. Records are served from
+        the job cache when the cached record holds every column."""
+        record = self.job_cache.get(job_number)
+        if record is not None and has_fields(record, columns):
+            return project(record, EXISTING_JOBS, columns)
+
+        generation = self.job_cache.generation
+        records = self.fetch_records(
+            EXISTING_JOBS, columns, (("job_number", "="),), (job_number,)
+        )
+        if not records:
+            return None
+        self.job_cache.put(job_number, records[0], since=generation)
+        return records[0]
+
+    def warm_job_cache(
+        self,
+        prefix: str,
+        columns: tuple[str, ...] = EXISTING_LOOKUP_COLUMNS,
+    ) -> int:
+        """Loads the Existing Jobs records whose job number starts with a
+        prefix, e.g. the current month, into the job cache. Returns the
+        number of records loaded."""
+        if "job_number" not in columns:
+            columns = ("job_number",) + columns
+        # Jobs written while the records are read, e.g. by a submit on
+        # another thread, are not cached with their old values.
+        generation = self.job_cache.generation
+        records = self.fetch_records(
+            EXISTING_JOBS, columns, (("job_number", "LIKE"),), (f"{prefix}%",)
+        )
+        for record in records:
+            self.job_cache.put(record.job_number, record, since=generation)
+        return len(records)
+
+    def get_job_numbers_with_prefix(
+        self, prefix: str, table: str = EXISTING_JOBS
+    ) -> list[tuple]:
+        """Returns the job numbers in a table that start with a prefix,
+        e.g. the current year."""
+        return self.execute_query(
+            select_statement(
+                table, ("job_number",), (("job_number", "LIKE"),)
+            ),
+            (f"{prefix}%",),
+        )
+
+    def get_job_numbers_between(self, low: str, high: str) -> list[str]:
+        """Returns the job numbers in Existing Jobs or Active Jobs from low
+        up to, but not including, high, in order."""
+        job_numbers = set()
+        for table in (EXISTING_JOBS, ACTIVE_JOBS):
+            rows = self.execute_query(
+                select_statement(
+                    table,
+                    ("job_number",),
+                    (("job_number", ">="), ("job_number", "<")),
+                ),
+                (low, high),
+            )
+            job_numbers.update(row[0] for row in rows)
+        return sorted(job_numbers)
+
+    def create_reservation_table(self) -> None:
+        """Creates the job number reservation table if it is missing."""
+        with self.checkout() as connection:
+            cursor = connection.cursor()
+            try:
+                if cursor.tables(table=RESERVATIONS).fetchone() is None:
+                    cursor.execute(RESERVATION_TABLE_DEFINITION)
+                    connection.commit()
+            finally:
+                cursor.close()
+
+    def insert_reservation(
+        self,
+        block_start: str,
+        workstation: str,
+        reserved_at: datetime.datetime,
+        expires_at: datetime.datetime,
+    ) -> bool:
+        """Reserves the block of job numbers starting at block_start.
+        Returns False if another reservation already holds the block."""
+        driver = self.driver()
+        try:
+            self.execute_non_query(
+                insert_statement(RESERVATIONS),
+                (block_start, workstation, reserved_at, expires_at),
+            )
+        except driver.IntegrityError:
+            return False
+        return True
+
+    def delete_expired_reservation(
+        self, block_start: str, now: datetime.datetime
+    ) -> bool:
+        """Deletes the reservation of a block if it has expired. Returns
+        True if one was deleted."""
+        deleted_rows = self.execute_non_query(
+            delete_statement(
+                RESERVATIONS, (("block_start", "="), ("expires_at", "<"))
+            ),
+            (block_start, now),
+        )
+        return deleted_rows > 0
+
+    def delete_expired_reservations(self, now: datetime.datetime) -> int:
+        """Deletes every reservation that has expired. Returns the number
+        deleted."""
+        return self.execute_non_query(
+            delete_statement(RESERVATIONS, (("expires_at", "<"),)), (now,)
+        )
+
+    @instrumented("db.insert_jobs")
+    def insert_jobs(self, parcel_data_rows: list[dict]) -> None:
+        """Inserts several jobs into both tables with executemany in a
+        single transaction. Nothing is inserted if any row fails."""
+        driver = self.driver()
+        with self.checkout() as connection:
+            cursor = connection.cursor()
+            try:
+                if FAST_EXECUTEMANY:
+                    cursor.fast_executemany = True
+                cursor.executemany(
+                    insert_statement(EXISTING_JOBS),
+                    [
+                        [row[column] for column in EXISTING_DB_COLUMN_ORDER]
+                        for row in parcel_data_rows
+                    ],
+                )
+                cursor.executemany(
+                    insert_statement(ACTIVE_JOBS),
+                    [
+                        [row[column] for column in ACTIVE_DB_COLUMN_ORDER]
+                        for row in parcel_data_rows
+                    ],
+                )
+                connection.commit()
+            except driver.Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+        for row in parcel_data_rows:
+            self.job_cache.invalidate(row["job_number"])
+            self.record_workload(EXISTING_JOBS, row, EXISTING_DB_COLUMN_ORDER)
+            self.record_workload(ACTIVE_JOBS, row, ACTIVE_DB_COLUMN_ORDER)
+
+    @instrumented("db.insert_new_job")
+    def insert_new_job(
+        self,
+        user_inputs: dict,
+        parcel_data: dict = None,
+        allow_update: bool = True,
+        in_existing_jobs: bool = None,
+        in_active_jobs: bool = None,
+        changed_fields: Iterable[str] = None,
+    ) -> dict:
+        """
+        Inserts a new job into both tables, or updates it where it is
+        already there, in one transaction. Returns the values written.
+
+        Args:
+            user_inputs (dict): The values entered in the form.
+            parcel_data (dict, optional): Parcel data that was already
+                looked up, e.g. by a prefetch, to skip the county lookup.
+            allow_update (bool, optional): Whether a job with the same
+                number may be updated instead. When False, a job number
+                that is already taken raises JobNumberTakenError rather
+                than overwriting the other job.
+            in_existing_jobs (bool, optional): Whether the job is known
+                to be in Existing Jobs, e.g. from the stored job numbers,
+                so the right statement is run first. Unknown if None.
+            in_active_jobs (bool, optional): The same for Active Jobs.
+            changed_fields (Iterable[str], optional): The form fields
+                changed since the job was loaded. A job that is updated
+                only has these columns rewritten, along with the parcel
+                columns if the parcel ID changed. Every column is
+                rewritten if None.
+        """
+        if parcel_data is None:
+            parcel_data = self.fetch_parcel_data(user_inputs["parcel_id"])
 
         self.merge_user_inputs_into_parcel_data(user_inputs, parcel_data)
 
+        with self.transaction():
+            self.upsert_job(
+                EXISTING_JOBS,
+                parcel_data,
+                in_existing_jobs,
+                allow_update,
+                changed_columns(EXISTING_JOBS, changed_fields),
+            )
+            self.upsert_job(
+                ACTIVE_JOBS,
+                parcel_data,
+                in_active_jobs,
+                columns=changed_columns(ACTIVE_JOBS, changed_fields),
+            )
+        self.job_cache.invalidate(parcel_data["job_number"])
+        return parcel_data
+
+    def upsert_job(
+        self,
+        table: str,
+        parcel_data: dict,
+        exists: bool = None,
+        allow_update: bool = True,
+        columns: tuple[str, ...] = None,
+    ) -> None:
+        """
+        Inserts a job into a table, or updates it if it is already there.
+        When it is known whether the job exists, a single statement is
+        usually enough; the other statement is only run if that turns
+        out to be wrong, e.g. when another workstation added the job
+        since the job numbers were last synced.
+
+        Args:
+            table (str): The table to write to.
+            parcel_data (dict): The job's values.
+            exists (bool, optional): Whether the job is known to be in
+                the table. An insert is tried first if None.
+            allow_update (bool, optional): Whether an insert that clashes
+                with another job may update it. Raises
+                JobNumberTakenError otherwise.
+            columns (tuple[str, ...], optional): The columns rewritten
+                when the job turns out to exist. Defaults to every column
+                that is updated on a resubmit.
+        """
+        if exists:
+            if columns == ():
+                # Nothing changed; the job only has to be there.
+                if self.job_exists(table, parcel_data["job_number"]):
+                    return
+            elif self.update_job(table, parcel_data, columns):
+                return
+
+        driver = self.driver()
         try:
-            self.create_new_job(parcel_data)
-        except pyodbc.IntegrityError as error:
-            print(error)
-            self.update_existing_job(parcel_data)
+            self.insert_job(table, parcel_data)
+        except driver.IntegrityError as error:
+            if not allow_update:
+                raise JobNumberTakenError(
+                    f"Job number {parcel_data['job_number']} is already"
+                    " taken. Generate a new job number and submit again."
+                ) from error
+            # The job was added since it was last synced; update it.
+            self.update_job(table, parcel_data, columns)
+
+    def fetch_parcel_data(self, parcel_id: str) -> dict:
+        """Returns the county parcel data for a parcel ID, using the
+        parcel cache when one is set. If the parcel is already being
+        looked up, e.g. by a prefetch, that lookup's result is used
+        instead of asking the county again."""
+        if self.parcel_cache:
+            parcel_data = self.parcel_cache.get(parcel_id)
+            if parcel_data is not None:
+                return parcel_data
+
+        with self.parcel_lookups_lock:
+            lookup = self.parcel_lookups.get(parcel_id)
+            joining = lookup is not None
+            if not joining:
+                lookup = self.parcel_lookups[parcel_id] = Future()
+        if joining:
+            # Callers add their own values to the parcel data, so each
+            # gets a copy.
+            return dict(lookup.result())
 
         try:
-            self.add_to_active_jobs(parcel_data)
-        except pyodbc.IntegrityError as error:
-            print(error)
+            parcel_data = self.look_up_parcel(parcel_id)
+        except BaseException as error:
+            lookup.set_exception(error)
+            raise
+        else:
+            lookup.set_result(parcel_data)
+        finally:
+            with self.parcel_lookups_lock:
+                del self.parcel_lookups[parcel_id]
+        return dict(parcel_data)
+
+    def look_up_parcel(self, parcel_id: str) -> dict:
+        """Looks up a parcel on the county site and caches its data."""
+        from parcel_data_collector.county_property_data import (
+            ParcelDataCollection,
+        )
+
+        with metrics.timed("parcel.lookup"):
+            parcel = ParcelDataCollection(parcel_id)
+        parcel_data = parcel.parcel_data
+        parcel_data["county"] = parcel.county
 
-        self.connection.commit()
+        if self.parcel_cache:
+            self.parcel_cache.put(parcel_id, parcel.county, parcel_data)
+        return parcel_data
 
     def update_existing_job(self, parcel_data: dict) -> None:
         """Updates an existing job in the database."""
-        sql_query = self.create_update_query(parcel_data)
-        self.execute_non_query(sql_query)
+        self.update_job(EXISTING_JOBS, parcel_data)
+        self.job_cache.invalidate(parcel_data["job_number"])
 
     def merge_user_inputs_into_parcel_data(
         self, user_inputs: dict, parcel_data: dict
@@ -90,40 +703,74 @@ class DatabaseConnection:
         parcel_data: dict,
     ) -> None:
         """Creates a new job in the database."""
+        self.insert_job(EXISTING_JOBS, parcel_data)
+
+    def insert_job(self, table: str, parcel_data: dict) -> None:
+        """Inserts a job into a table."""
         self.execute_non_query(
-            "INSERT INTO [Existing Jobs]\
- VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
-            [parcel_data[column] for column in EXISTING_DB_COLUMN_ORDER],
+            insert_statement(table),
+            [parcel_data[column] for column in TABLE_COLUMN_ORDERS[table]],
         )
+        self.record_workload(table, parcel_data, TABLE_COLUMN_ORDERS[table])
 
-    def create_update_query(self, parcel_data: dict) -> str:
-        """Creates and returns an SQL query to update the database
-        with new data."""
-
-        sql_query = f"""
-            UPDATE [Existing Jobs]
-            SET [Job Date] = '{parcel_data["job_date"]}',
-                [Parcel ID] = '{parcel_data["parcel_id"]}',
-                [subdivision] = '{parcel_data["subdivision"]}',
-                [Lot] = '{parcel_data["lot"]}',
-                [block] = '{parcel_data["block"]}',
-                [Plat Book] = '{parcel_data["plat_book"]}',
-                [Plat Page] = '{parcel_data["plat_page"]}',
-                [Legal Description] = '{parcel_data["legal_description"]}',
-                [Entry By] = '{parcel_data["entry_by"]}',
-                [Additional Information] = '{parcel_data["additional_info"]}',
-                [Customer Contact Information] = '{
-                    parcel_data["contact_info"]}'
-            WHERE [Job Number] = '{parcel_data["job_number"]}'
-            """
-        return sql_query
-
-    def add_to_active_jobs(self, parcel_data: dict) -> str:
-        """Creates and returns an SQL query to update the database
-        with new data."""
+    def update_job(
+        self, table: str, parcel_data: dict, columns: tuple[str, ...] = None
+    ) -> int:
+        """Updates a job in a table and returns the number of rows
+        changed, which is 0 if the job is not there."""
+        sql_query, parameters = self.create_update_query(
+            parcel_data, table, columns
+        )
+        changed_rows = self.execute_non_query(sql_query, parameters)
+        if changed_rows:
+            if columns is None:
+                columns = UPDATE_COLUMNS[table]
+            self.record_workload(table, parcel_data, columns)
+        return changed_rows
 
-        self.execute_non_query(
-            "INSERT INTO [Active Jobs]\
- VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
-            [parcel_data[column] for column in ACTIVE_DB_COLUMN_ORDER],
+    def record_workload(
+        self, table: str, parcel_data: dict, columns: Iterable[str]
+    ) -> None:
+        """Updates the workload counters for the columns of a job written
+        to a table, once the write is committed."""
+        self.after_commit(
+            self.workload.record,
+            table,
+            parcel_data["job_number"],
+            {
+                column: parcel_data[column]
+                for column in columns
+                if column in STATUS_COLUMNS
+            },
+        )
+
+    def job_exists(self, table: str, job_number: str) -> bool:
+        """Returns True if a table has a row for a job number."""
+        return bool(
+            self.execute_query(
+                select_statement(
+                    table, ("job_number",), (("job_number", "="),)
+                ),
+                (job_number,),
+            )
         )
+
+    def create_update_query(
+        self,
+        parcel_data: dict,
+        table: str = EXISTING_JOBS,
+        columns: tuple[str, ...] = None,
+    ) -> tuple[str, list]:
+        """Creates and returns an SQL query, and its parameters, to update
+        a table with new data. Every column updated on a resubmit is set
+        unless only some columns are given."""
+        if columns is None:
+            columns = UPDATE_COLUMNS[table]
+        sql_query = update_statement(table, columns)
+        parameters = [parcel_data[column] for column in columns]
+        parameters.append(parcel_data["job_number"])
+        return sql_query, parameters
+
+    def add_to_active_jobs(self, parcel_data: dict) -> None:
+        """Adds a job to the Active Jobs table."""
+        self.insert_job(ACTIVE_JOBS, parcel_data)
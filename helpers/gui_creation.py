@@ -3,7 +3,7 @@
 from typing import Tuple, Union
 
 import ttkbootstrap as ttk
-from ttkbootstrap.constants import LEFT, RIGHT, X
+from ttkbootstrap.constants import BOTH, LEFT, RIGHT, X, Y
 
 # Define a type alias for a widget font
 WidgetFont = Tuple[str, int]
@@ -346,7 +346,7 @@ def create_multi_line_entries(
     return user_input_objects
 
 
-def create_buttons(app: ttk.Window, buttons: dict) -> None:
+def create_buttons(app: ttk.Window, buttons: dict) -> dict:
     """
     Create buttons and add them to a frame in the app.
 
@@ -358,9 +358,163 @@ def create_buttons(app: ttk.Window, buttons: dict) -> None:
             values as the functions to be called when the buttons are clicked.
 
     Returns:
-        None.
+        A dictionary with the created ttk.Button widgets, where keys are
+        the labels of the buttons.
     """
 
     frame = create_frame(app)
+    button_objects = {}
     for button_label, button_function in buttons.items():
-        create_button(frame=frame, text=button_label, command=button_function)
+        button_objects[button_label] = create_button(
+            frame=frame, text=button_label, command=button_function
+        )
+    return button_objects
+
+
+def create_search_window(
+    app: ttk.Window,
+    columns: dict,
+    font: tuple = ("Arial", 12),
+) -> tuple[ttk.Toplevel, ttk.Entry, ttk.Treeview]:
+    """
+    Create a window with a search entry above a table of results.
+
+    Args:
+        app (ttk.Window):
+            The main application window.
+        columns (dict):
+            A dictionary with keys as the names of the result columns,
+            and values as their headings.
+        font (tuple, optional): The font for the search entry.
+            Defaults to ("Arial", 12).
+
+    Returns:
+        The search window, its entry and its results table.
+    """
+    window = ttk.Toplevel(app, title="Search Jobs")
+    window.geometry("800x400")
+
+    frame = create_frame(window, fill=X)
+    create_label(frame=frame, text="Search", font=font)
+    entry = create_single_line_entry(
+        frame=frame, font=font, name="search", width=60
+    )
+
+    results = ttk.Treeview(
+        window, columns=list(columns), show="headings", height=15
+    )
+    for column, heading in columns.items():
+        results.heading(column, text=heading)
+        results.column(column, width=100, stretch=True)
+    results.pack(padx=10, pady=10, fill=BOTH, expand=True)
+
+    entry.focus_set()
+    return window, entry, results
+
+
+def create_active_jobs_window(
+    app: ttk.Window,
+    columns: dict,
+    filters: dict,
+    font: tuple = ("Arial", 12),
+) -> tuple[
+    ttk.Toplevel, dict, ttk.Button, ttk.Treeview, ttk.Scrollbar, ttk.Label
+]:
+    """
+    Create a window with filter entries above a table of Active Jobs, and
+    a label for the number of jobs below it.
+
+    Args:
+        app (ttk.Window):
+            The main application window.
+        columns (dict):
+            A dictionary with keys as the names of the table columns,
+            and values as their headings.
+        filters (dict):
+            A dictionary with keys as the names of the filter entries,
+            and values as their labels.
+        font (tuple, optional): The font for the filter entries.
+            Defaults to ("Arial", 12).
+
+    Returns:
+        The window, its filter entries keyed by name, the filter button,
+        the table, its scrollbar and the count label.
+    """
+    window = ttk.Toplevel(app, title="Active Jobs")
+    window.geometry("900x560")
+
+    filter_entries = {}
+    frame = create_frame(window, fill=X)
+    for name, label_text in filters.items():
+        create_label(frame=frame, text=label_text, font=font)
+        filter_entries[name] = create_single_line_entry(
+            frame=frame, font=font, name=name, width=12, side=LEFT
+        )
+    filter_button = ttk.Button(frame, text="Filter")
+    filter_button.pack(side=LEFT, padx=5, pady=3)
+
+    table_frame = create_frame(window, fill=BOTH)
+    table_frame.pack_configure(expand=True)
+    scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+    scrollbar.pack(side=RIGHT, fill=Y)
+    table = ttk.Treeview(table_frame, columns=list(columns), show="headings")
+    for column, heading in columns.items():
+        table.heading(column, text=heading)
+        table.column(column, width=120, stretch=True)
+    table.pack(side=LEFT, fill=BOTH, expand=True)
+
+    count_label = ttk.Label(window, text="")
+    count_label.pack(pady=5)
+    count_label.config(font=font)
+
+    table.focus_set()
+    return window, filter_entries, filter_button, table, scrollbar, count_label
+
+
+def create_workload_window(
+    app: ttk.Window,
+    tables: dict,
+    font: tuple = ("Arial", 12),
+) -> tuple[ttk.Toplevel, dict, ttk.Button, ttk.Label]:
+    """
+    Create a window with a table of counts for each part of the workload
+    side by side, and a label and recount button below them.
+
+    Args:
+        app (ttk.Window):
+            The main application window.
+        tables (dict):
+            A dictionary with keys as the names of the tables, and values
+            as the headings of what each one counts.
+        font (tuple, optional): The font for the label.
+            Defaults to ("Arial", 12).
+
+    Returns:
+        The window, its tables keyed by name, the recount button and the
+        label.
+    """
+    window = ttk.Toplevel(app, title="Workload")
+    window.geometry("760x480")
+
+    table_frame = create_frame(window, fill=BOTH)
+    table_frame.pack_configure(expand=True)
+    workload_tables = {}
+    for name, heading in tables.items():
+        table = ttk.Treeview(
+            table_frame, columns=("label", "count"), show="headings"
+        )
+        table.heading("label", text=heading)
+        table.heading("count", text="Jobs")
+        table.column("label", width=140, stretch=True)
+        table.column("count", width=80, stretch=False, anchor="e")
+        table.pack(side=LEFT, fill=BOTH, expand=True, padx=5)
+        workload_tables[name] = table
+
+    frame = create_frame(window, fill=X)
+    label = ttk.Label(frame, text="")
+    label.pack(side=LEFT, padx=5)
+    label.config(font=font)
+    recount_button = ttk.Button(frame, text="Recount")
+    recount_button.pack(side=RIGHT, padx=5, pady=3)
+
+    return window, workload_tables, recount_button, label
@@ -0,0 +1,299 @@
+"""This module times database calls, parcel lookups and controller
+actions. Each timing is written to a structured (JSON lines) log and
+added to a histogram, which can be dumped as JSON or in the Prometheus
+text format."""
+
+import functools
+import json
+import logging
+import logging.handlers
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from config import (
+    METRICS_LOG_BACKUP_COUNT,
+    METRICS_LOG_MAX_BYTES,
+    METRICS_SAMPLE_SIZE,
+)
+
+logger = logging.getLogger("job_record_manager.timings")
+
+# Upper bounds, in seconds, of the histogram buckets.
+BUCKET_BOUNDS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    math.inf,
+)
+PERCENTILES = (50, 90, 95, 99)
+METRIC_NAME = "job_record_manager_operation"
+
+
+class OperationStats:
+    """The timings recorded for one operation."""
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bucket_counts = [0] * len(BUCKET_BOUNDS)
+        # The most recent timings, used for exact percentiles.
+        self.samples = deque(maxlen=sample_size)
+
+    def add(self, seconds: float, rows: int = None, error: bool = False):
+        """Adds one timing."""
+        self.count += 1
+        self.errors += error
+        self.rows += rows or 0
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for index, bound in enumerate(BUCKET_BOUNDS):
+            if seconds <= bound:
+                self.bucket_counts[index] += 1
+                break
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Returns a percentile of the recent timings, in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = math.ceil(percent / 100 * len(ordered))
+        return ordered[max(rank, 1) - 1]
+
+
+class Metrics:
+    """This class collects the timings of every operation."""
+
+    def __init__(self, sample_size: int = METRICS_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.operations = {}
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        operation: str,
+        seconds: float,
+        rows: int = None,
+        error: bool = False,
+    ) -> None:
+        """Adds a timing to an operation's histogram and logs it."""
+        with self.lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = OperationStats(
+                    self.sample_size
+                )
+            stats.add(seconds, rows, error)
+
+        if logger.isEnabledFor(logging.INFO):
+            event = {
+                "operation": operation,
+                "ms": round(seconds * 1000, 3),
+                "ok": not error,
+            }
+            if rows is not None:
+                event["rows"] = rows
+            logger.info(json.dumps(event))
+
+    @contextmanager
+    def timed(self, operation: str) -> Iterator[dict]:
+        """
+        Times a with block. The block may set "rows" in the yielded
+        dictionary to record how many rows it handled.
+
+        Example:
+            with metrics.timed("db.execute_query") as timing:
+                rows = cursor.fetchall()
+                timing["rows"] = len(rows)
+        """
+        timing = {"rows": None}
+        started_at = time.perf_counter()
+        try:
+            yield timing
+        except GeneratorExit:
+            # A generator closed before it was exhausted, not an error.
+            seconds = time.perf_counter() - started_at
+            self.record(operation, seconds, timing["rows"])
+            raise
+        except BaseException:
+            self.record(
+                operation,
+                time.perf_counter() - started_at,
+                timing["rows"],
+                error=True,
+            )
+            raise
+        seconds = time.perf_counter() - started_at
+        self.record(operation, seconds, timing["rows"])
+
+    def reset(self) -> None:
+        """Removes every recorded timing."""
+        with self.lock:
+            self.operations.clear()
+
+    def to_dict(self) -> dict:
+        """Returns a summary of every operation, with times in
+        milliseconds."""
+        with self.lock:
+            summary = {}
+            for operation, stats in sorted(self.operations.items()):
+                summary[operation] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "rows": stats.rows,
+                    "total_ms": round(stats.total_seconds * 1000, 3),
+                    "max_ms": round(stats.max_seconds * 1000, 3),
+                    **{
+                        f"p{percent}_ms": round(
+                            stats.percentile(percent) * 1000, 3
+                        )
+                        for percent in PERCENTILES
+                    },
+                    "buckets": {
+                        format_bound(bound): count
+                        for bound, count in zip(
+                            BUCKET_BOUNDS, stats.bucket_counts
+                        )
+                    },
+                }
+            return summary
+
+    def to_prometheus(self) -> str:
+        """Returns every operation's histogram in the Prometheus text
+        exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME}_seconds Time taken by each operation.",
+            f"# TYPE {METRIC_NAME}_seconds histogram",
+        ]
+        with self.lock:
+            operations = sorted(self.operations.items())
+            for operation, stats in operations:
+                label = f'operation="{operation}"'
+                cumulative_count = 0
+                for bound, count in zip(BUCKET_BOUNDS, stats.bucket_counts):
+                    cumulative_count += count
+                    lines.append(
+                        f"{METRIC_NAME}_seconds_bucket"
+                        f'{{{label},le="{format_bound(bound)}"}}'
+                        f" {cumulative_count}"
+                    )
+                lines.append(
+                    f"{METRIC_NAME}_seconds_sum{{{label}}}"
+                    f" {stats.total_seconds}"
+                )
+                lines.append(
+                    f"{METRIC_NAME}_seconds_count{{{label}}} {stats.count}"
+                )
+
+            for name, attribute, description in (
+                ("rows", "rows", "Rows returned or changed."),
+                ("errors", "errors", "Operations that raised an error."),
+            ):
+                lines.append(
+                    f"# HELP {METRIC_NAME}_{name}_total {description}"
+                )
+                lines.append(f"# TYPE {METRIC_NAME}_{name}_total counter")
+                for operation, stats in operations:
+                    label = f'operation="{operation}"'
+                    lines.append(
+                        f"{METRIC_NAME}_{name}_total{{{label}}}"
+                        f" {getattr(stats, attribute)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    def dump(self, file_path: str) -> None:
+        """Writes the metrics to a file, as Prometheus text if the file
+        ends in .prom or .txt and as JSON otherwise."""
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if file_path.lower().endswith((".prom", ".txt")):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), indent=2)
+        with open(file_path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(content)
+
+
+def format_bound(bound: float) -> str:
+    """Returns a bucket bound as Prometheus writes it, e.g. "0.5" or
+    "+Inf"."""
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+# The metrics shared by the whole application.
+metrics = Metrics()
+
+
+def instrumented(operation: str, count_rows: bool = False) -> Callable:
+    """
+    Returns a decorator that times every call of a function.
+
+    Args:
+        operation (str): The name the timings are recorded under.
+        count_rows (bool, optional): Record the length of the function's
+            return value as its row count.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with metrics.timed(operation) as timing:
+                result = function(*args, **kwargs)
+                if count_rows and result is not None:
+                    timing["rows"] = len(result)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def configure_logging(
+    log_path: str,
+    max_bytes: int = METRICS_LOG_MAX_BYTES,
+    backup_count: int = METRICS_LOG_BACKUP_COUNT,
+) -> logging.Handler:
+    """
+    Writes the timing log, one JSON object per line, to a file. The file
+    is rotated once it reaches max_bytes, so it never grows without
+    bound. Returns the handler added to the timing logger.
+
+    Args:
+        log_path (str): The log file.
+        max_bytes (int, optional): The size at which the file is rotated.
+        backup_count (int, optional): Rotated files kept, e.g.
+            timings.log.1.
+    """
+    directory = os.path.dirname(log_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        log_path,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
+    )
+    handler.setFormatter(
+        logging.Formatter('{"time": "%(asctime)s", "timing": %(message)s}')
+    )
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return handler
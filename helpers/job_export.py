@@ -0,0 +1,188 @@
+"""This module contains the JobExporter class, which streams the Existing
+Jobs and Active Jobs tables to CSV or Parquet files."""
+
+import argparse
+import csv
+import datetime
+import decimal
+import os
+
+from config import DATABASE_PATH, EXPORT_BATCH_SIZE
+
+from .sql_statements import ACTIVE_JOBS, EXISTING_JOBS, select_statement
+
+EXPORT_TABLES = {
+    "existing": EXISTING_JOBS,
+    "active": ACTIVE_JOBS,
+}
+
+
+class JobExporter:
+    """This class writes a table to a file a batch of rows at a time, so
+    memory use stays the same however large the table is."""
+
+    def __init__(self, database, batch_size: int = EXPORT_BATCH_SIZE):
+        self.database = database
+        self.batch_size = batch_size
+
+    @staticmethod
+    def create_export_query(
+        table: str,
+        job_number_prefix: str = None,
+        start_date: datetime.date = None,
+        end_date: datetime.date = None,
+    ) -> tuple[str, tuple]:
+        """Returns the query and parameters that select a table's rows,
+        optionally filtered by job number prefix and job date range."""
+        conditions = []
+        parameters = []
+        if job_number_prefix:
+            conditions.append(("job_number", "LIKE"))
+            parameters.append(f"{job_number_prefix}%")
+        if start_date:
+            conditions.append(("job_date", ">="))
+            parameters.append(start_date)
+        if end_date:
+            conditions.append(("job_date", "<="))
+            parameters.append(end_date)
+
+        query = select_statement(EXPORT_TABLES[table], where=tuple(conditions))
+        return query, tuple(parameters)
+
+    def export(
+        self,
+        table: str,
+        file_path: str,
+        job_number_prefix: str = None,
+        start_date: datetime.date = None,
+        end_date: datetime.date = None,
+    ) -> int:
+        """
+        Exports a table to a CSV or Parquet file, chosen by the file
+        extension.
+
+        Args:
+            table (str): "existing" or "active".
+            file_path (str): The file to write, ending in .csv or
+                .parquet.
+            job_number_prefix (str, optional): Only export job numbers
+                starting with this prefix, e.g. "23" or "2301".
+            start_date (datetime.date, optional): Only export jobs dated
+                on or after this date.
+            end_date (datetime.date, optional): Only export jobs dated
+                on or before this date.
+
+        Returns:
+            int: The number of rows written.
+        """
+        query, parameters = self.create_export_query(
+            table, job_number_prefix, start_date, end_date
+        )
+        description, batches = self.database.stream_query(
+            query, parameters, self.batch_size
+        )
+
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".parquet":
+            return write_parquet(file_path, description, batches)
+        return write_csv(file_path, description, batches)
+
+
+def write_csv(file_path: str, description, batches) -> int:
+    """Writes row batches to a CSV file and returns the number of rows."""
+    row_count = 0
+    with open(file_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow([column[0] for column in description])
+        for rows in batches:
+            writer.writerows(rows)
+            row_count += len(rows)
+    return row_count
+
+
+def write_parquet(file_path: str, description, batches) -> int:
+    """Writes row batches to a Parquet file and returns the number of
+    rows."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError(
+            "Exporting Parquet files requires pyarrow: pip install pyarrow"
+        ) from error
+
+    # The schema comes from the cursor description rather than the data,
+    # so every batch is written with the same column types.
+    arrow_types = {
+        str: pa.string(),
+        int: pa.int64(),
+        float: pa.float64(),
+        decimal.Decimal: pa.float64(),
+        bool: pa.bool_(),
+        datetime.datetime: pa.timestamp("us"),
+        datetime.date: pa.date32(),
+        bytes: pa.binary(),
+        bytearray: pa.binary(),
+    }
+    schema = pa.schema(
+        [
+            (column[0], arrow_types.get(column[1], pa.string()))
+            for column in description
+        ]
+    )
+
+    def convert(value, arrow_type):
+        if value is None:
+            return None
+        if isinstance(value, decimal.Decimal):
+            return float(value)
+        if arrow_type == pa.string() and not isinstance(value, str):
+            return str(value)
+        return value
+
+    row_count = 0
+    with pq.ParquetWriter(file_path, schema) as writer:
+        for rows in batches:
+            columns = [
+                pa.array(
+                    [convert(row[index], field.type) for row in rows],
+                    type=field.type,
+                )
+                for index, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            row_count += len(rows)
+    return row_count
+
+
+def main() -> None:
+    """Exports a table to the file given on the command line."""
+    # Imported here so the exporter can be used without the Access driver.
+    from .database_connector import DatabaseConnection
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("file_path", help="CSV or Parquet file to write")
+    parser.add_argument("--prefix", help="Job number prefix, e.g. 2301")
+    parser.add_argument(
+        "--start-date", type=datetime.date.fromisoformat, help="YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--end-date", type=datetime.date.fromisoformat, help="YYYY-MM-DD"
+    )
+    args = parser.parse_args()
+
+    database = DatabaseConnection(DATABASE_PATH)
+    row_count = JobExporter(database).export(
+        args.table,
+        args.file_path,
+        job_number_prefix=args.prefix,
+        start_date=args.start_date,
+        end_date=args.end_date,
+    )
+    database.close()
+    print(f"Exported {row_count} rows to {args.file_path}.")
+
+
+if __name__ == "__main__":
+    main()
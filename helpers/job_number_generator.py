@@ -33,18 +33,11 @@ class JobNumberGenerator:
         num_previous_months = 0
         while num_previous_months < 12:
             prefix = self.get_job_number_prefix(num_previous_months)
-            job_numbers = [
-                number
-                for number in self.job_storage.get_current_year_job_numbers()
-                if number.startswith(prefix)
-            ]
-            if len(job_numbers) == 0:
+            highest_sequence = self.job_storage.highest_sequence(prefix)
+            if highest_sequence is None:
                 num_previous_months += 1
             else:
-                highest_existing_fn = max(job_numbers)
-                last_four_digits = str(
-                    int(highest_existing_fn[4:8]) + 1
-                ).zfill(4)
+                last_four_digits = str(highest_sequence + 1).zfill(4)
                 new_fn = self.get_job_number_prefix() + last_four_digits
                 break
         else:
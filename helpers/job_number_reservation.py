@@ -0,0 +1,186 @@
+"""This module contains the JobNumberReservations class, which reserves
+job numbers in a table shared by every workstation, so two people never
+receive the same new job number."""
+
+import datetime
+import socket
+import threading
+
+from config import (
+    RESERVATION_BLOCK_SIZE,
+    RESERVATION_MAX_ATTEMPTS,
+    RESERVATION_TTL_HOURS,
+)
+
+from .job_number_storage import JobNumbers
+
+HIGHEST_SEQUENCE = 9999
+
+
+class JobNumberReservationError(Exception):
+    """Raised when no block of job numbers could be reserved."""
+
+
+class JobNumberReservations:
+    """This class hands out job numbers from blocks reserved in the
+    database. Blocks are aligned to the block size, so two workstations
+    reaching for the same numbers try to insert the same reservation row
+    and only one succeeds. Reserving a block is an INSERT plus a query
+    for the numbers of the block that are already used, and numbers are
+    then handed out locally until the block runs out or its reservation
+    expires."""
+
+    def __init__(
+        self,
+        database,
+        job_storage: JobNumbers,
+        workstation: str = None,
+        block_size: int = RESERVATION_BLOCK_SIZE,
+        time_to_live: datetime.timedelta = datetime.timedelta(
+            hours=RESERVATION_TTL_HOURS
+        ),
+        max_attempts: int = RESERVATION_MAX_ATTEMPTS,
+    ):
+        """
+        Initializes the JobNumberReservations object.
+
+        Args:
+            database (DatabaseConnection): The database holding the
+                reservation table.
+            job_storage (JobNumbers): Known job numbers, which are never
+                handed out.
+            workstation (str, optional): Recorded with each reservation.
+                Defaults to the computer's name.
+            block_size (int, optional): Job numbers reserved at once.
+            time_to_live (datetime.timedelta, optional): How long a
+                reservation lasts before other workstations may take its
+                unused numbers.
+            max_attempts (int, optional): Blocks tried before giving up.
+        """
+        self.database = database
+        self.job_storage = job_storage
+        self.workstation = workstation or socket.gethostname()
+        self.block_size = block_size
+        self.time_to_live = time_to_live
+        self.max_attempts = max_attempts
+
+        self.block_start = None
+        self.expires_at = None
+        self.reserved_job_numbers = []
+        self.current_job_number = None
+        self.table_checked = False
+        self.lock = threading.Lock()
+
+    def is_taken(self, job_number: str) -> bool:
+        """Returns True if a job number is already known to be used."""
+        return (
+            job_number in self.job_storage.get_existing_job_numbers()
+            or job_number in self.job_storage.get_active_job_numbers()
+            or job_number in self.job_storage.get_current_year_job_numbers()
+        )
+
+    def reserve_job_number(self, prefix: str, start_sequence: int) -> str:
+        """
+        Returns a reserved job number for a YYMM prefix. The same number
+        is returned again until it is used or its reservation expires.
+
+        Args:
+            prefix (str): The YYMM prefix of the job number.
+            start_sequence (int): The lowest sequence number to hand out,
+                e.g. one past the highest known job number.
+        """
+        with self.lock:
+            now = datetime.datetime.now()
+            if self.block_start is not None and (
+                not self.block_start.startswith(prefix)
+                or now >= self.expires_at
+            ):
+                self.block_start = None
+                self.reserved_job_numbers = []
+                self.current_job_number = None
+
+            if self.current_job_number and not self.is_taken(
+                self.current_job_number
+            ):
+                return self.current_job_number
+
+            while True:
+                while self.reserved_job_numbers:
+                    job_number = self.reserved_job_numbers.pop(0)
+                    if not self.is_taken(job_number):
+                        self.current_job_number = job_number
+                        return job_number
+
+                if self.block_start is not None:
+                    start_sequence = max(
+                        start_sequence,
+                        int(self.block_start[4:]) + self.block_size,
+                    )
+                self.reserve_block(prefix, start_sequence, now)
+
+    def reserve_block(
+        self, prefix: str, start_sequence: int, now: datetime.datetime
+    ) -> None:
+        """Reserves the first free block that contains or follows
+        start_sequence, and deletes expired reservations so the table does
+        not grow forever. Must be called with the lock held."""
+        if not self.table_checked:
+            self.database.create_reservation_table()
+            self.table_checked = True
+
+        expires_at = now + self.time_to_live
+        block_index = start_sequence // self.block_size
+        for _ in range(self.max_attempts):
+            first_sequence = block_index * self.block_size
+            if first_sequence > HIGHEST_SEQUENCE:
+                break
+            block_index += 1
+            block_start = f"{prefix}{first_sequence:04d}"
+
+            reserved = self.database.insert_reservation(
+                block_start, self.workstation, now, expires_at
+            )
+            if not reserved and self.database.delete_expired_reservation(
+                block_start, now
+            ):
+                reserved = self.database.insert_reservation(
+                    block_start, self.workstation, now, expires_at
+                )
+            if not reserved:
+                continue
+
+            end_sequence = min(
+                first_sequence + self.block_size, HIGHEST_SEQUENCE + 1
+            )
+            job_numbers = [
+                f"{prefix}{sequence:04d}"
+                for sequence in range(
+                    max(first_sequence, start_sequence), end_sequence
+                )
+            ]
+            # An earlier holder of the block, whose expired reservation
+            # may since have been deleted, could have used some of its
+            # numbers after this workstation last synced.
+            if end_sequence > HIGHEST_SEQUENCE:
+                # "~" sorts after every digit.
+                block_end = f"{prefix}~"
+            else:
+                block_end = f"{prefix}{end_sequence:04d}"
+            taken = set(
+                self.database.get_job_numbers_between(block_start, block_end)
+            )
+            job_numbers = [
+                job_number
+                for job_number in job_numbers
+                if job_number not in taken
+            ]
+
+            self.block_start = block_start
+            self.expires_at = expires_at
+            self.reserved_job_numbers = job_numbers
+            self.database.delete_expired_reservations(now)
+            return
+
+        raise JobNumberReservationError(
+            f"No free block of job numbers found for {prefix}"
+        )
@@ -1,25 +1,76 @@
 """This module contains the JobNumbers class, which is used to store job
 numbers."""
 
+import bisect
+import datetime
+import json
+import os
+import sys
+from collections import defaultdict
+
+
+def chronological_key(job_number: str) -> int:
+    """Returns a sortable key for a job number that places numbers from
+    the 1900s (e.g. "93121259") before numbers from the 2000s."""
+    current_year = datetime.datetime.now().year % 100
+    year = int(job_number[:2])
+    century = 1900 if year > current_year else 2000
+    return (century + year) * 1_000_000 + int(job_number[2:8])
+
+
+def highest_job_number(job_numbers) -> str:
+    """Returns the chronologically highest job number, ignoring any
+    values that are not in the standard YYMMNNNN format."""
+    valid_job_numbers = [
+        job_number
+        for job_number in job_numbers
+        if len(job_number) == 8 and job_number.isdigit()
+    ]
+    if not valid_job_numbers:
+        return ""
+    return max(valid_job_numbers, key=chronological_key)
+
+
+def split_job_number(job_number: str) -> tuple[str, int] | None:
+    """Splits a job number into its YYMM prefix and sequence number.
+    Returns None if the job number is not in the YYMMNNNN format."""
+    if len(job_number) != 8 or not job_number.isdigit():
+        return None
+    return job_number[:4], int(job_number[4:])
+
 
 class JobNumbers:
     """This class is used to store job numbers."""
 
     def __init__(self):
-        self.current_year_job_numbers = set()
-        self.existing_job_numbers = set()
-        self.active_job_numbers = set()
+        self.current_year_job_numbers = self.create_job_number_set()
+        self.existing_job_numbers = self.create_job_number_set()
+        self.active_job_numbers = self.create_job_number_set()
         self.unused_job_number = ""
+        self.last_full_sync = None
+        # Sorted sequence numbers of every stored job number, keyed by
+        # their YYMM prefix.
+        self.prefix_index = {}
+
+    def create_job_number_set(self) -> set:
+        """Returns an empty container for one category of job numbers."""
+        return set()
 
     def add_job_number(self, job_number: str) -> None:
         """Adds a job number to the set of existing job numbers and the
         set of active job numbers."""
         self.existing_job_numbers.add(job_number)
         self.active_job_numbers.add(job_number)
+        self._index_job_numbers([job_number])
 
     def remove_job_number(self, job_number: str) -> None:
         """Removes a job number from the set of active job numbers."""
         self.existing_job_numbers.remove(job_number)
+        if (
+            job_number not in self.active_job_numbers
+            and job_number not in self.current_year_job_numbers
+        ):
+            self._unindex_job_number(job_number)
 
     def add_existing_job_numbers(self, job_numbers: tuple) -> None:
         """Adds existing job numbers to the set of existing job numbers."""
@@ -27,6 +78,7 @@ class JobNumbers:
         # the first element.
         job_numbers = [job_number[0] for job_number in job_numbers]
         self.existing_job_numbers.update(job_numbers)
+        self._index_job_numbers(job_numbers)
 
     def add_active_job_numbers(self, job_numbers: tuple) -> None:
         """Adds active job numbers to the set of active job numbers."""
@@ -34,6 +86,7 @@ class JobNumbers:
         # the first element.
         job_numbers = [job_number[0] for job_number in job_numbers]
         self.active_job_numbers.update(job_numbers)
+        self._index_job_numbers(job_numbers)
 
     def add_current_year_job_numbers(self, job_numbers: tuple) -> None:
         """Adds current year job numbers to the set of current year job
@@ -42,11 +95,14 @@ class JobNumbers:
         # the first element.
         job_numbers = [job_number[0] for job_number in job_numbers]
         self.current_year_job_numbers.update(job_numbers)
+        self._index_job_numbers(job_numbers)
 
     def clear_job_numbers(self) -> None:
         """Clears all existing and active job numbers."""
         self.existing_job_numbers.clear()
         self.active_job_numbers.clear()
+        self.prefix_index.clear()
+        self._index_job_numbers(self.current_year_job_numbers)
 
     def get_existing_job_numbers(self) -> list[str]:
         """Returns a list of existing job numbers."""
@@ -63,3 +119,152 @@ class JobNumbers:
     def add_unused_job_number(self, job_number: str) -> None:
         """Sets the unused job number."""
         self.unused_job_number = job_number
+
+    def highest_sequence(self, prefix: str) -> int | None:
+        """Returns the highest sequence number stored for a YYMM prefix,
+        or None if there are no job numbers with that prefix."""
+        sequences = self.prefix_index.get(prefix)
+        if not sequences:
+            return None
+        return sequences[-1]
+
+    def next_free_sequence(self, prefix: str, start: int = 0) -> int | None:
+        """Returns the lowest unused sequence number for a YYMM prefix
+        that is greater than or equal to start, or None if every
+        sequence number from start to 9999 is taken."""
+        sequences = self.prefix_index.get(prefix, [])
+        first = bisect.bisect_left(sequences, start)
+
+        # Sequences are unique and sorted, so the run of taken numbers
+        # starting at start ends at the first position where the stored
+        # value stops matching its offset, which can be binary searched.
+        low, high = first, len(sequences)
+        while low < high:
+            middle = (low + high) // 2
+            if sequences[middle] == start + (middle - first):
+                low = middle + 1
+            else:
+                high = middle
+        candidate = start + (low - first)
+        if candidate > 9999:
+            return None
+        return candidate
+
+    def memory_usage(self) -> int:
+        """Returns the approximate number of bytes used to store the job
+        numbers, including the prefix index."""
+        total = 0
+        for job_numbers in (
+            self.current_year_job_numbers,
+            self.existing_job_numbers,
+            self.active_job_numbers,
+        ):
+            total += sys.getsizeof(job_numbers)
+            total += sum(sys.getsizeof(number) for number in job_numbers)
+
+        total += sys.getsizeof(self.prefix_index)
+        for sequences in self.prefix_index.values():
+            total += sys.getsizeof(sequences)
+            total += sum(sys.getsizeof(sequence) for sequence in sequences)
+        return total
+
+    def _index_job_numbers(self, job_numbers) -> None:
+        """Adds job numbers to the prefix index."""
+        new_sequences = defaultdict(list)
+        for job_number in job_numbers:
+            parts = split_job_number(job_number)
+            if parts:
+                new_sequences[parts[0]].append(parts[1])
+
+        for prefix, sequences in new_sequences.items():
+            indexed_sequences = self.prefix_index.setdefault(prefix, [])
+            if len(sequences) > 8:
+                # Re-sorting once is cheaper than many single inserts.
+                indexed_sequences[:] = sorted(
+                    set(indexed_sequences).union(sequences)
+                )
+                continue
+            for sequence in sequences:
+                position = bisect.bisect_left(indexed_sequences, sequence)
+                if (
+                    position == len(indexed_sequences)
+                    or indexed_sequences[position] != sequence
+                ):
+                    indexed_sequences.insert(position, sequence)
+
+    def _unindex_job_number(self, job_number: str) -> None:
+        """Removes a job number from the prefix index."""
+        parts = split_job_number(job_number)
+        if not parts:
+            return
+        prefix, sequence = parts
+        indexed_sequences = self.prefix_index.get(prefix, [])
+        position = bisect.bisect_left(indexed_sequences, sequence)
+        if (
+            position < len(indexed_sequences)
+            and indexed_sequences[position] == sequence
+        ):
+            del indexed_sequences[position]
+        if not indexed_sequences:
+            self.prefix_index.pop(prefix, None)
+
+    @property
+    def existing_watermark(self) -> str:
+        """Returns the highest existing job number seen so far."""
+        return highest_job_number(self.existing_job_numbers)
+
+    @property
+    def active_watermark(self) -> str:
+        """Returns the highest active job number seen so far."""
+        return highest_job_number(self.active_job_numbers)
+
+    def save_snapshot(self, snapshot_path: str) -> None:
+        """Writes the existing and active job numbers to a JSON snapshot
+        file so they can be reloaded on the next start up."""
+        snapshot = {
+            "existing_job_numbers": sorted(self.existing_job_numbers),
+            "active_job_numbers": sorted(self.active_job_numbers),
+            "last_full_sync": (
+                self.last_full_sync.isoformat()
+                if self.last_full_sync
+                else None
+            ),
+        }
+
+        snapshot_directory = os.path.dirname(snapshot_path)
+        if snapshot_directory:
+            os.makedirs(snapshot_directory, exist_ok=True)
+
+        # Write to a temporary file first so a crash never leaves a
+        # half-written snapshot behind.
+        temporary_path = f"{snapshot_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+        os.replace(temporary_path, snapshot_path)
+
+    def load_snapshot(self, snapshot_path: str) -> bool:
+        """Loads the existing and active job numbers from a JSON snapshot
+        file. Returns False if the snapshot is missing or unreadable."""
+        try:
+            with open(snapshot_path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            existing_job_numbers = snapshot["existing_job_numbers"]
+            active_job_numbers = snapshot["active_job_numbers"]
+            last_full_sync = snapshot["last_full_sync"]
+            if last_full_sync:
+                last_full_sync = datetime.datetime.fromisoformat(
+                    last_full_sync
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        self.existing_job_numbers.clear()
+        self.existing_job_numbers.update(existing_job_numbers)
+        self.active_job_numbers.clear()
+        self.active_job_numbers.update(active_job_numbers)
+        self.last_full_sync = last_full_sync
+        self.prefix_index.clear()
+        self._index_job_numbers(self.current_year_job_numbers)
+        self._index_job_numbers(self.existing_job_numbers)
+        self._index_job_numbers(self.active_job_numbers)
+        return True
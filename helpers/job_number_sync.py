@@ -0,0 +1,108 @@
+"""This module contains the JobNumberSynchronizer class, which keeps the
+in-memory job numbers in step with the database without reloading both
+tables on every start up."""
+
+import datetime
+
+from config import FULL_SYNC_INTERVAL_HOURS, JOB_NUMBER_SNAPSHOT_PATH
+
+from .job_number_storage import JobNumbers
+from .sql_statements import ACTIVE_JOBS, EXISTING_JOBS, select_statement
+
+
+class JobNumberSynchronizer:
+    """This class is used to load job numbers from a local snapshot and
+    fetch only the rows added to the database since it was taken."""
+
+    def __init__(
+        self,
+        database,
+        job_storage: JobNumbers,
+        snapshot_path: str = JOB_NUMBER_SNAPSHOT_PATH,
+        full_sync_interval: datetime.timedelta = datetime.timedelta(
+            hours=FULL_SYNC_INTERVAL_HOURS
+        ),
+    ):
+        self.database = database
+        self.job_storage = job_storage
+        self.snapshot_path = snapshot_path
+        self.full_sync_interval = full_sync_interval
+
+    @property
+    def full_sync_due(self) -> bool:
+        """Returns True if the snapshot is too old to be trusted, in which
+        case both tables are reloaded to catch deleted job numbers."""
+        last_full_sync = self.job_storage.last_full_sync
+        if last_full_sync is None:
+            return True
+        now = datetime.datetime.now()
+        return now - last_full_sync >= self.full_sync_interval
+
+    def sync(self) -> None:
+        """Brings the job storage up to date with the database and saves
+        a new snapshot."""
+        snapshot_loaded = self.job_storage.load_snapshot(self.snapshot_path)
+        if snapshot_loaded and not self.full_sync_due:
+            self.incremental_sync()
+        else:
+            self.full_sync()
+
+        try:
+            self.job_storage.save_snapshot(self.snapshot_path)
+        except OSError as error:
+            # A missing snapshot only costs a full sync on the next start.
+            print(error)
+
+    def full_sync(self) -> None:
+        """Reloads every job number from both tables."""
+        active_jobs = self.database.execute_query(
+            select_statement(ACTIVE_JOBS, ("job_number",))
+        )
+        existing_jobs = self.database.execute_query(
+            select_statement(EXISTING_JOBS, ("job_number",))
+        )
+
+        self.job_storage.clear_job_numbers()
+        self.job_storage.add_active_job_numbers(active_jobs)
+        self.job_storage.add_existing_job_numbers(existing_jobs)
+        self.job_storage.last_full_sync = datetime.datetime.now()
+
+    def incremental_sync(self) -> None:
+        """Fetches only the job numbers past each table's watermark."""
+        active_jobs = self.fetch_job_numbers_after(
+            ACTIVE_JOBS, self.job_storage.active_watermark
+        )
+        existing_jobs = self.fetch_job_numbers_after(
+            EXISTING_JOBS, self.job_storage.existing_watermark
+        )
+
+        self.job_storage.add_active_job_numbers(active_jobs)
+        self.job_storage.add_existing_job_numbers(existing_jobs)
+
+    def fetch_job_numbers_after(self, table: str, watermark: str) -> list:
+        """Returns the job numbers in a table that are newer than the
+        watermark."""
+        columns = ("job_number",)
+        if not watermark:
+            return self.database.execute_query(
+                select_statement(table, columns)
+            )
+
+        # New job numbers always start with the current year, so an upper
+        # bound keeps job numbers from the 1900s (e.g. "93121259"), which
+        # sort above the watermark as text, out of the results.
+        next_year = datetime.datetime.now().year % 100 + 1
+        upper_bound = f"{next_year:02d}"
+        if next_year < 100 and upper_bound > watermark:
+            return self.database.execute_query(
+                select_statement(
+                    table,
+                    columns,
+                    (("job_number", ">"), ("job_number", "<")),
+                ),
+                (watermark, upper_bound),
+            )
+        return self.database.execute_query(
+            select_statement(table, columns, (("job_number", ">"),)),
+            (watermark,),
+        )
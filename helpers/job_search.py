@@ -0,0 +1,277 @@
+"""This module contains the JobSearchIndex class, an in-memory inverted
+index used to find existing jobs by address, subdivision, parcel ID or
+contact details without scanning the database."""
+
+import bisect
+import heapq
+import re
+import threading
+from typing import Iterable
+
+from config import (
+    SEARCH_COLUMNS,
+    SEARCH_MAX_RESULTS,
+    SEARCH_MIN_PREFIX_LENGTH,
+)
+
+from .job_number_storage import chronological_key, split_job_number
+from .records import record_type
+from .sql_statements import EXISTING_JOBS, select_statement
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Columns whose punctuation is also dropped to make a single token, so
+# "12-34-56" can be found by typing "123456".
+IDENTIFIER_COLUMNS = ("job_number", "parcel_id")
+
+SearchResult = record_type(EXISTING_JOBS, tuple(SEARCH_COLUMNS))
+
+
+def tokenize(text) -> list[str]:
+    """Splits a value into lowercase words and numbers."""
+    if text is None:
+        return []
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def newest_first_key(job_number: str) -> int:
+    """Returns a sort key that places newer job numbers first."""
+    if split_job_number(job_number) is None:
+        return 0
+    return -chronological_key(job_number)
+
+
+class JobSearchIndex:
+    """This class maps every token of the searched columns to the jobs
+    containing it. Tokens are also kept in a sorted list, so each word of
+    a query can be matched as a prefix with a binary search."""
+
+    def __init__(
+        self,
+        max_results: int = SEARCH_MAX_RESULTS,
+        min_prefix_length: int = SEARCH_MIN_PREFIX_LENGTH,
+    ):
+        self.max_results = max_results
+        self.min_prefix_length = min_prefix_length
+        # Jobs are stored once and referred to by a small integer id. The
+        # slots of removed jobs are None until the list is compacted.
+        self.documents = []
+        self.removed_documents = 0
+        self.document_ids = {}
+        self.sort_keys = []
+        self.postings = {}
+        self.sorted_tokens = []
+        self.ready = threading.Event()
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.document_ids)
+
+    def document_tokens(self, record: tuple) -> set[str]:
+        """Returns the tokens of a job's searched columns."""
+        tokens = set()
+        for column, value in zip(record._fields, record):
+            column_tokens = tokenize(value)
+            tokens.update(column_tokens)
+            if column in IDENTIFIER_COLUMNS and len(column_tokens) > 1:
+                tokens.add("".join(column_tokens))
+        return tokens
+
+    def add_job(self, job: dict | tuple) -> None:
+        """Adds a job to the index, replacing any earlier version of it.
+
+        Args:
+            job (dict | tuple): A row of the search columns, or a
+                dictionary of column values such as the parcel data of a
+                submitted job.
+        """
+        record = self._to_record(job)
+        tokens = self.document_tokens(record)
+        with self.lock:
+            for token in self._add_record(record, tokens):
+                bisect.insort(self.sorted_tokens, token)
+
+    def add_jobs(self, jobs: Iterable[dict | tuple]) -> None:
+        """Adds many jobs, merging their new tokens into the token list
+        once at the end. The jobs are tokenized before the lock is taken,
+        so searches only wait while the postings are updated."""
+        records = [self._to_record(job) for job in jobs]
+        record_tokens = [self.document_tokens(record) for record in records]
+        with self.lock:
+            new_tokens = set()
+            for record, tokens in zip(records, record_tokens):
+                new_tokens.update(self._add_record(record, tokens))
+            # A job replaced later in the batch may have taken a new
+            # token away again.
+            new_tokens = sorted(
+                token for token in new_tokens if token in self.postings
+            )
+            self.sorted_tokens = list(
+                heapq.merge(self.sorted_tokens, new_tokens)
+            )
+
+    def remove_job(self, job_number: str) -> None:
+        """Removes a job from the index if it is there."""
+        with self.lock:
+            document_id = self.document_ids.pop(job_number, None)
+            if document_id is None:
+                return
+            record = self.documents[document_id]
+            self.documents[document_id] = None
+            for token in self.document_tokens(record):
+                document_ids = self.postings[token]
+                document_ids.discard(document_id)
+                if not document_ids:
+                    del self.postings[token]
+                    index = bisect.bisect_left(self.sorted_tokens, token)
+                    if self.sorted_tokens[index : index + 1] == [token]:
+                        del self.sorted_tokens[index]
+            self.removed_documents += 1
+            if self.removed_documents > len(self.documents) // 2:
+                self._compact()
+
+    def load(
+        self, database, batch_size: int = 5000, chunk_size: int = 500
+    ) -> int:
+        """
+        Builds the index from the Existing Jobs table, streaming the
+        searched columns a batch at a time. Meant to run on a background
+        thread; searches made before it finishes see the jobs loaded so
+        far.
+
+        Args:
+            database (DatabaseConnection): The database to index.
+            batch_size (int, optional): Rows fetched at a time.
+            chunk_size (int, optional): Rows added each time the lock is
+                taken, so a search never waits for a whole batch.
+
+        Returns:
+            int: The number of jobs in the index.
+        """
+        _, batches = database.stream_query(
+            select_statement(EXISTING_JOBS, tuple(SEARCH_COLUMNS)),
+            batch_size=batch_size,
+        )
+        for rows in batches:
+            for start in range(0, len(rows), chunk_size):
+                self.add_jobs(rows[start : start + chunk_size])
+        self.ready.set()
+        return len(self)
+
+    def search(self, query: str, limit: int = None) -> list[tuple]:
+        """
+        Returns the jobs matching every word of a query, best matches
+        first. Each word matches tokens it is a prefix of; whole-word
+        matches rank above prefix matches, and ties go to newer jobs.
+
+        Args:
+            query (str): The words to search for, e.g. "oak 12".
+            limit (int, optional): The most results to return. Defaults to
+                the index's max_results.
+        """
+        query_tokens = set(tokenize(query))
+        if not query_tokens:
+            return []
+
+        with self.lock:
+            scores = None
+            for query_token in query_tokens:
+                token_scores = self._prefix_scores(query_token)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        document_id: score + token_scores[document_id]
+                        for document_id, score in scores.items()
+                        if document_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+            best_matches = heapq.nsmallest(
+                limit or self.max_results,
+                (
+                    (-score, self.sort_keys[document_id], document_id)
+                    for document_id, score in scores.items()
+                ),
+            )
+            return [
+                self.documents[document_id]
+                for _, _, document_id in best_matches
+            ]
+
+    def _prefix_scores(self, query_token: str) -> dict[int, int]:
+        """Returns a score for every job with a token starting with the
+        query token: 2 for a whole-word match and 1 for a prefix. A query
+        token shorter than min_prefix_length only matches whole words."""
+        token_scores = {}
+        if len(query_token) >= self.min_prefix_length:
+            # Tokens only contain [a-z0-9], and "~" sorts after all of
+            # them, so the tokens with the prefix lie between these two
+            # positions.
+            start = bisect.bisect_left(self.sorted_tokens, query_token)
+            end = bisect.bisect_left(
+                self.sorted_tokens, query_token + "~", start
+            )
+            prefix_matches = set()
+            for token in self.sorted_tokens[start:end]:
+                if token != query_token:
+                    prefix_matches.update(self.postings[token])
+            token_scores = dict.fromkeys(prefix_matches, 1)
+        # Whole-word matches are applied last so they win over prefixes.
+        if query_token in self.postings:
+            token_scores.update(dict.fromkeys(self.postings[query_token], 2))
+        return token_scores
+
+    def _to_record(self, job: dict | tuple) -> tuple:
+        """Converts a row or dictionary into a search record."""
+        if isinstance(job, dict):
+            return SearchResult._make(
+                job.get(column) for column in SEARCH_COLUMNS
+            )
+        return SearchResult._make(job)
+
+    def _add_record(self, record: tuple, tokens: set[str]) -> list[str]:
+        """Adds a record and its tokens to the postings, and returns the
+        tokens that are new to the index, which the caller adds to the
+        sorted token list. Must be called with the lock held."""
+        job_number = str(record.job_number)
+        if job_number in self.document_ids:
+            self.remove_job(job_number)
+
+        document_id = len(self.documents)
+        self.documents.append(record)
+        self.sort_keys.append(newest_first_key(job_number))
+        self.document_ids[job_number] = document_id
+        new_tokens = []
+        for token in tokens:
+            document_ids = self.postings.get(token)
+            if document_ids is None:
+                document_ids = self.postings[token] = set()
+                new_tokens.append(token)
+            document_ids.add(document_id)
+        return new_tokens
+
+    def _compact(self) -> None:
+        """Drops the slots of removed jobs and renumbers the rest. Must be
+        called with the lock held."""
+        new_ids = {}
+        documents = []
+        sort_keys = []
+        for document_id, record in enumerate(self.documents):
+            if record is None:
+                continue
+            new_ids[document_id] = len(documents)
+            documents.append(record)
+            sort_keys.append(self.sort_keys[document_id])
+        self.documents = documents
+        self.sort_keys = sort_keys
+        self.removed_documents = 0
+        self.document_ids = {
+            job_number: new_ids[document_id]
+            for job_number, document_id in self.document_ids.items()
+        }
+        self.postings = {
+            token: {new_ids[document_id] for document_id in document_ids}
+            for token, document_ids in self.postings.items()
+        }
@@ -0,0 +1,178 @@
+"""This module contains the ParcelCache class, which stores county parcel
+lookups on disk so recently seen parcels do not need another remote
+lookup."""
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import (
+    PARCEL_CACHE_MAX_ENTRIES,
+    PARCEL_CACHE_PATH,
+    PARCEL_CACHE_TTL_HOURS,
+)
+
+
+class ParcelCache:
+    """This class is a disk-backed LRU cache of parcel data, keyed by
+    parcel ID and county, whose entries expire after a time to live."""
+
+    def __init__(
+        self,
+        cache_path: str = PARCEL_CACHE_PATH,
+        max_entries: int = PARCEL_CACHE_MAX_ENTRIES,
+        time_to_live: datetime.timedelta = datetime.timedelta(
+            hours=PARCEL_CACHE_TTL_HOURS
+        ),
+    ):
+        """
+        Initializes the ParcelCache object.
+
+        Args:
+            cache_path (str, optional): The SQLite file that holds the
+                cache. Use ":memory:" for a cache that is not persisted.
+            max_entries (int, optional): The number of parcels kept
+                before the least recently used ones are evicted.
+            time_to_live (datetime.timedelta, optional): How long a
+                cached parcel is used before it is looked up again.
+        """
+        self.max_entries = max_entries
+        self.time_to_live = time_to_live.total_seconds()
+        self.hits = 0
+        self.misses = 0
+        self.last_timestamp = 0.0
+        self.lock = threading.Lock()
+
+        cache_directory = os.path.dirname(cache_path)
+        if cache_directory:
+            os.makedirs(cache_directory, exist_ok=True)
+        # The cache is shared by the GUI and background worker threads,
+        # so access is serialized with the lock instead.
+        self.connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parcels (
+                parcel_id TEXT NOT NULL,
+                county TEXT NOT NULL,
+                parcel_data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (parcel_id, county)
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS parcels_last_used"
+            " ON parcels (last_used)"
+        )
+        self.connection.commit()
+
+    def get(self, parcel_id: str, county: str = None) -> dict | None:
+        """
+        Returns a copy of the cached parcel data, or None if the parcel
+        is not cached or its entry has expired.
+
+        Args:
+            parcel_id (str): The parcel ID to look up.
+            county (str, optional): The parcel's county. If not given,
+                an entry for the parcel ID in any county is returned.
+        """
+        query = (
+            "SELECT county, parcel_data, created_at FROM parcels"
+            " WHERE parcel_id = ?"
+        )
+        parameters = (parcel_id,)
+        if county is not None:
+            query += " AND county = ?"
+            parameters += (county,)
+        query += " ORDER BY last_used DESC LIMIT 1"
+
+        with self.lock:
+            now = self._timestamp()
+            row = self.connection.execute(query, parameters).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            cached_county, parcel_data, created_at = row
+            if now - created_at > self.time_to_live:
+                self.connection.execute(
+                    "DELETE FROM parcels WHERE parcel_id = ? AND county = ?",
+                    (parcel_id, cached_county),
+                )
+                self.connection.commit()
+                self.misses += 1
+                return None
+
+            self.connection.execute(
+                "UPDATE parcels SET last_used = ?"
+                " WHERE parcel_id = ? AND county = ?",
+                (now, parcel_id, cached_county),
+            )
+            self.connection.commit()
+            self.hits += 1
+        return json.loads(parcel_data)
+
+    def put(self, parcel_id: str, county: str, parcel_data: dict) -> None:
+        """Stores parcel data and evicts the least recently used entries
+        if the cache is full."""
+        with self.lock:
+            now = self._timestamp()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO parcels"
+                " (parcel_id, county, parcel_data, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    parcel_id,
+                    county or "",
+                    json.dumps(parcel_data, default=str),
+                    now,
+                    now,
+                ),
+            )
+            self.connection.execute(
+                "DELETE FROM parcels WHERE rowid IN ("
+                " SELECT rowid FROM parcels ORDER BY last_used DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.connection.commit()
+
+    def clear(self) -> None:
+        """Removes every cached parcel and resets the hit counters."""
+        with self.lock:
+            self.connection.execute("DELETE FROM parcels")
+            self.connection.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM parcels"
+            ).fetchone()[0]
+
+    @property
+    def stats(self) -> dict:
+        """Returns the number of cache hits and misses and the hit
+        rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _timestamp(self) -> float:
+        """Returns the current time, nudged forward if needed so that no
+        two cache accesses share a timestamp and LRU order is exact."""
+        self.last_timestamp = max(time.time(), self.last_timestamp + 1e-6)
+        return self.last_timestamp
+
+    def close(self) -> None:
+        """Closes the cache file."""
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,114 @@
+"""This module contains the ParcelPrefetcher class, which looks up the
+parcel typed in the Parcel ID entry in the background, so Submit rarely
+has to wait for the county site."""
+
+import datetime
+import re
+import time
+from typing import Callable
+
+from config import (
+    PARCEL_CACHE_TTL_HOURS,
+    PARCEL_ID_PATTERN,
+    PARCEL_PREFETCH_DELAY_MS,
+)
+
+
+class ParcelPrefetcher:
+    """This class looks up a parcel once the operator stops typing its
+    ID, and holds the result for the next submit of that parcel. A held
+    parcel expires after the parcel cache's time to live, so a window
+    left open is never submitted with stale county data. All methods are
+    called on the GUI thread."""
+
+    def __init__(
+        self,
+        scheduler,
+        worker,
+        read_parcel_id: Callable[[], str],
+        fetch_parcel_data: Callable[[str], dict],
+        delay_ms: int = PARCEL_PREFETCH_DELAY_MS,
+        time_to_live: datetime.timedelta = datetime.timedelta(
+            hours=PARCEL_CACHE_TTL_HOURS
+        ),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the ParcelPrefetcher object.
+
+        Args:
+            scheduler: Any object with Tk-style `after(ms, callback)` and
+                `after_cancel(id)` methods, normally the main window.
+            worker (BackgroundWorker): Runs the lookups.
+            read_parcel_id (Callable[[], str]): Returns the text of the
+                Parcel ID entry.
+            fetch_parcel_data (Callable[[str], dict]): Looks up a parcel.
+            delay_ms (int, optional): Milliseconds typing must pause
+                before the parcel is looked up.
+            time_to_live (datetime.timedelta, optional): How long a
+                prefetched parcel is used.
+            clock (Callable[[], float], optional): Returns the current
+                time in seconds.
+        """
+        self.scheduler = scheduler
+        self.worker = worker
+        self.read_parcel_id = read_parcel_id
+        self.fetch_parcel_data = fetch_parcel_data
+        self.delay_ms = delay_ms
+        self.time_to_live = time_to_live.total_seconds()
+        self.clock = clock
+        self.timer = None
+        # (parcel ID, parcel data, time fetched) of the last prefetch.
+        self.prefetched = None
+
+    def schedule(self, event=None) -> None:
+        """Restarts the prefetch timer whenever the parcel ID entry
+        changes, so the parcel is only looked up once the operator stops
+        typing."""
+        if self.timer:
+            self.scheduler.after_cancel(self.timer)
+        self.timer = self.scheduler.after(self.delay_ms, self.prefetch)
+
+    def prefetch(self) -> None:
+        """Looks up the parcel in the parcel ID entry in the background if
+        it looks like a complete parcel ID that is not already held."""
+        self.timer = None
+        parcel_id = self.read_parcel_id().strip()
+        if not re.fullmatch(PARCEL_ID_PATTERN, parcel_id):
+            return
+        if self.held(parcel_id) is not None:
+            return
+
+        def store(parcel_data: dict) -> None:
+            self.prefetched = (parcel_id, parcel_data, self.clock())
+
+        self.worker.submit(
+            f"prefetch:{parcel_id}",
+            self.fetch_parcel_data,
+            parcel_id,
+            on_success=store,
+            # A failed prefetch is retried by the submit itself.
+            on_error=lambda error: None,
+        )
+
+    def held(self, parcel_id: str) -> dict | None:
+        """Returns the prefetched parcel data if it belongs to the given
+        parcel ID and has not expired."""
+        if self.prefetched is None:
+            return None
+        prefetched_parcel_id, parcel_data, fetched_at = self.prefetched
+        if self.clock() - fetched_at > self.time_to_live:
+            self.prefetched = None
+            return None
+        if prefetched_parcel_id != parcel_id.strip():
+            return None
+        return parcel_data
+
+    def take(self, parcel_id: str) -> dict | None:
+        """Returns the prefetched parcel data for a submit of the given
+        parcel ID, or None if it is not held, and forgets it. A lookup
+        still running is not waited for here; the database joins it when
+        the submission is written, so the county is only asked once."""
+        parcel_data = self.held(parcel_id)
+        self.prefetched = None
+        return parcel_data
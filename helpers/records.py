@@ -0,0 +1,62 @@
+"""This module contains the record types for rows of the Existing Jobs and
+Active Jobs tables. Each type is a namedtuple generated from the column
+order in config.py, so fields are read by name instead of position."""
+
+from collections import namedtuple
+from functools import lru_cache
+from typing import Iterable
+
+from .sql_statements import ACTIVE_JOBS, EXISTING_JOBS, TABLE_COLUMN_ORDERS
+
+RECORD_TYPE_NAMES = {
+    EXISTING_JOBS: "ExistingJob",
+    ACTIVE_JOBS: "ActiveJob",
+}
+
+
+@lru_cache(maxsize=None)
+def record_type(table: str, columns: tuple[str, ...] = None) -> type:
+    """
+    Returns the namedtuple type for rows selected from a table.
+
+    Args:
+        table (str): The table the rows come from.
+        columns (tuple[str, ...], optional): The selected columns, in
+            order. Defaults to every column of the table.
+    """
+    if columns is None:
+        columns = tuple(TABLE_COLUMN_ORDERS[table])
+    unknown_columns = set(columns) - set(TABLE_COLUMN_ORDERS[table])
+    if unknown_columns:
+        raise ValueError(
+            f"Unknown {table} columns: {', '.join(sorted(unknown_columns))}"
+        )
+    return namedtuple(RECORD_TYPE_NAMES[table], columns)
+
+
+ExistingJob = record_type(EXISTING_JOBS)
+ActiveJob = record_type(ACTIVE_JOBS)
+
+
+def to_records(
+    table: str, rows: Iterable[tuple], columns: tuple[str, ...] = None
+) -> list[tuple]:
+    """Converts rows selected from a table into records of the matching
+    type."""
+    make_record = record_type(table, columns)._make
+    return [make_record(row) for row in rows]
+
+
+def has_fields(record: tuple, columns: tuple[str, ...]) -> bool:
+    """Returns True if a record holds every one of the given columns."""
+    return set(columns).issubset(record._fields)
+
+
+def project(record: tuple, table: str, columns: tuple[str, ...]) -> tuple:
+    """Returns a record holding only the given columns of another
+    record."""
+    if record._fields == columns:
+        return record
+    return record_type(table, columns)._make(
+        getattr(record, column) for column in columns
+    )
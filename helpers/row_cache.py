@@ -0,0 +1,99 @@
+"""This module contains the JobRowCache class, which keeps recently
+fetched job rows in memory."""
+
+import threading
+from collections import OrderedDict
+
+from config import ROW_CACHE_MAX_ENTRIES
+
+
+class JobRowCache:
+    """This class is a thread-safe LRU cache of job rows keyed by job
+    number. A row read from the database while its job was written on
+    another thread is not cached: readers note the generation before
+    they read and pass it to put(), which skips rows invalidated since."""
+
+    def __init__(self, max_entries: int = ROW_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # Incremented by every invalidation.
+        self.generation = 0
+        # The generation at which each recently written job was last
+        # invalidated, oldest first.
+        self.invalidations = OrderedDict()
+        # Rows read before this generation are not cached, as the
+        # invalidations they would be checked against were forgotten.
+        self.oldest_generation = 0
+
+    def get(self, job_number: str):
+        """Returns the cached row for a job number, or None if it is not
+        cached."""
+        with self.lock:
+            row = self.rows.get(job_number)
+            if row is None:
+                self.misses += 1
+                return None
+            self.rows.move_to_end(job_number)
+            self.hits += 1
+            return row
+
+    def put(self, job_number: str, row, since: int = None) -> None:
+        """
+        Caches a row, evicting the least recently used row if the cache
+        is full.
+
+        Args:
+            job_number (str): The job the row belongs to.
+            row: The row.
+            since (int, optional): The generation when the row was read.
+                The row is not cached if its job has been invalidated
+                since then.
+        """
+        with self.lock:
+            if since is not None and (
+                since < self.oldest_generation
+                or self.invalidations.get(job_number, 0) > since
+            ):
+                return
+            self.rows[job_number] = row
+            self.rows.move_to_end(job_number)
+            while len(self.rows) > self.max_entries:
+                self.rows.popitem(last=False)
+
+    def invalidate(self, job_number: str) -> None:
+        """Removes a job's row, e.g. after it has been written to."""
+        with self.lock:
+            self.rows.pop(job_number, None)
+            self.generation += 1
+            self.invalidations[job_number] = self.generation
+            self.invalidations.move_to_end(job_number)
+            while len(self.invalidations) > self.max_entries:
+                _, generation = self.invalidations.popitem(last=False)
+                self.oldest_generation = generation
+
+    def clear(self) -> None:
+        """Removes every cached row."""
+        with self.lock:
+            self.rows.clear()
+            self.generation += 1
+            self.invalidations.clear()
+            self.oldest_generation = self.generation
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def stats(self) -> dict:
+        """Returns the number of cache hits and misses, the hit rate and
+        the number of cached rows."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self.rows),
+            }
@@ -0,0 +1,172 @@
+"""This module builds the SQL statements used by DatabaseConnection from
+the column lists in config.py. Every statement binds its values as
+parameters, and each distinct statement is only built once."""
+
+from functools import lru_cache
+
+from config import (
+    ACTIVE_DB_COLUMN_NAMES,
+    ACTIVE_DB_COLUMN_ORDER,
+    EXISTING_DB_COLUMN_NAMES,
+    EXISTING_DB_COLUMN_ORDER,
+    RESERVATION_DB_COLUMN_NAMES,
+    RESERVATION_DB_COLUMN_ORDER,
+)
+
+EXISTING_JOBS = "Existing Jobs"
+ACTIVE_JOBS = "Active Jobs"
+RESERVATIONS = "Job Number Reservations"
+
+TABLE_COLUMN_ORDERS = {
+    EXISTING_JOBS: EXISTING_DB_COLUMN_ORDER,
+    ACTIVE_JOBS: ACTIVE_DB_COLUMN_ORDER,
+    RESERVATIONS: RESERVATION_DB_COLUMN_ORDER,
+}
+TABLE_COLUMN_NAMES = {
+    EXISTING_JOBS: EXISTING_DB_COLUMN_NAMES,
+    ACTIVE_JOBS: ACTIVE_DB_COLUMN_NAMES,
+    RESERVATIONS: RESERVATION_DB_COLUMN_NAMES,
+}
+
+
+def column_name(table: str, column: str) -> str:
+    """Returns the bracketed Access name of a column, e.g. "[Job
+    Number]" for "job_number"."""
+    return f"[{TABLE_COLUMN_NAMES[table][column]}]"
+
+
+@lru_cache(maxsize=None)
+def insert_statement(table: str) -> str:
+    """Returns an INSERT statement that takes one parameter for each
+    column of a table, in column order."""
+    placeholders = ",".join("?" * len(TABLE_COLUMN_ORDERS[table]))
+    return f"INSERT INTO [{table}] VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=None)
+def update_statement(
+    table: str, columns: tuple[str, ...], key_column: str = "job_number"
+) -> str:
+    """Returns an UPDATE statement that sets the given columns, followed
+    by the key column, from parameters."""
+    assignments = ", ".join(
+        f"{column_name(table, column)} = ?" for column in columns
+    )
+    return (
+        f"UPDATE [{table}] SET {assignments}"
+        f" WHERE {column_name(table, key_column)} = ?"
+    )
+
+
+def where_clause(table: str, where: tuple[tuple[str, str], ...]) -> str:
+    """Returns a WHERE clause comparing each (column, operator) pair with
+    a parameter, joined with AND, or an empty string if there are none."""
+    if not where:
+        return ""
+    conditions = " AND ".join(
+        f"{column_name(table, column)} {operator} ?"
+        for column, operator in where
+    )
+    return f" WHERE {conditions}"
+
+
+@lru_cache(maxsize=None)
+def delete_statement(table: str, where: tuple[tuple[str, str], ...]) -> str:
+    """Returns a DELETE statement for the rows matching every condition.
+    At least one condition is required, so a table is never emptied by
+    mistake."""
+    if not where:
+        raise ValueError("A DELETE statement needs at least one condition")
+    return f"DELETE FROM [{table}]{where_clause(table, where)}"
+
+
+@lru_cache(maxsize=None)
+def select_statement(
+    table: str,
+    columns: tuple[str, ...] = None,
+    where: tuple[tuple[str, str], ...] = (),
+) -> str:
+    """
+    Returns a SELECT statement.
+
+    Args:
+        table (str): The table to select from.
+        columns (tuple[str, ...], optional): The columns to select.
+            Selects every column if not given.
+        where (tuple[tuple[str, str], ...], optional): (column, operator)
+            pairs, such as ("job_number", "LIKE"), each compared with a
+            parameter and joined with AND.
+    """
+    if columns:
+        selected = ", ".join(column_name(table, column) for column in columns)
+    else:
+        selected = "*"
+
+    return f"SELECT {selected} FROM [{table}]{where_clause(table, where)}"
+
+
+@lru_cache(maxsize=None)
+def count_statement(
+    table: str, where: tuple[tuple[str, str], ...] = ()
+) -> str:
+    """Returns a statement counting the rows matching every condition."""
+    return f"SELECT COUNT(*) FROM [{table}]{where_clause(table, where)}"
+
+
+@lru_cache(maxsize=None)
+def page_statement(
+    table: str,
+    columns: tuple[str, ...],
+    where: tuple[tuple[str, str], ...],
+    sort_column: str,
+    key_column: str,
+    descending: bool = False,
+    after: str = None,
+) -> str:
+    """
+    Returns a SELECT statement for a page of rows in (sort column, key
+    column) order. Later pages start after the last row of the page
+    before (keyset pagination), so the rows skipped are never read.
+
+    Args:
+        table (str): The table to select from.
+        columns (tuple[str, ...]): The columns to select.
+        where (tuple[tuple[str, str], ...]): (column, operator) filter
+            pairs, each compared with a parameter.
+        sort_column (str): The column the rows are sorted by.
+        key_column (str): A unique column breaking ties between rows with
+            the same sort value.
+        descending (bool, optional): Whether the rows are sorted in
+            descending order.
+        after (str, optional): None for the first page. "value" for a
+            page after a row whose sort value is not null, which takes
+            the parameters (sort value, sort value, key), and "null" for
+            one after a row whose sort value is null, which takes (key,).
+            When sorting by the key column, either takes (key,).
+    """
+    sort = column_name(table, sort_column)
+    key = column_name(table, key_column)
+    comparison = "<" if descending else ">"
+    direction = " DESC" if descending else ""
+
+    if after is None:
+        keyset = ""
+    elif sort_column == key_column:
+        keyset = f"{key} {comparison} ?"
+    # Nulls sort first in ascending order and last in descending order,
+    # in Access and SQLite alike.
+    elif after == "null" and descending:
+        keyset = f"{sort} IS NULL AND {key} < ?"
+    elif after == "null":
+        keyset = f"({sort} IS NULL AND {key} > ?) OR {sort} IS NOT NULL"
+    elif descending:
+        keyset = f"{sort} < ? OR {sort} IS NULL OR ({sort} = ? AND {key} < ?)"
+    else:
+        keyset = f"{sort} > ? OR ({sort} = ? AND {key} > ?)"
+
+    statement = select_statement(table, columns, where)
+    if keyset:
+        statement += f" AND ({keyset})" if where else f" WHERE ({keyset})"
+    if sort_column == key_column:
+        return f"{statement} ORDER BY {key}{direction}"
+    return f"{statement} ORDER BY {sort}{direction}, {key}{direction}"
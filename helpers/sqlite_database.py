@@ -0,0 +1,75 @@
+"""This module contains the SQLiteDatabaseConnection class, a stand-in for
+the Access database with the same tables and column names. It lets the
+benchmarks and tests run the real query code without the Access
+driver."""
+
+import sqlite3
+
+from .database_connector import DatabaseConnection
+from .sql_statements import (
+    ACTIVE_JOBS,
+    EXISTING_JOBS,
+    RESERVATIONS,
+    TABLE_COLUMN_ORDERS,
+    column_name,
+)
+
+
+def create_table_statement(table: str, key_column: str) -> str:
+    """Returns a CREATE TABLE statement for a table, with every column
+    stored as text and the key column as the primary key."""
+    columns = ", ".join(
+        f"{column_name(table, column)} TEXT"
+        + (" PRIMARY KEY" if column == key_column else "")
+        for column in TABLE_COLUMN_ORDERS[table]
+    )
+    return f"CREATE TABLE IF NOT EXISTS [{table}] ({columns})"
+
+
+class SQLiteDatabaseConnection(DatabaseConnection):
+    """This class runs DatabaseConnection against a SQLite file, or an
+    in-memory database shared by every pooled connection."""
+
+    def __init__(self, database_path: str = ":memory:", **kwargs):
+        if database_path == ":memory:":
+            # A named shared-cache database, so every connection in the
+            # pool sees the same tables.
+            database_path = f"file:jobs_{id(self)}?mode=memory&cache=shared"
+        super().__init__(database_path, **kwargs)
+        # A shared in-memory database is deleted when its last connection
+        # closes, so one connection is held open for its lifetime.
+        self.keep_alive = self.connect()
+        self.create_tables()
+
+    def connect(self) -> sqlite3.Connection:
+        """Opens a connection to the SQLite database."""
+        return sqlite3.connect(
+            self.database_path,
+            uri=self.database_path.startswith("file:"),
+            check_same_thread=False,
+        )
+
+    def driver(self):
+        """Returns the sqlite3 module, whose Error and IntegrityError
+        exceptions are caught."""
+        return sqlite3
+
+    def create_tables(self) -> None:
+        """Creates the job tables if they do not exist."""
+        with self.checkout() as connection:
+            for table in (EXISTING_JOBS, ACTIVE_JOBS):
+                connection.execute(create_table_statement(table, "job_number"))
+            connection.commit()
+
+    def create_reservation_table(self) -> None:
+        """Creates the job number reservation table if it is missing."""
+        with self.checkout() as connection:
+            connection.execute(
+                create_table_statement(RESERVATIONS, "block_start")
+            )
+            connection.commit()
+
+    def close(self) -> None:
+        """Closes the database connections."""
+        super().close()
+        self.keep_alive.close()
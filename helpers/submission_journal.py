@@ -0,0 +1,459 @@
+"""This module contains the SubmissionJournal class, a local file that
+submitted jobs are written to before they reach the database, and the
+JournalFlusher class, which copies them to the database in the
+background. A submission is never lost because the share is slow or
+offline; it waits in the journal until it can be written."""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Iterable
+
+from config import (
+    JOURNAL_BATCH_SIZE,
+    JOURNAL_MAX_ATTEMPTS,
+    JOURNAL_MAX_RETRY_SECONDS,
+    JOURNAL_RETRY_SECONDS,
+    SUBMISSION_JOURNAL_PATH,
+)
+
+from .database_connector import EXISTING_LOOKUP_COLUMNS, JobNumberTakenError
+from .instrumentation import instrumented
+
+JournalEntry = namedtuple(
+    "JournalEntry",
+    [
+        "position",
+        "job_number",
+        "revision",
+        "user_inputs",
+        "parcel_data",
+        "allow_update",
+        "in_existing_jobs",
+        "in_active_jobs",
+        "changed_fields",
+        "attempts",
+    ],
+)
+
+
+def to_flag(value: bool | None) -> int | None:
+    """Returns a boolean as stored in the journal, keeping None."""
+    return None if value is None else int(value)
+
+
+def from_flag(value: int | None) -> bool | None:
+    """Returns a boolean stored in the journal, keeping None."""
+    return None if value is None else bool(value)
+
+
+class SubmissionJournal:
+    """This class stores submissions waiting to be written to the
+    database. There is one entry per job number, so submitting a job
+    again before it is written replaces the waiting values, and writing
+    an entry twice only updates the job with the same values."""
+
+    def __init__(self, journal_path: str = SUBMISSION_JOURNAL_PATH):
+        """
+        Initializes the SubmissionJournal object.
+
+        Args:
+            journal_path (str, optional): The SQLite file that holds the
+                journal. Use ":memory:" for a journal that is not
+                persisted.
+        """
+        self.lock = threading.Lock()
+
+        journal_directory = os.path.dirname(journal_path)
+        if journal_directory:
+            os.makedirs(journal_directory, exist_ok=True)
+        # The journal is shared by the GUI and flusher threads, so access
+        # is serialized with the lock instead.
+        self.connection = sqlite3.connect(
+            journal_path, check_same_thread=False
+        )
+        # Every submission is flushed to disk before it is acknowledged.
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS submissions (
+                job_number TEXT PRIMARY KEY,
+                revision INTEGER NOT NULL,
+                user_inputs TEXT NOT NULL,
+                parcel_data TEXT,
+                allow_update INTEGER NOT NULL,
+                in_existing_jobs INTEGER,
+                in_active_jobs INTEGER,
+                changed_fields TEXT,
+                queued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                failed INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = [
+            row[1]
+            for row in self.connection.execute(
+                "PRAGMA table_info(submissions)"
+            )
+        ]
+        if "changed_fields" not in columns:
+            # Journals written before changed fields were tracked.
+            self.connection.execute(
+                "ALTER TABLE submissions ADD COLUMN changed_fields TEXT"
+            )
+        self.connection.commit()
+
+    def append(
+        self,
+        user_inputs: dict,
+        parcel_data: dict = None,
+        allow_update: bool = True,
+        in_existing_jobs: bool = None,
+        in_active_jobs: bool = None,
+        changed_fields: Iterable[str] = None,
+    ) -> None:
+        """
+        Stores a submission until it is written to the database. The
+        arguments are those of DatabaseConnection.insert_new_job.
+
+        A job that is already waiting keeps its place in the queue and
+        how it was first found in the database, but takes the new values.
+        Its changed fields are forgotten, so every column is rewritten.
+        """
+        with self.lock:
+            self.connection.execute(
+                """
+                INSERT INTO submissions (
+                    job_number, revision, user_inputs, parcel_data,
+                    allow_update, in_existing_jobs, in_active_jobs,
+                    changed_fields, queued_at
+                ) VALUES (?, 0, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (job_number) DO UPDATE SET
+                    revision = revision + 1,
+                    user_inputs = excluded.user_inputs,
+                    parcel_data = excluded.parcel_data,
+                    changed_fields = NULL,
+                    attempts = 0,
+                    last_error = NULL,
+                    failed = 0
+                """,
+                (
+                    user_inputs["job_number"],
+                    json.dumps(user_inputs, default=str),
+                    None
+                    if parcel_data is None
+                    else json.dumps(parcel_data, default=str),
+                    int(allow_update),
+                    to_flag(in_existing_jobs),
+                    to_flag(in_active_jobs),
+                    None
+                    if changed_fields is None
+                    else json.dumps(sorted(changed_fields)),
+                    time.time(),
+                ),
+            )
+            self.connection.commit()
+
+    def pending(
+        self, limit: int = JOURNAL_BATCH_SIZE, after: int = 0
+    ) -> list[JournalEntry]:
+        """Returns up to `limit` waiting submissions, oldest first,
+        starting after the entry at position `after`."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT rowid, job_number, revision, user_inputs,"
+                " parcel_data, allow_update, in_existing_jobs,"
+                " in_active_jobs, changed_fields, attempts FROM submissions"
+                " WHERE failed = 0 AND rowid > ? ORDER BY rowid LIMIT ?",
+                (after, limit),
+            ).fetchall()
+        return [
+            JournalEntry(
+                position,
+                job_number,
+                revision,
+                json.loads(user_inputs),
+                None if parcel_data is None else json.loads(parcel_data),
+                bool(allow_update),
+                from_flag(in_existing_jobs),
+                from_flag(in_active_jobs),
+                None if changed_fields is None else json.loads(changed_fields),
+                attempts,
+            )
+            for (
+                position,
+                job_number,
+                revision,
+                user_inputs,
+                parcel_data,
+                allow_update,
+                in_existing_jobs,
+                in_active_jobs,
+                changed_fields,
+                attempts,
+            ) in rows
+        ]
+
+    def remove(self, entries: list[JournalEntry]) -> None:
+        """Removes written submissions. An entry replaced by a newer
+        submission since it was read is kept, so the newer values are
+        written too."""
+        with self.lock:
+            self.connection.executemany(
+                "DELETE FROM submissions"
+                " WHERE job_number = ? AND revision = ?",
+                [(entry.job_number, entry.revision) for entry in entries],
+            )
+            self.connection.commit()
+
+    def record_failure(
+        self, entry: JournalEntry, error: Exception, give_up: bool = False
+    ) -> None:
+        """Records a failed attempt to write a submission. A submission
+        that is given up on stays in the journal, but is not retried."""
+        with self.lock:
+            self.connection.execute(
+                "UPDATE submissions SET attempts = attempts + 1,"
+                " last_error = ?, failed = ?"
+                " WHERE job_number = ? AND revision = ?",
+                (str(error), int(give_up), entry.job_number, entry.revision),
+            )
+            self.connection.commit()
+
+    @property
+    def depth(self) -> int:
+        """Returns the number of submissions waiting to be written."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM submissions WHERE failed = 0"
+            ).fetchone()[0]
+
+    def failed(self) -> list[tuple[str, str]]:
+        """Returns the job number and error of each submission that was
+        given up on."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT job_number, last_error FROM submissions"
+                " WHERE failed = 1 ORDER BY rowid"
+            ).fetchall()
+
+    def close(self) -> None:
+        """Closes the journal file."""
+        with self.lock:
+            self.connection.close()
+
+
+class JournalFlusher:
+    """This class writes the journal's submissions to the database on a
+    background thread, a batch per transaction. While the database
+    cannot be reached it retries with a growing delay."""
+
+    def __init__(
+        self,
+        journal: SubmissionJournal,
+        database,
+        batch_size: int = JOURNAL_BATCH_SIZE,
+        retry_delay: float = JOURNAL_RETRY_SECONDS,
+        max_retry_delay: float = JOURNAL_MAX_RETRY_SECONDS,
+        max_attempts: int = JOURNAL_MAX_ATTEMPTS,
+    ):
+        """
+        Initializes the JournalFlusher object.
+
+        Args:
+            journal (SubmissionJournal): The submissions to write.
+            database (DatabaseConnection): The database to write to.
+            batch_size (int, optional): Submissions written per
+                transaction.
+            retry_delay (float, optional): Seconds between checks of the
+                journal, and before the first retry after a failure.
+            max_retry_delay (float, optional): The longest delay between
+                retries while the database cannot be reached.
+            max_attempts (int, optional): Tries before a submission that
+                fails for its own reason is set aside.
+        """
+        self.journal = journal
+        self.database = database
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        # The error of the last failed flush, or None if it succeeded.
+        self.last_error = None
+        # (parcel data, None) for each written job and (job number,
+        # error) for each job that was set aside, read by the GUI thread.
+        self.results = queue.Queue()
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Starts the background thread."""
+        self.thread.start()
+
+    def notify(self) -> None:
+        """Wakes the background thread to write new submissions now."""
+        self.wake.set()
+
+    def stop(self, timeout: float = None) -> None:
+        """Stops the background thread. Submissions not yet written stay
+        in the journal for the next start."""
+        self.stopping = True
+        self.wake.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+    def _run(self) -> None:
+        """Flushes the journal until stopped."""
+        delay = self.retry_delay
+        while not self.stopping:
+            try:
+                self.flush()
+            except Exception as error:  # Retried after the delay.
+                self.last_error = error
+                delay = min(delay * 2, self.max_retry_delay)
+            else:
+                self.last_error = None
+                delay = self.retry_delay
+            self.wake.wait(delay)
+            self.wake.clear()
+
+    @instrumented("journal.flush")
+    def flush(self) -> int:
+        """Writes every waiting submission to the database and returns
+        the number written. Database errors are raised, and the batch
+        that failed is tried again on the next flush."""
+        written_count = 0
+        position = 0
+        while not self.stopping:
+            # Entries that failed stay in the journal, so each flush reads
+            # on from the last batch rather than from the start.
+            entries = self.journal.pending(self.batch_size, position)
+            if not entries:
+                break
+            position = entries[-1].position
+            written = self.write_batch(entries)
+            self.journal.remove([entry for entry, _ in written])
+            for _, parcel_data in written:
+                self.results.put((parcel_data, None))
+            written_count += len(written)
+        return written_count
+
+    def write_batch(
+        self, entries: list[JournalEntry]
+    ) -> list[tuple[JournalEntry, dict]]:
+        """Writes a batch of submissions in one transaction and returns
+        each written entry with the values written."""
+        # Parcels are looked up before the transaction starts, so a slow
+        # county site does not hold the database connection.
+        lookups = []
+        for entry in entries:
+            parcel_data = entry.parcel_data
+            if parcel_data is None:
+                try:
+                    parcel_data = self.database.fetch_parcel_data(
+                        entry.user_inputs["parcel_id"]
+                    )
+                except Exception as error:
+                    self.record_failure(entry, error)
+                    continue
+            lookups.append((entry, parcel_data))
+        return self.write_lookups(lookups)
+
+    def write_lookups(
+        self, lookups: list[tuple[JournalEntry, dict]]
+    ) -> list[tuple[JournalEntry, dict]]:
+        """
+        Writes submissions whose parcels were looked up in one
+        transaction and returns each written entry with the values
+        written. A submission that fails for its own reason, e.g. a value
+        too long for its column, rolls the transaction back, so the
+        submissions are then written one at a time and only that one is
+        set aside. Other errors, such as an unreachable database, are
+        raised.
+        """
+        written = []
+        taken = []
+        try:
+            with self.database.transaction():
+                for entry, parcel_data in lookups:
+                    try:
+                        parcel_data = self.database.insert_new_job(
+                            entry.user_inputs,
+                            parcel_data,
+                            entry.allow_update,
+                            entry.in_existing_jobs,
+                            entry.in_active_jobs,
+                            entry.changed_fields,
+                        )
+                    except JobNumberTakenError as error:
+                        values = self.written_values(entry, parcel_data)
+                        if values is not None:
+                            written.append((entry, values))
+                            continue
+                        # Retrying cannot help; the operator has to choose
+                        # a new job number.
+                        taken.append((entry, error))
+                        continue
+                    written.append((entry, parcel_data))
+        except self.entry_errors() as error:
+            if len(lookups) == 1:
+                self.record_failure(lookups[0][0], error)
+                return []
+            written = []
+            for lookup in lookups:
+                written.extend(self.write_lookups([lookup]))
+            return written
+        # Recorded once the transaction is committed, so a batch that is
+        # written again one at a time does not report them twice.
+        for entry, error in taken:
+            self.record_failure(entry, error, give_up=True)
+        return written
+
+    def written_values(
+        self, entry: JournalEntry, parcel_data: dict
+    ) -> dict | None:
+        """Returns the values of a new job whose number is taken if the job
+        in the database already holds them, meaning an earlier flush wrote
+        the entry but could not remove it from the journal. Returns None
+        if the number belongs to another job."""
+        values = dict(parcel_data)
+        self.database.merge_user_inputs_into_parcel_data(
+            entry.user_inputs, values
+        )
+        record = self.database.get_existing_job(
+            entry.job_number, EXISTING_LOOKUP_COLUMNS
+        )
+        if record is None:
+            return None
+        for column in EXISTING_LOOKUP_COLUMNS:
+            stored, value = getattr(record, column), values.get(column)
+            if (stored or None) != (value or None):
+                return None
+        return values
+
+    def entry_errors(self) -> tuple[type, ...]:
+        """Returns the errors a submission can cause by itself, as
+        opposed to errors reaching the database."""
+        errors = (KeyError, TypeError, ValueError)
+        if hasattr(self.database, "driver"):
+            driver = self.database.driver()
+            errors += (driver.DataError, driver.IntegrityError)
+        return errors
+
+    def record_failure(
+        self, entry: JournalEntry, error: Exception, give_up: bool = False
+    ) -> None:
+        """Records a submission that failed for its own reason, and sets
+        it aside once it has used up its attempts."""
+        give_up = give_up or entry.attempts + 1 >= self.max_attempts
+        self.journal.record_failure(entry, error, give_up)
+        if give_up:
+            self.results.put((entry.job_number, error))
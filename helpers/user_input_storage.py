@@ -1,16 +1,23 @@
 """This module contains the UserInputStorage class, which is used to
 store user input objects and their values."""
-from typing import Dict, TypeAlias, Union
+import tkinter as tk
+from typing import Dict, Iterable, TypeAlias, Union
 
 import ttkbootstrap as ttk
 
 # Define a type alias for the input objects
 InputObject: TypeAlias = Union[ttk.DateEntry, ttk.Entry, ttk.Text]
 
+# Changing this field means the form holds a different job, so none of
+# the values known to be in the database apply any more.
+KEY_FIELD = "job_number"
+
 
 class UserInputStorage:
     """This class manages and stores user input objects and their
-    values."""
+    values. Values are cached as the widgets report changes, rather than
+    read from every widget on each access, and the fields changed since
+    the job was last loaded or submitted are tracked."""
 
     def __init__(self, input_objects: Dict[str, InputObject] = None) -> None:
         """
@@ -21,7 +28,13 @@ class UserInputStorage:
                 A dictionary of input objects (widgets) indexed by their
                 names. Defaults to an empty dictionary.
         """
-        self.input_objects = input_objects or {}
+        self.input_objects = {}
+        self.values = {}
+        # The values known to be in the database, by field.
+        self.clean_values = {}
+        # Tk variables traced for changes, kept so they are not collected.
+        self.variables = {}
+        self.add_inputs(input_objects or {})
 
     def add_inputs(self, input_objects: Dict[str, InputObject]) -> None:
         """
@@ -31,13 +44,19 @@ class UserInputStorage:
             input_objects (Dict[str, InputObject]): A dictionary of
                 input objects (widgets) indexed by their names.
         """
-        self.input_objects.update(input_objects)
+        for object_name, input_object in input_objects.items():
+            self.input_objects[object_name] = input_object
+            self.values[object_name] = self.read_value(input_object)
+            self.watch(object_name, input_object)
 
     def clear(self) -> None:
         """
         Clears the input_objects dictionary.
         """
         self.input_objects.clear()
+        self.values.clear()
+        self.clean_values.clear()
+        self.variables.clear()
 
     @property
     def inputs(self) -> Dict[str, str]:
@@ -49,13 +68,99 @@ class UserInputStorage:
             Dict[str, str]:
                 A dictionary of input object names and their values.
         """
-        user_inputs = {}
+        # A text widget reports changes through a queued event, so one
+        # that has changed since is read directly.
         for object_name, input_object in self.input_objects.items():
-            if isinstance(input_object, ttk.DateEntry):
-                object_contents = input_object.entry.get()
-            elif isinstance(input_object, ttk.Entry):
-                object_contents = input_object.get()
-            elif isinstance(input_object, ttk.Text):
-                object_contents = input_object.get("1.0", "end-1c")
-            user_inputs[object_name] = object_contents
-        return user_inputs
+            if (
+                isinstance(input_object, ttk.Text)
+                and input_object.edit_modified()
+            ):
+                self.on_text_modified(object_name)
+        return dict(self.values)
+
+    @property
+    def dirty_fields(self) -> set[str]:
+        """Returns the fields whose values may differ from the database:
+        those changed since the job was loaded or submitted, and those
+        never loaded. Every field is dirty once the job number changes."""
+        values = self.inputs
+        if values.get(KEY_FIELD) != self.clean_values.get(KEY_FIELD):
+            return set(values)
+        return {
+            object_name
+            for object_name, value in values.items()
+            if object_name not in self.clean_values
+            or self.clean_values[object_name] != value
+        }
+
+    def mark_clean(self, object_names: Iterable[str] = None) -> None:
+        """
+        Records the current values of some fields as the values in the
+        database, e.g. after they are loaded or submitted.
+
+        Args:
+            object_names (Iterable[str], optional): The fields to mark.
+                Defaults to every field.
+        """
+        if object_names is None:
+            object_names = self.input_objects
+        for object_name in object_names:
+            # Read now, since a change event may still be queued.
+            value = self.read_value(self.input_objects[object_name])
+            self.values[object_name] = value
+            self.clean_values[object_name] = value
+
+    def mark_loaded(self, values: Dict[str, str]) -> None:
+        """
+        Records values loaded from the database as the values in the
+        database, whatever the fields show now. A field the operator typed
+        into while the values were loading stays dirty unless it matches.
+
+        Args:
+            values (Dict[str, str]): The loaded values, by field.
+        """
+        self.clean_values.update(values)
+
+    def watch(self, object_name: str, input_object: InputObject) -> None:
+        """Updates the cached value of a field whenever its widget
+        changes."""
+        if isinstance(input_object, ttk.Text):
+            input_object.edit_modified(False)
+            input_object.bind(
+                "<<Modified>>",
+                lambda event: self.on_text_modified(object_name),
+                add="+",
+            )
+            return
+
+        if isinstance(input_object, ttk.DateEntry):
+            entry = input_object.entry
+        else:
+            entry = input_object
+        variable = tk.StringVar(master=entry, value=entry.get())
+        entry.configure(textvariable=variable)
+        variable.trace_add(
+            "write", lambda *args: self.on_entry_changed(object_name)
+        )
+        self.variables[object_name] = variable
+
+    def on_entry_changed(self, object_name: str) -> None:
+        """Caches an entry's value after it changes."""
+        self.values[object_name] = self.variables[object_name].get()
+
+    def on_text_modified(self, object_name: str) -> None:
+        """Caches a text widget's value and resets its modified flag, so
+        its next change is reported too."""
+        input_object = self.input_objects[object_name]
+        self.values[object_name] = self.read_value(input_object)
+        input_object.edit_modified(False)
+
+    @staticmethod
+    def read_value(input_object: InputObject) -> str:
+        """Reads the current value of an input object."""
+        if isinstance(input_object, ttk.DateEntry):
+            return input_object.entry.get()
+        elif isinstance(input_object, ttk.Entry):
+            return input_object.get()
+        elif isinstance(input_object, ttk.Text):
+            return input_object.get("1.0", "end-1c")
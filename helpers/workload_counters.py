@@ -0,0 +1,175 @@
+"""This module contains the WorkloadCounters class, which keeps the counts
+shown on the workload dashboard: the jobs opened each month and the
+Active Jobs in each inhouse and invoice status. They are counted from the
+tables once and then kept up to date as jobs are written, so showing the
+dashboard never has to scan the tables."""
+
+import datetime
+import threading
+from collections import Counter
+
+from config import EXPORT_BATCH_SIZE
+
+from .sql_statements import ACTIVE_JOBS, EXISTING_JOBS, select_statement
+
+STATUS_COLUMNS = ("inhouse_status", "invoice_status")
+# Shown in place of a status that is not filled in, and of a month for a
+# job number that does not start with one.
+BLANK = "(blank)"
+
+
+def job_month(job_number: str) -> str:
+    """Returns the month a job was opened, e.g. "2023-01" for 23010105,
+    from the YYMM prefix of its job number."""
+    prefix = str(job_number)[:4]
+    if len(prefix) == 4 and prefix.isdigit() and 1 <= int(prefix[2:]) <= 12:
+        return f"20{prefix[:2]}-{prefix[2:]}"
+    return BLANK
+
+
+def status_label(status) -> str:
+    """Returns the label a status is counted under on the dashboard."""
+    if status is None:
+        return BLANK
+    return str(status).strip() or BLANK
+
+
+class WorkloadCounters:
+    """This class counts jobs by month and by status. The counts are built
+    from the database by build(), and record() updates them for each job
+    written afterwards. Writes recorded while the counts are being built
+    are applied once the build finishes, so none are missed. The counts
+    may be read on the GUI thread while jobs are written on others."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.opened_jobs = set()
+        self.jobs_per_month = Counter()
+        # The (inhouse status, invoice status) of every active job, so a
+        # job whose status changes can be moved out of its old counts.
+        self.statuses = {}
+        self.status_counts = {column: Counter() for column in STATUS_COLUMNS}
+        self.counted_at = None
+        # Writes recorded while a build is running, or None.
+        self.pending = None
+
+    @property
+    def built(self) -> bool:
+        return self.counted_at is not None
+
+    def build(self, database, batch_size: int = EXPORT_BATCH_SIZE) -> None:
+        """
+        Counts every job in the database, replacing any earlier counts.
+        Only the job numbers and statuses are read, a batch at a time.
+
+        Args:
+            database (DatabaseConnection): The database to count.
+            batch_size (int, optional): Rows fetched at a time.
+        """
+        with self.lock:
+            self.pending = []
+        try:
+            opened_jobs = set()
+            _, batches = database.stream_query(
+                select_statement(EXISTING_JOBS, ("job_number",)),
+                batch_size=batch_size,
+            )
+            for rows in batches:
+                opened_jobs.update(row[0] for row in rows)
+
+            statuses = {}
+            _, batches = database.stream_query(
+                select_statement(
+                    ACTIVE_JOBS, ("job_number", *STATUS_COLUMNS)
+                ),
+                batch_size=batch_size,
+            )
+            for rows in batches:
+                for job_number, *status in rows:
+                    statuses[job_number] = tuple(status)
+        except BaseException:
+            with self.lock:
+                self.pending = None
+            raise
+
+        with self.lock:
+            self.opened_jobs = opened_jobs
+            self.jobs_per_month = Counter(map(job_month, opened_jobs))
+            self.statuses = statuses
+            self.status_counts = {
+                column: Counter(status[index] for status in statuses.values())
+                for index, column in enumerate(STATUS_COLUMNS)
+            }
+            self.counted_at = datetime.datetime.now()
+            pending, self.pending = self.pending, None
+            # Applying a write the build already read changes nothing.
+            for table, job_number, values in pending:
+                self.apply(table, job_number, values)
+
+    def record(self, table: str, job_number: str, values: dict) -> None:
+        """
+        Updates the counts for a job written to a table. Does nothing
+        until the counts have been built, since the build counts it.
+
+        Args:
+            table (str): The table the job was written to.
+            job_number (str): The job's number.
+            values (dict): The job's status columns that were written.
+                Statuses that were not written keep their old counts.
+        """
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append((table, job_number, dict(values)))
+            elif self.built:
+                self.apply(table, job_number, values)
+
+    def apply(self, table: str, job_number: str, values: dict) -> None:
+        """Updates the counts for a written job. Must be called with the
+        lock held."""
+        if table == EXISTING_JOBS:
+            if job_number not in self.opened_jobs:
+                self.opened_jobs.add(job_number)
+                self.jobs_per_month[job_month(job_number)] += 1
+            return
+        if table != ACTIVE_JOBS:
+            return
+
+        old_status = self.statuses.get(job_number)
+        if old_status is None:
+            old_status = (None,) * len(STATUS_COLUMNS)
+        else:
+            for column, value in zip(STATUS_COLUMNS, old_status):
+                self.status_counts[column][value] -= 1
+        status = tuple(
+            values.get(column, old_value)
+            for column, old_value in zip(STATUS_COLUMNS, old_status)
+        )
+        self.statuses[job_number] = status
+        for column, value in zip(STATUS_COLUMNS, status):
+            self.status_counts[column][value] += 1
+
+    def snapshot(self) -> dict | None:
+        """Returns a copy of the counts for the dashboard, or None if they
+        have not been built. Months are newest first and statuses most
+        common first, with BLANK for jobs without one."""
+        with self.lock:
+            if not self.built:
+                return None
+            snapshot = {
+                "counted_at": self.counted_at.isoformat(timespec="seconds"),
+                "existing_jobs": len(self.opened_jobs),
+                "active_jobs": len(self.statuses),
+                "jobs_per_month": dict(
+                    sorted(self.jobs_per_month.items(), reverse=True)
+                ),
+            }
+            for column, counts in self.status_counts.items():
+                labelled = Counter()
+                for value, count in counts.items():
+                    labelled[status_label(value)] += count
+                snapshot[column] = {
+                    label: count
+                    for label, count in labelled.most_common()
+                    if count > 0
+                }
+            return snapshot
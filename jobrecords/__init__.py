@@ -0,0 +1,6 @@
+"""Headless access to the job records: generating job numbers, looking up
+jobs and creating or updating jobs without the GUI or ttkbootstrap.
+
+Run `python -m jobrecords --help` for the command line interface."""
+
+from .api import JobRecords, open_database
@@ -0,0 +1,217 @@
+"""Generates job numbers, looks up jobs and creates or updates jobs from
+the command line. Every result is printed as one JSON object per line.
+
+Examples:
+    python -m jobrecords generate --count 5
+    python -m jobrecords lookup 23010100
+    python -m jobrecords create parcel_id=24-37-01-00-1 entry_by=AB
+    python -m jobrecords upsert job_number=23010100 contact_info=555-0100
+    python -m jobrecords batch < jobs.jsonl
+    python -m jobrecords serve --port 8765
+    python -m jobrecords check-schema
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Iterator, TextIO
+
+from config import (
+    DATABASE_PATH,
+    EXISTING_DB_COLUMN_ORDER,
+    JOB_NUMBER_SNAPSHOT_PATH,
+    JOURNAL_BATCH_SIZE,
+    SERVICE_HOST,
+    SERVICE_PORT,
+)
+
+from .api import SQLITE_EXTENSIONS, JobRecords, open_database
+from .service import JobRecordsService, serve
+
+
+def parse_fields(pairs: list[str]) -> dict:
+    """Returns a job's values from column=value pairs."""
+    job = {}
+    for pair in pairs:
+        column, separator, value = pair.partition("=")
+        if not separator:
+            raise argparse.ArgumentTypeError(
+                f"Expected column=value, got {pair!r}"
+            )
+        job[column.strip()] = value
+    return job
+
+
+def read_commands(lines: TextIO) -> Iterator[dict | ValueError]:
+    """Yields the command on each non-blank line of JSON lines input. A
+    line that is not a JSON object yields an error instead, which is
+    reported in its place."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            command = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield ValueError(f"Line {line_number}: {error}")
+            continue
+        if not isinstance(command, dict):
+            yield ValueError(f"Line {line_number}: expected a JSON object")
+            continue
+        yield command
+
+
+def print_result(result: dict) -> bool:
+    """Prints a result as a line of JSON and returns whether it
+    succeeded."""
+    print(json.dumps(result, default=str), flush=True)
+    return result.get("ok", True)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Returns the parser for the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m jobrecords",
+        description=__doc__.split("\n\n")[0],
+        epilog=__doc__.split("\n\n", 1)[1],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--database",
+        default=DATABASE_PATH,
+        help="Access database, or a SQLite file ending in"
+        f" {', '.join(SQLITE_EXTENSIONS)}",
+    )
+    parser.add_argument(
+        "--skip-parcels",
+        action="store_true",
+        help="Do not look up county parcel data",
+    )
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="Reserve and print new job numbers"
+    )
+    generate_parser.add_argument("--count", type=int, default=1)
+
+    lookup_parser = subparsers.add_parser(
+        "lookup", help="Print existing jobs"
+    )
+    lookup_parser.add_argument("job_numbers", nargs="+")
+    lookup_parser.add_argument(
+        "--all-columns",
+        action="store_true",
+        help="Print every column instead of the ones the window shows",
+    )
+
+    for action, description in (
+        ("create", "Create a job, generating a job number if none is given"),
+        ("upsert", "Create a job or update the job with its number"),
+    ):
+        job_parser = subparsers.add_parser(action, help=description)
+        job_parser.add_argument(
+            "fields", nargs="+", metavar="column=value"
+        )
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Run JSON lines commands from stdin, e.g."
+        ' {"action": "create", "parcel_id": "...", "entry_by": "AB"}',
+    )
+    batch_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=JOURNAL_BATCH_SIZE,
+        help="Commands committed together",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run the job records service the windows can connect to",
+    )
+    serve_parser.add_argument("--host", default=SERVICE_HOST)
+    serve_parser.add_argument("--port", type=int, default=SERVICE_PORT)
+
+    subparsers.add_parser(
+        "check-schema",
+        help="Check the column names in config.py against the database",
+    )
+    return parser
+
+
+def check_schema(database) -> int:
+    """Prints the column names in config.py that each job table does not
+    have, along with the names it does have, and returns the exit
+    status, 1 if any are missing."""
+    try:
+        missing = database.missing_columns()
+        for table, names in missing.items():
+            print_result(
+                {
+                    "ok": False,
+                    "table": table,
+                    "missing": names,
+                    "columns": database.table_columns(table),
+                }
+            )
+    finally:
+        database.close()
+    if not missing:
+        print_result({"ok": True})
+    return 1 if missing else 0
+
+
+def main(arguments: list[str] = None) -> int:
+    """Runs the command line interface and returns the exit status, 1 if
+    any command failed."""
+    parser = create_parser()
+    args = parser.parse_args(arguments)
+
+    snapshot_path = JOB_NUMBER_SNAPSHOT_PATH
+    if args.database.lower().endswith(SQLITE_EXTENSIONS):
+        # Job numbers of a test database must not replace the cached job
+        # numbers of the real one.
+        snapshot_path = (
+            os.path.splitext(args.database)[0] + ".job_numbers.json"
+        )
+    job_records = JobRecords(
+        open_database(args.database),
+        look_up_parcels=not args.skip_parcels,
+        snapshot_path=snapshot_path,
+    )
+
+    if args.action == "serve":
+        serve(JobRecordsService(job_records), args.host, args.port)
+        return 0
+    if args.action == "check-schema":
+        return check_schema(job_records.database)
+    if args.action == "generate":
+        commands = [{"action": "generate"}] * args.count
+    elif args.action == "lookup":
+        columns = EXISTING_DB_COLUMN_ORDER if args.all_columns else None
+        commands = [
+            {"action": "lookup", "job_number": job_number, "columns": columns}
+            for job_number in args.job_numbers
+        ]
+    elif args.action in ("create", "upsert"):
+        try:
+            job = parse_fields(args.fields)
+        except argparse.ArgumentTypeError as error:
+            parser.error(str(error))
+        commands = [{"action": args.action, **job}]
+    else:
+        commands = read_commands(sys.stdin)
+
+    succeeded = True
+    try:
+        for result in job_records.run_batch(
+            commands, getattr(args, "batch_size", JOURNAL_BATCH_SIZE)
+        ):
+            succeeded = print_result(result) and succeeded
+    finally:
+        job_records.close()
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
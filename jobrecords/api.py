@@ -0,0 +1,309 @@
+"""This module contains the JobRecords class, which generates job numbers,
+looks up jobs and creates or updates jobs without the GUI."""
+
+import itertools
+from typing import Iterable, Iterator
+
+from config import (
+    ACTIVE_DB_COLUMN_ORDER,
+    COMPACT_JOB_NUMBER_STORAGE,
+    DATABASE_PATH,
+    EXISTING_DB_COLUMN_ORDER,
+    JOB_NUMBER_SNAPSHOT_PATH,
+    JOURNAL_BATCH_SIZE,
+)
+from helpers.compact_job_number_storage import CompactJobNumbers
+from helpers.database_connector import (
+    EXISTING_LOOKUP_COLUMNS,
+    DatabaseConnection,
+    JobNumberTakenError,
+)
+from helpers.job_number_generator import JobNumberGenerator
+from helpers.job_number_reservation import JobNumberReservations
+from helpers.job_number_storage import JobNumbers
+from helpers.job_number_sync import JobNumberSynchronizer
+from helpers.parcel_cache import ParcelCache
+
+# Database files with these extensions are opened with SQLite instead of
+# the Access driver, e.g. for testing.
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+ACTIONS = ("generate", "lookup", "create", "upsert")
+DATABASE_COLUMNS = set(EXISTING_DB_COLUMN_ORDER + ACTIVE_DB_COLUMN_ORDER)
+
+
+def open_database(database_path: str = DATABASE_PATH) -> DatabaseConnection:
+    """Returns a connection to an Access database, or to a SQLite
+    database with the same tables if the path has a SQLite extension."""
+    if database_path.lower().endswith(SQLITE_EXTENSIONS):
+        from helpers.sqlite_database import SQLiteDatabaseConnection
+
+        return SQLiteDatabaseConnection(database_path)
+    return DatabaseConnection(database_path, parcel_cache=ParcelCache())
+
+
+class JobRecords:
+    """This class is the headless counterpart of the Controller. It uses
+    the same database connection, job number storage and generator, but
+    takes plain dictionaries instead of reading Tk widgets."""
+
+    def __init__(
+        self,
+        database: DatabaseConnection = None,
+        job_storage: JobNumbers = None,
+        look_up_parcels: bool = True,
+        snapshot_path: str = JOB_NUMBER_SNAPSHOT_PATH,
+    ):
+        """
+        Initializes the JobRecords object.
+
+        Args:
+            database (DatabaseConnection, optional): The database to use.
+                Defaults to the database at DATABASE_PATH.
+            job_storage (JobNumbers, optional): The job numbers to use.
+                Loaded from the database when first needed if not given.
+            look_up_parcels (bool, optional): Whether jobs without parcel
+                data get it from the county. If False, jobs are saved
+                with the values given only.
+            snapshot_path (str, optional): Where the job numbers are
+                cached between runs.
+        """
+        self.database = database or open_database()
+        if job_storage is None:
+            job_storage = (
+                CompactJobNumbers()
+                if COMPACT_JOB_NUMBER_STORAGE
+                else JobNumbers()
+            )
+            self.job_numbers_loaded = False
+        else:
+            self.job_numbers_loaded = True
+        self.job_storage = job_storage
+        self.job_generator = JobNumberGenerator(self.job_storage)
+        self.reservations = JobNumberReservations(
+            self.database, self.job_storage
+        )
+        self.look_up_parcels = look_up_parcels
+        self.snapshot_path = snapshot_path
+
+    def close(self) -> None:
+        """Closes the database connections."""
+        self.database.close()
+
+    def load_job_numbers(self) -> None:
+        """Brings the job numbers up to date with the database, once."""
+        if self.job_numbers_loaded:
+            return
+        JobNumberSynchronizer(
+            self.database, self.job_storage, self.snapshot_path
+        ).sync()
+        self.job_numbers_loaded = True
+
+    def generate_job_number(self) -> str:
+        """Returns the next unused job number, reserved in the database
+        so no workstation hands it out too."""
+        self.load_job_numbers()
+        unused_job_number = self.job_generator.unused_job_number
+        job_number = self.reservations.reserve_job_number(
+            unused_job_number[:4], int(unused_job_number[4:])
+        )
+        # Counted as used from now on, so the next call returns another.
+        self.job_storage.add_current_year_job_numbers([(job_number,)])
+        return job_number
+
+    def lookup_job(
+        self, job_number: str, columns: tuple[str, ...] = None
+    ) -> dict | None:
+        """
+        Returns an Existing Jobs row as a dictionary, or None if there is
+        no such job.
+
+        Args:
+            job_number (str): The job to look up.
+            columns (tuple[str, ...], optional): The columns to return.
+                Defaults to the columns the GUI shows.
+        """
+        record = self.database.get_existing_job(
+            job_number, columns or EXISTING_LOOKUP_COLUMNS
+        )
+        return None if record is None else record._asdict()
+
+    def create_job(self, job: dict, parcel_data: dict = None) -> dict:
+        """
+        Creates a job and returns the values written. A job number is
+        generated if the job has none. Raises JobNumberTakenError if the
+        job number already belongs to another job.
+
+        Args:
+            job (dict): The job's values, keyed by column, e.g.
+                {"parcel_id": ..., "entry_by": ...}.
+            parcel_data (dict, optional): Parcel data that was already
+                looked up.
+        """
+        self.load_job_numbers()
+        job = dict(job)
+        if not job.get("job_number"):
+            job["job_number"] = self.generate_job_number()
+        return self.save_job(job, parcel_data, allow_update=False)
+
+    def upsert_job(self, job: dict, parcel_data: dict = None) -> dict:
+        """Creates a job, or updates it if its job number already exists,
+        and returns the values written. Only the columns given are
+        rewritten in a job that is updated."""
+        self.load_job_numbers()
+        if not job.get("job_number"):
+            raise ValueError("A job number is needed to update a job.")
+        return self.save_job(
+            dict(job),
+            parcel_data,
+            allow_update=True,
+            changed_fields=set(job) - {"job_number", "parcel_data"},
+        )
+
+    def save_job(
+        self,
+        job: dict,
+        parcel_data: dict,
+        allow_update: bool,
+        changed_fields: Iterable[str] = None,
+    ) -> dict:
+        """Writes a job to both tables, using the stored job numbers to
+        choose between inserting and updating. Only the changed fields
+        are rewritten in a job that is updated, if they are given. The
+        parcel is only looked up if the job has a parcel ID."""
+        if parcel_data is None:
+            parcel_data = job.pop("parcel_data", None)
+        unknown_columns = set(job) - DATABASE_COLUMNS
+        if unknown_columns:
+            raise ValueError(
+                f"Unknown columns: {', '.join(sorted(unknown_columns))}"
+            )
+
+        job_number = job["job_number"]
+        in_existing_jobs = (
+            job_number in self.job_storage.get_existing_job_numbers()
+        )
+        if in_existing_jobs and not allow_update:
+            raise JobNumberTakenError(
+                f"Job number {job_number} is already taken."
+            )
+        if parcel_data is None and (
+            not self.look_up_parcels or not job.get("parcel_id")
+        ):
+            parcel_data = {}
+        parcel_data = self.database.insert_new_job(
+            job,
+            parcel_data,
+            allow_update=allow_update,
+            in_existing_jobs=in_existing_jobs,
+            in_active_jobs=(
+                job_number in self.job_storage.get_active_job_numbers()
+            ),
+            # Also used if the job turns out to exist after all.
+            changed_fields=changed_fields,
+        )
+        self.job_storage.add_job_number(job_number)
+        return parcel_data
+
+    def run(self, command: dict) -> dict:
+        """
+        Runs one command and returns its result. A command is a
+        dictionary with an "action" of "generate", "lookup", "create" or
+        "upsert" (the default), and the job's values, e.g.
+        {"action": "create", "parcel_id": "...", "entry_by": "AB"}.
+        """
+        command = dict(command)
+        action = command.pop("action", "upsert")
+        if action == "generate":
+            return {"job_number": self.generate_job_number()}
+        if action == "lookup":
+            columns = command.get("columns")
+            job = self.lookup_job(
+                command["job_number"], tuple(columns) if columns else None
+            )
+            return {"job_number": command["job_number"], "job": job}
+        if action == "create":
+            return {"job": self.create_job(command)}
+        if action == "upsert":
+            return {"job": self.upsert_job(command)}
+        raise ValueError(
+            f"Unknown action {action!r}; expected one of {', '.join(ACTIONS)}"
+        )
+
+    def run_batch(
+        self,
+        commands: Iterable[dict],
+        batch_size: int = JOURNAL_BATCH_SIZE,
+    ) -> Iterator[dict]:
+        """
+        Runs commands a batch at a time, committing each batch once, and
+        yields a result for every command in order. A command that fails
+        on its own, e.g. because its job number is taken, yields an error
+        and the rest of its batch still runs. If a batch cannot be
+        committed, every command in it yields the error.
+
+        Args:
+            commands (Iterable[dict]): The commands to run, see run().
+                An exception in their place, e.g. for a line that could
+                not be read, is reported as that command's error.
+            batch_size (int, optional): Commands committed together.
+        """
+        commands = iter(commands)
+        while True:
+            batch = list(itertools.islice(commands, batch_size))
+            if not batch:
+                return
+            # Parcels are looked up before the transaction starts, so a
+            # slow county site does not hold the database connection.
+            batch = [self.with_parcel_data(command) for command in batch]
+            results = []
+            try:
+                with self.database.transaction():
+                    for command in batch:
+                        if isinstance(command, Exception):
+                            results.append(
+                                {"ok": False, "error": str(command)}
+                            )
+                        else:
+                            results.append(self.run_command(command))
+            except Exception as error:
+                # The transaction was rolled back, so none of the batch
+                # was written, and the job numbers it stored are reloaded.
+                self.job_storage.clear_job_numbers()
+                self.job_numbers_loaded = False
+                results = [
+                    {"ok": False, "error": str(error)} for _ in batch
+                ]
+            yield from results
+
+    def with_parcel_data(
+        self, command: dict | Exception
+    ) -> dict | Exception:
+        """Returns a copy of a command that creates or updates a job with
+        its parcel data looked up, or the error if the lookup failed."""
+        if isinstance(command, Exception):
+            return command
+        if (
+            command.get("action", "upsert") not in ("create", "upsert")
+            or not self.look_up_parcels
+            or "parcel_data" in command
+            or not command.get("parcel_id")
+        ):
+            return command
+        try:
+            parcel_data = self.database.fetch_parcel_data(
+                command["parcel_id"]
+            )
+        except Exception as error:
+            return error
+        return {**command, "parcel_data": parcel_data}
+
+    def run_command(self, command: dict) -> dict:
+        """Runs one command and returns its result, with "ok" set to
+        False and the error if the command failed on its own."""
+        try:
+            return {"ok": True, **self.run(command)}
+        except KeyError as error:
+            return {"ok": False, "error": f"Missing field {error}"}
+        except (JobNumberTakenError, ValueError) as error:
+            return {"ok": False, "error": str(error)}
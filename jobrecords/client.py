@@ -0,0 +1,171 @@
+"""This module contains the JobRecordsClient class, which talks to a
+running job records service. It offers the DatabaseConnection methods the
+window and the journal flusher use, so either can be given a client in
+place of a database connection."""
+
+import contextlib
+import json
+import urllib.error
+import urllib.request
+from typing import Iterable, Iterator
+from urllib.parse import quote, urlencode
+
+from config import SERVICE_TIMEOUT_SECONDS
+from helpers.database_connector import (
+    EXISTING_LOOKUP_COLUMNS,
+    JobNumberTakenError,
+)
+from helpers.job_search import SearchResult
+from helpers.records import record_type
+from helpers.sql_statements import EXISTING_JOBS
+
+
+class ServiceError(Exception):
+    """Raised when the job records service fails a request."""
+
+
+class JobRecordsClient:
+    """This class sends requests to a job records service. Errors reaching
+    the service are raised as OSError, so callers can retry them like a
+    database that cannot be reached."""
+
+    def __init__(self, url: str, timeout: float = SERVICE_TIMEOUT_SECONDS):
+        """
+        Initializes the JobRecordsClient object.
+
+        Args:
+            url (str): The service's address, e.g.
+                "http://127.0.0.1:8765".
+            timeout (float, optional): Seconds to wait for a response.
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, body=None) -> dict | None:
+        """
+        Sends a request and returns the response's JSON body, or None if
+        the service found nothing.
+
+        Raises:
+            JobNumberTakenError: A job number belongs to another job.
+            ValueError: The service rejected the request.
+            ServiceError: The service failed to answer the request.
+        """
+        data = None
+        headers = {}
+        if body is not None:
+            data = json.dumps(body, default=str).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        request = urllib.request.Request(
+            self.url + path, data=data, headers=headers, method=method
+        )
+        try:
+            with urllib.request.urlopen(
+                request, timeout=self.timeout
+            ) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            try:
+                message = json.loads(error.read())["error"]
+            except (ValueError, KeyError):
+                message = str(error)
+            if error.code == 404:
+                return None
+            if error.code == 409:
+                raise JobNumberTakenError(message) from None
+            if error.code == 400:
+                raise ValueError(message) from None
+            raise ServiceError(message) from None
+
+    def health(self) -> dict:
+        """Returns whether the service has loaded its job numbers and
+        search index."""
+        return self.request("GET", "/health")
+
+    def job_numbers(self) -> tuple[list[str], list[str]]:
+        """Returns the existing and the active job numbers."""
+        response = self.request("GET", "/job-numbers")
+        return response["existing"], response["active"]
+
+    def generate_job_number(self) -> str:
+        """Returns a new job number, reserved by the service."""
+        return self.request("POST", "/job-numbers")["job_number"]
+
+    def get_existing_job(
+        self,
+        job_number: str,
+        columns: tuple[str, ...] = EXISTING_LOOKUP_COLUMNS,
+    ) -> tuple | None:
+        """Returns an Existing Jobs row as a record, or None if there is
+        no such job."""
+        response = self.request(
+            "GET",
+            f"/jobs/{quote(job_number, safe='')}?"
+            + urlencode({"columns": ",".join(columns)}),
+        )
+        if response is None:
+            return None
+        make_record = record_type(EXISTING_JOBS, tuple(columns))._make
+        return make_record(response["job"][column] for column in columns)
+
+    def search(self, query: str, limit: int = None) -> list[tuple]:
+        """Returns the jobs matching a search, best matches first."""
+        parameters = {"q": query}
+        if limit:
+            parameters["limit"] = limit
+        response = self.request("GET", "/search?" + urlencode(parameters))
+        return [SearchResult(**job) for job in response["jobs"]]
+
+    def fetch_parcel_data(self, parcel_id: str) -> dict:
+        """Returns the county parcel data for a parcel ID."""
+        response = self.request(
+            "GET", f"/parcels/{quote(parcel_id, safe='')}"
+        )
+        if response is None:
+            raise ValueError(f"Parcel {parcel_id} was not found.")
+        return response["parcel_data"]
+
+    def workload(self, recount: bool = False) -> dict:
+        """Returns the service's jobs per month and per status, see
+        WorkloadCounters.snapshot. The service counts the jobs again
+        first if recount is True."""
+        method = "POST" if recount else "GET"
+        return self.request(method, "/workload")["workload"]
+
+    def insert_new_job(
+        self,
+        user_inputs: dict,
+        parcel_data: dict = None,
+        allow_update: bool = True,
+        in_existing_jobs: bool = None,
+        in_active_jobs: bool = None,
+        changed_fields: Iterable[str] = None,
+    ) -> dict:
+        """Submits a job and returns the values written. The arguments
+        are those of DatabaseConnection.insert_new_job, except that the
+        service decides whether the job is already in each table."""
+        return self.request(
+            "POST",
+            "/jobs",
+            {
+                "user_inputs": user_inputs,
+                "parcel_data": parcel_data,
+                "allow_update": allow_update,
+                "changed_fields": (
+                    None if changed_fields is None else list(changed_fields)
+                ),
+            },
+        )["job"]
+
+    def run_batch(self, commands: list[dict]) -> list[dict]:
+        """Runs a list of commands on the service and returns a result for
+        each one, see JobRecords.run_batch."""
+        return self.request("POST", "/batch", list(commands))["results"]
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        # The service commits each submission on its own.
+        yield
+
+    def close(self) -> None:
+        """Nothing to close; each request uses its own connection."""
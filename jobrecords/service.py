@@ -0,0 +1,320 @@
+"""This module contains the JobRecordsService class, a long-running local
+HTTP service that owns the database connections, the job numbers, the
+parcel cache and the search index, so workstation windows can start
+without loading any of them. Requests and responses are JSON.
+
+Endpoints:
+    GET  /health                  Whether the service is up.
+    GET  /job-numbers             The existing and active job numbers.
+    POST /job-numbers             Reserve and return a new job number.
+    GET  /jobs/<job_number>       An Existing Jobs row; ?columns=a,b
+                                  chooses the columns.
+    POST /jobs                    Submit a job, as insert_new_job does.
+    POST /batch                   Run a list of commands, see JobRecords.
+    GET  /search?q=<query>        Jobs matching a search; &limit=<n>.
+    GET  /parcels/<parcel_id>     County parcel data.
+    GET  /workload                Jobs per month and per status.
+    POST /workload                Count the jobs again and return them.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from config import SERVICE_HOST, SERVICE_PORT
+from helpers.database_connector import JobNumberTakenError
+from helpers.instrumentation import metrics
+from helpers.job_search import JobSearchIndex
+
+from .api import JobRecords
+
+
+class JobRecordsService:
+    """This class answers the service's requests. Requests that change
+    the job numbers are run one at a time; lookups and searches run on
+    their own request threads."""
+
+    def __init__(
+        self, job_records: JobRecords, search_index: JobSearchIndex = None
+    ):
+        """
+        Initializes the JobRecordsService object.
+
+        Args:
+            job_records (JobRecords): The database and job numbers the
+                service works with.
+            search_index (JobSearchIndex, optional): The index searched.
+                Built from the database by warm_up() if not given.
+        """
+        self.job_records = job_records
+        self.search_index = search_index or JobSearchIndex()
+        self.lock = threading.Lock()
+
+    @property
+    def database(self):
+        return self.job_records.database
+
+    def warm_up(self) -> float:
+        """Loads the job numbers, the search index and the workload
+        counts, and returns the number of seconds it took."""
+        started_at = time.perf_counter()
+        with self.lock:
+            self.job_records.load_job_numbers()
+        if not self.search_index.ready.is_set():
+            self.search_index.load(self.database)
+        if not self.database.workload.built:
+            self.database.workload.build(self.database)
+        return time.perf_counter() - started_at
+
+    def health(self) -> dict:
+        """Returns whether the job numbers, search index and workload
+        counts are loaded."""
+        return {
+            "job_numbers_loaded": self.job_records.job_numbers_loaded,
+            "search_index_ready": self.search_index.ready.is_set(),
+            "workload_counted": self.database.workload.built,
+        }
+
+    def job_numbers(self) -> dict:
+        """Returns the existing and active job numbers."""
+        with self.lock:
+            self.job_records.load_job_numbers()
+            job_storage = self.job_records.job_storage
+            return {
+                "existing": sorted(job_storage.get_existing_job_numbers()),
+                "active": sorted(job_storage.get_active_job_numbers()),
+            }
+
+    def generate(self) -> dict:
+        """Reserves a new job number."""
+        with self.lock:
+            return {"job_number": self.job_records.generate_job_number()}
+
+    def lookup(self, job_number: str, columns: list[str] = None) -> dict:
+        """Returns an Existing Jobs row, or None if there is no such
+        job."""
+        job = self.job_records.lookup_job(
+            job_number, tuple(columns) if columns else None
+        )
+        return None if job is None else {"job": job}
+
+    def search(self, query: str, limit: int = None) -> dict:
+        """Returns the jobs matching a search, best matches first."""
+        return {
+            "jobs": [
+                job._asdict()
+                for job in self.search_index.search(query, limit)
+            ]
+        }
+
+    def parcel(self, parcel_id: str) -> dict:
+        """Returns the county parcel data of a parcel, from the parcel
+        cache when it has it."""
+        return {"parcel_data": self.database.fetch_parcel_data(parcel_id)}
+
+    def workload(self, recount: bool = False) -> dict:
+        """Returns the jobs per month and per status, counting the jobs
+        first if they have not been counted or a recount is asked for.
+        Jobs written through the service keep the counts current."""
+        workload = self.database.workload
+        if recount or not workload.built:
+            workload.build(self.database)
+        return {"workload": workload.snapshot()}
+
+    def recount_workload(self) -> dict:
+        """Counts the jobs again, e.g. after jobs were written without
+        the service, and returns the counts."""
+        return self.workload(recount=True)
+
+    def submit(self, submission: dict) -> dict:
+        """
+        Writes a job submitted from a window and returns the values
+        written. The submission holds the arguments of insert_new_job.
+        Whether the job is already in each table is decided by the
+        service's job numbers, which are more current than the window's.
+        """
+        user_inputs = submission["user_inputs"]
+        parcel_data = submission.get("parcel_data")
+        if (
+            parcel_data is None
+            and self.job_records.look_up_parcels
+            and user_inputs.get("parcel_id")
+        ):
+            # Looked up before taking the lock, so a slow county site
+            # does not hold up other submissions.
+            parcel_data = self.database.fetch_parcel_data(
+                user_inputs["parcel_id"]
+            )
+        with self.lock:
+            self.job_records.load_job_numbers()
+            parcel_data = self.job_records.save_job(
+                dict(user_inputs),
+                parcel_data,
+                allow_update=submission.get("allow_update", True),
+                changed_fields=submission.get("changed_fields"),
+            )
+        self.search_index.add_job(parcel_data)
+        return {"job": parcel_data}
+
+    def batch(self, commands: list[dict]) -> dict:
+        """Runs a list of commands and returns a result for each one."""
+        if not isinstance(commands, list):
+            raise ValueError("Expected a list of commands.")
+        commands = [
+            command
+            if isinstance(command, dict)
+            else ValueError("Expected a JSON object.")
+            for command in commands
+        ]
+        with self.lock:
+            results = list(self.job_records.run_batch(commands))
+        for command, result in zip(commands, results):
+            if (
+                result["ok"]
+                and command.get("action", "upsert") in ("create", "upsert")
+            ):
+                self.search_index.add_job(result["job"])
+        return {"results": results}
+
+
+class JobRecordsRequestHandler(BaseHTTPRequestHandler):
+    """This class turns HTTP requests into calls to the service, and
+    their results or errors into JSON responses."""
+
+    server_version = "JobRecords/1.0"
+
+    @property
+    def service(self) -> JobRecordsService:
+        return self.server.service
+
+    def do_GET(self) -> None:
+        resource, argument, query = self.parse_path()
+        if resource == "health":
+            self.respond(self.service.health)
+        elif resource == "job-numbers" and argument is None:
+            self.respond(self.service.job_numbers)
+        elif resource == "jobs" and argument:
+            columns = query.get("columns", [None])[0]
+            self.respond(
+                self.service.lookup,
+                argument,
+                columns.split(",") if columns else None,
+            )
+        elif resource == "search":
+            limit = query.get("limit", [None])[0]
+            self.respond(
+                self.service.search,
+                query.get("q", [""])[0],
+                int(limit) if limit and limit.isdigit() else None,
+            )
+        elif resource == "parcels" and argument:
+            self.respond(self.service.parcel, argument)
+        elif resource == "workload" and argument is None:
+            self.respond(self.service.workload)
+        else:
+            self.send_json(404, {"ok": False, "error": "Not found"})
+
+    def do_POST(self) -> None:
+        resource, argument, _ = self.parse_path()
+        routes = {
+            "job-numbers": self.service.generate,
+            "jobs": self.service.submit,
+            "batch": self.service.batch,
+            "workload": self.service.recount_workload,
+        }
+        if resource not in routes or argument is not None:
+            self.send_json(404, {"ok": False, "error": "Not found"})
+            return
+        if resource in ("job-numbers", "workload"):
+            self.respond(routes[resource])
+            return
+        try:
+            body = self.read_json()
+        except ValueError as error:
+            self.send_json(400, {"ok": False, "error": str(error)})
+            return
+        self.respond(routes[resource], body)
+
+    def parse_path(self) -> tuple[str, str | None, dict]:
+        """Returns the resource, the decoded argument after it if any,
+        and the query parameters of the request path."""
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/", 1)
+        argument = unquote(parts[1]) if len(parts) > 1 else None
+        return parts[0], argument, parse_qs(url.query)
+
+    def read_json(self):
+        """Returns the request's JSON body."""
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Invalid JSON: {error}") from error
+
+    def respond(self, method, *args) -> None:
+        """Calls a service method and sends its result, or the error it
+        raised with a matching status code."""
+        with metrics.timed(f"service.{method.__name__}"):
+            try:
+                result = method(*args)
+            except JobNumberTakenError as error:
+                self.send_json(409, {"ok": False, "error": str(error)})
+                return
+            except (KeyError, TypeError, ValueError) as error:
+                self.send_json(400, {"ok": False, "error": str(error)})
+                return
+            except Exception as error:
+                print(error)
+                self.send_json(500, {"ok": False, "error": str(error)})
+                return
+        if result is None:
+            self.send_json(404, {"ok": False, "error": "Not found"})
+        else:
+            self.send_json(200, {"ok": True, **result})
+
+    def send_json(self, status: int, body: dict) -> None:
+        """Sends a JSON response."""
+        content = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args) -> None:
+        # Requests are timed in the metrics instead of logged one by one.
+        pass
+
+
+def create_server(
+    service: JobRecordsService,
+    host: str = SERVICE_HOST,
+    port: int = SERVICE_PORT,
+) -> ThreadingHTTPServer:
+    """Returns an HTTP server for the service, each request answered on
+    its own thread. Port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), JobRecordsRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(
+    service: JobRecordsService,
+    host: str = SERVICE_HOST,
+    port: int = SERVICE_PORT,
+) -> None:
+    """Warms up the service and answers requests until interrupted."""
+    seconds = service.warm_up()
+    print(f"Job numbers and search index loaded in {seconds:.1f} s")
+    server = create_server(service, host, port)
+    print(f"Serving job records on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.job_records.close()
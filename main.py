@@ -1,10 +1,29 @@
 """This module contains the main function for the Red Stake File Entry
 application."""
-import ttkbootstrap as ttk
+import time
 
-from config import WINDOW_HEIGHT, WINDOW_WIDTH
-from helpers import gui_creation as gui
-from helpers.controller import Controller
+# Taken before the other imports, so time to first paint includes them.
+STARTED_AT = time.perf_counter()
+
+import ttkbootstrap as ttk  # noqa: E402
+
+from config import (  # noqa: E402
+    ACTIVE_DB_COLUMN_NAMES,
+    ACTIVE_JOBS_BROWSER_COLUMNS,
+    EXISTING_DB_COLUMN_NAMES,
+    METRICS_DUMP_PATH,
+    METRICS_LOG_PATH,
+    SEARCH_COLUMNS,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+)
+from helpers import gui_creation as gui  # noqa: E402
+from helpers.autocomplete_dropdown import AutocompleteDropdown  # noqa: E402
+from helpers.controller import Controller  # noqa: E402
+from helpers.instrumentation import configure_logging, metrics  # noqa: E402
+
+# Buttons that need the job numbers, which load after the window opens.
+DATA_BUTTONS = ("Submit", "Generate FN", "Gather Info")
 
 
 def create_input_fields(app: ttk.Window, controller: Controller) -> None:
@@ -39,11 +58,27 @@ def create_input_fields(app: ttk.Window, controller: Controller) -> None:
     controller.input_storage.add_inputs(single_line_input_objects)
     controller.input_storage.add_inputs(multi_line_input_objects)
 
+    parcel_id_entry = single_line_input_objects["parcel_id"]
+    parcel_id_entry.bind("<KeyRelease>", controller.schedule_parcel_prefetch)
+    parcel_id_entry.bind("<FocusOut>", controller.schedule_parcel_prefetch)
+
+    AutocompleteDropdown(
+        single_line_input_objects["job_number"],
+        controller.job_number_completions.complete,
+        on_select=lambda job_number: controller.retrieve_existing_job_data(),
+    )
+    AutocompleteDropdown(
+        parcel_id_entry,
+        controller.parcel_id_completions.complete,
+        on_select=lambda parcel_id: controller.schedule_parcel_prefetch(),
+    )
+
 
 def create_buttons_and_commands(
     app: ttk.Window, controller: Controller
-) -> None:
-    """Creates buttons and assigns their commands."""
+) -> dict:
+    """Creates buttons and assigns their commands. Returns the buttons
+    keyed by label."""
     buttons_and_commands = {
         "Submit": controller.submit_user_input,
         "Generate FN": controller.update_job_number_display,
@@ -51,7 +86,82 @@ def create_buttons_and_commands(
         "Clear": controller.clear_input_fields,
     }
 
-    gui.create_buttons(app, buttons_and_commands)
+    buttons = gui.create_buttons(app, buttons_and_commands)
+    gui.create_buttons(
+        app,
+        {
+            "Search Jobs": lambda: open_search_window(app, controller),
+            "Active Jobs": lambda: open_active_jobs_window(app, controller),
+            "Workload": lambda: open_workload_window(app, controller),
+        },
+    )
+    return buttons
+
+
+def open_search_window(app: ttk.Window, controller: Controller) -> None:
+    """Opens the window used to search existing jobs."""
+    search_headings = {
+        column: EXISTING_DB_COLUMN_NAMES[column] for column in SEARCH_COLUMNS
+    }
+    _, search_entry, search_results = gui.create_search_window(
+        app, search_headings
+    )
+    controller.set_search_widgets(search_entry, search_results)
+
+    search_entry.bind("<KeyRelease>", controller.schedule_search)
+    search_results.bind("<Double-1>", controller.select_search_result)
+    search_results.bind("<Return>", controller.select_search_result)
+
+
+def open_active_jobs_window(app: ttk.Window, controller: Controller) -> None:
+    """Opens the window used to browse the Active Jobs."""
+    headings = {
+        column: ACTIVE_DB_COLUMN_NAMES[column]
+        for column in ACTIVE_JOBS_BROWSER_COLUMNS
+    }
+    filters = {
+        "inhouse_status": "Inhouse",
+        "invoice_status": "Invoice",
+        "fieldwork_date_from": "Fieldwork from",
+        "fieldwork_date_to": "to",
+    }
+    (
+        _,
+        filter_entries,
+        filter_button,
+        table,
+        scrollbar,
+        count_label,
+    ) = gui.create_active_jobs_window(app, headings, filters)
+    controller.set_active_jobs_widgets(
+        table, scrollbar, count_label, filter_entries
+    )
+
+    filter_button.config(command=controller.filter_active_jobs)
+    for entry in filter_entries.values():
+        entry.bind("<Return>", controller.filter_active_jobs)
+
+
+def open_workload_window(app: ttk.Window, controller: Controller) -> None:
+    """Opens the dashboard of jobs per month and per status."""
+    tables = {
+        "jobs_per_month": "Month Opened",
+        "inhouse_status": "Inhouse Status",
+        "invoice_status": "Invoice Status",
+    }
+    _, workload_tables, recount_button, label = gui.create_workload_window(
+        app, tables
+    )
+    controller.set_workload_widgets(workload_tables, label, recount_button)
+
+
+def create_status_label(app: ttk.Window) -> ttk.Label:
+    """Creates a label for status messages, such as when background work
+    is running."""
+    status_label = ttk.Label(app, text="")
+    status_label.pack(pady=5)
+    status_label.config(font=("Arial", 12))
+    return status_label
 
 
 def configure_main_window(app: ttk.Window) -> None:
@@ -61,6 +171,22 @@ def configure_main_window(app: ttk.Window) -> None:
     label.config(font=("Arial", 20, "bold"))
 
 
+def report_time_to_first_paint(app: ttk.Window) -> None:
+    """Records the time from start up until the window is first drawn."""
+
+    def on_map(event) -> None:
+        if event.widget is not app:
+            return
+        app.unbind("<Map>")
+        # Idle tasks run once the mapped window has been drawn.
+        app.after_idle(record_time_to_first_paint)
+
+    def record_time_to_first_paint() -> None:
+        metrics.record("startup.first_paint", time.perf_counter() - STARTED_AT)
+
+    app.bind("<Map>", on_map)
+
+
 def initialize_app() -> None:
     """
     Initializes the main application window, creates input fields and
@@ -72,19 +198,48 @@ def initialize_app() -> None:
     UserInputStorage object for further processing.
     """
 
-    controller = Controller()
+    if METRICS_LOG_PATH:
+        configure_logging(METRICS_LOG_PATH)
 
     app = ttk.Window(
         maxsize=(WINDOW_WIDTH, WINDOW_HEIGHT),
         minsize=(WINDOW_WIDTH, WINDOW_HEIGHT),
     )
+    report_time_to_first_paint(app)
+
+    # Creating the controller does not touch the database; the job
+    # numbers are loaded in the background once the window is up.
+    controller = Controller()
 
     configure_main_window(app)
     create_input_fields(app, controller)
-    create_buttons_and_commands(app, controller)
+    buttons = create_buttons_and_commands(app, controller)
+    controller.start_worker(
+        app,
+        create_status_label(app),
+        data_buttons=[buttons[label] for label in DATA_BUTTONS],
+        queue_label=create_status_label(app),
+    )
+    app.bind("<Escape>", lambda event: controller.cancel_background_tasks())
+    app.bind("<Control-f>", lambda event: open_search_window(app, controller))
+    app.bind(
+        "<Control-j>", lambda event: open_active_jobs_window(app, controller)
+    )
+    app.bind(
+        "<Control-d>", lambda event: open_workload_window(app, controller)
+    )
 
     app.mainloop()
 
+    # Anything not yet written stays in the journal for the next start.
+    controller.journal_flusher.stop(timeout=5)
+
+    if METRICS_DUMP_PATH:
+        try:
+            metrics.dump(METRICS_DUMP_PATH)
+        except OSError as error:
+            print(error)
+
 
 def main() -> None:
     initialize_app()
@@ -0,0 +1,133 @@
+import random
+import unittest
+
+from config import ACTIVE_DB_COLUMN_ORDER, EXISTING_DB_COLUMN_ORDER
+from helpers.active_job_pages import ActiveJobPages
+from helpers.sqlite_database import SQLiteDatabaseConnection
+
+STATUSES = ["Drafting", "Field", "Done", None]
+
+
+def expected_order(jobs, sort_column, descending=False):
+    """Sorts jobs as the database does: nulls first in ascending order
+    and last in descending order, ties broken by job number."""
+
+    def key(job):
+        value = job[sort_column]
+        return (value is not None, value or "", job["job_number"])
+
+    return sorted(jobs, key=key, reverse=descending)
+
+
+class TestActiveJobPages(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = SQLiteDatabaseConnection()
+        generator = random.Random(7)
+        cls.jobs = []
+        for sequence in range(500):
+            job = dict.fromkeys(
+                EXISTING_DB_COLUMN_ORDER + ACTIVE_DB_COLUMN_ORDER
+            )
+            job["job_number"] = f"2301{sequence:04d}"
+            job["inhouse_status"] = generator.choice(STATUSES)
+            job["invoice_status"] = generator.choice(STATUSES)
+            if generator.random() < 0.8:
+                day = generator.randint(1, 28)
+                job["fieldwork_date"] = f"2023-01-{day:02d}"
+            cls.jobs.append(job)
+        generator.shuffle(cls.jobs)
+        cls.database.insert_jobs(cls.jobs)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.database.close()
+
+    def setUp(self):
+        self.pages = ActiveJobPages(
+            self.database,
+            ("job_number", "inhouse_status"),
+            page_size=7,
+            max_cached_pages=3,
+        )
+
+    def job_numbers(self, rows):
+        return [row.job_number for row in rows]
+
+    def test_every_order(self):
+        for sort_column in ("job_number", "inhouse_status", "fieldwork_date"):
+            for descending in (False, True):
+                with self.subTest(sort_column, descending=descending):
+                    self.pages.set_query(sort_column, descending)
+                    expected = [
+                        job["job_number"]
+                        for job in expected_order(
+                            self.jobs, sort_column, descending
+                        )
+                    ]
+                    self.assertEqual(self.pages.count(), 500)
+                    self.assertEqual(
+                        self.job_numbers(self.pages.rows(0, 600)), expected
+                    )
+
+    def test_jump_to_position(self):
+        self.pages.set_query("fieldwork_date", descending=True)
+        expected = expected_order(self.jobs, "fieldwork_date", True)
+        rows = self.pages.rows(400, 420)
+        self.assertEqual(
+            self.job_numbers(rows),
+            [job["job_number"] for job in expected[400:420]],
+        )
+        # Only the pages holding the rows were read in full.
+        self.assertLessEqual(len(self.pages.pages), 3)
+        self.assertEqual(self.pages.cached_rows(400, 420), rows)
+        # Earlier pages can be read again from their known positions.
+        self.assertEqual(
+            self.job_numbers(self.pages.rows(10, 12)),
+            [job["job_number"] for job in expected[10:12]],
+        )
+
+    def test_filters(self):
+        self.pages.set_query(
+            "fieldwork_date",
+            filters=[
+                ("inhouse_status", "=", "Drafting"),
+                ("fieldwork_date", ">=", "2023-01-15"),
+            ],
+        )
+        expected = [
+            job["job_number"]
+            for job in expected_order(self.jobs, "fieldwork_date")
+            if job["inhouse_status"] == "Drafting"
+            and job["fieldwork_date"]
+            and job["fieldwork_date"] >= "2023-01-15"
+        ]
+        self.assertEqual(self.pages.count(), len(expected))
+        self.assertEqual(
+            self.job_numbers(self.pages.rows(0, 500)), expected
+        )
+
+    def test_cached_rows_missing(self):
+        self.assertIsNone(self.pages.cached_rows(0, 5))
+        self.pages.rows(0, 5)
+        self.assertEqual(len(self.pages.cached_rows(0, 5)), 5)
+        self.pages.set_query("invoice_status")
+        self.assertIsNone(self.pages.cached_rows(0, 5))
+
+    def test_past_the_end(self):
+        self.assertEqual(self.pages.rows(495, 510), self.pages.rows(495, 500))
+        self.assertEqual(self.pages.rows(600, 610), [])
+
+    def test_invalid_query(self):
+        with self.assertRaises(ValueError):
+            self.pages.set_query("parcel_id")
+        with self.assertRaises(ValueError):
+            self.pages.set_query(filters=[("county", "=", "Lee")])
+        with self.assertRaises(ValueError):
+            self.pages.set_query(
+                filters=[("inhouse_status", "; DROP", "Lee")]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
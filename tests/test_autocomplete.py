@@ -0,0 +1,68 @@
+import unittest
+
+from helpers.autocomplete import PrefixIndex
+
+example_job_numbers = ["23010100", "23010101", "23020100", "99121259"]
+
+
+class MockDatabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def stream_query(self, query, parameters=None, batch_size=1000):
+        self.queries.append(query)
+
+        def fetch_batches():
+            for start in range(0, len(self.rows), batch_size):
+                yield self.rows[start:start + batch_size]
+
+        return (), fetch_batches()
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex(example_job_numbers)
+
+    def test_complete(self):
+        self.assertEqual(
+            self.index.complete("2301"), ["23010100", "23010101"]
+        )
+        self.assertEqual(self.index.complete("99"), ["99121259"])
+        self.assertEqual(self.index.complete("5"), [])
+        self.assertEqual(self.index.complete(""), [])
+
+    def test_complete_limit(self):
+        self.assertEqual(
+            self.index.complete("2", limit=2), ["23010100", "23010101"]
+        )
+
+    def test_add(self):
+        self.index.add("23010150")
+        self.index.add("23010150")
+        self.index.add(None)
+        self.assertEqual(len(self.index), 5)
+        self.assertIn("23010150", self.index)
+        self.assertEqual(
+            self.index.complete("230101"),
+            ["23010100", "23010101", "23010150"],
+        )
+
+    def test_update(self):
+        self.index.update(["23030100", " 23010100 ", "", None])
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.index.values, sorted(self.index.values))
+        self.assertEqual(self.index.complete("2303"), ["23030100"])
+
+    def test_load(self):
+        database = MockDatabase([("12-34",), ("56-78",), (None,), ("12-34",)])
+        index = PrefixIndex()
+        self.assertEqual(
+            index.load(database, "Existing Jobs", "parcel_id", 2), 2
+        )
+        self.assertIn("[Parcel ID]", database.queries[0])
+        self.assertEqual(index.complete("12"), ["12-34"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+
+from helpers.background_worker import BackgroundWorker
+
+
+class MockScheduler:
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, milliseconds, callback):
+        self.callbacks.append(callback)
+
+    def run_until_idle(self, worker, timeout=2):
+        deadline = time.monotonic() + timeout
+        while self.callbacks and time.monotonic() < deadline:
+            time.sleep(0.01)
+            self.callbacks.pop(0)()
+        return not worker.busy
+
+
+class TestBackgroundWorker(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = MockScheduler()
+        self.busy_states = []
+        self.worker = BackgroundWorker(
+            self.scheduler, on_busy_change=self.busy_states.append
+        )
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def test_result_delivered_on_poll(self):
+        results = []
+        self.worker.submit("add", sum, [1, 2], on_success=results.append)
+        self.assertTrue(self.scheduler.run_until_idle(self.worker))
+        self.assertEqual(results, [3])
+        self.assertEqual(self.busy_states, [True, False])
+
+    def test_error_delivered_on_poll(self):
+        errors = []
+        self.worker.submit("fail", int, "x", on_error=errors.append)
+        self.assertTrue(self.scheduler.run_until_idle(self.worker))
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_repeated_submits_are_coalesced(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            release.wait(2)
+
+        self.assertIsNotNone(self.worker.submit("slow", slow_call))
+        self.assertIsNone(self.worker.submit("slow", slow_call))
+        release.set()
+        self.assertTrue(self.scheduler.run_until_idle(self.worker))
+        self.assertEqual(len(calls), 1)
+
+    def test_cancelled_task_skips_callbacks(self):
+        release = threading.Event()
+        results = []
+        self.worker.submit(
+            "slow", lambda: release.wait(2), on_success=results.append
+        )
+        self.worker.cancel("slow")
+        release.set()
+        self.assertFalse(self.worker.busy)
+        self.scheduler.run_until_idle(self.worker)
+        self.assertEqual(results, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from helpers.bulk_import import BulkImporter, read_rows
+from helpers.job_number_storage import JobNumbers
+
+
+class MockDatabase:
+    def __init__(self, failing_job_numbers=()):
+        self.failing_job_numbers = set(failing_job_numbers)
+        self.batches = []
+
+    def fetch_parcel_data(self, parcel_id):
+        if parcel_id == "bad":
+            raise ValueError("Parcel not found")
+        return {"county": "Lee", "subdivision": f"Subdivision {parcel_id}"}
+
+    def merge_user_inputs_into_parcel_data(self, user_inputs, parcel_data):
+        for column, value in user_inputs.items():
+            parcel_data.setdefault(column, value)
+
+    def insert_jobs(self, parcel_data_rows):
+        for row in parcel_data_rows:
+            if row["job_number"] in self.failing_job_numbers:
+                raise ValueError("Integrity error")
+        self.batches.append(parcel_data_rows)
+
+
+class TestBulkImporter(unittest.TestCase):
+    def test_rows_inserted_in_batches(self):
+        database = MockDatabase()
+        rows = [
+            {"job_number": f"2301{sequence:04d}", "parcel_id": "1"}
+            for sequence in range(5)
+        ]
+        report = BulkImporter(database, batch_size=2).import_rows(rows)
+
+        self.assertEqual(report.rows_read, 5)
+        self.assertEqual(report.rows_inserted, 5)
+        self.assertEqual([len(batch) for batch in database.batches], [2, 2, 1])
+        self.assertEqual(
+            database.batches[0][0]["subdivision"], "Subdivision 1"
+        )
+
+    def test_failures_do_not_abort_batch(self):
+        database = MockDatabase(failing_job_numbers=["23010002"])
+        job_storage = JobNumbers()
+        job_storage.add_existing_job_numbers([("23010003",)])
+        rows = [
+            {"job_number": "23010001", "parcel_id": "1"},
+            {"job_number": "23010002", "parcel_id": "1"},
+            {"job_number": "23010003", "parcel_id": "1"},
+            {"job_number": "23010004", "parcel_id": "bad"},
+            {"job_number": "", "parcel_id": "1"},
+            {"job_number": "23010006", "parcel_id": "1"},
+        ]
+        report = BulkImporter(database, job_storage).import_rows(rows)
+
+        self.assertEqual(report.rows_inserted, 2)
+        self.assertEqual(
+            [failure.row_number for failure in report.failures],
+            [3, 5, 4, 2],
+        )
+        self.assertIn("23010006", job_storage.get_existing_job_numbers())
+
+    def test_read_csv_rows(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "jobs.csv")
+            with open(csv_path, "w", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(["Job Number", "Parcel ID", "Unknown"])
+                writer.writerow(["23010001", "12-34", "x"])
+            rows = list(read_rows(csv_path))
+
+        self.assertEqual(
+            rows, [{"job_number": "23010001", "parcel_id": "12-34"}]
+        )
+
+    def test_exported_headings_and_unknown_columns(self):
+        database = MockDatabase()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "jobs.csv")
+            with open(csv_path, "w", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(
+                    [
+                        "Job Number",
+                        "Customer Contact Information",
+                        "Additional Information",
+                        "Notes",
+                    ]
+                )
+                writer.writerow(["23010001", "555-0100", "Gate code", "x"])
+            report = BulkImporter(
+                database, enrich_parcels=False
+            ).import_file(csv_path)
+
+        record = database.batches[0][0]
+        self.assertEqual(record["contact_info"], "555-0100")
+        self.assertEqual(record["additional_info"], "Gate code")
+        self.assertEqual(report.unknown_columns, ["Notes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
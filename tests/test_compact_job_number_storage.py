@@ -0,0 +1,75 @@
+import unittest
+
+from helpers.compact_job_number_storage import (
+    CompactJobNumbers,
+    JobNumberBitmap,
+)
+from helpers.job_number_storage import JobNumbers
+
+example_job_numbers = ["16030171", "23010111", "93121259"]
+
+
+class TestJobNumberBitmap(unittest.TestCase):
+    def test_add_and_discard(self):
+        bitmap = JobNumberBitmap(example_job_numbers)
+        self.assertEqual(len(bitmap), 3)
+        self.assertIn("23010111", bitmap)
+        self.assertNotIn("23010112", bitmap)
+
+        bitmap.discard("23010111")
+        self.assertNotIn("23010111", bitmap)
+        self.assertEqual(len(bitmap), 2)
+
+    def test_non_standard_job_numbers(self):
+        bitmap = JobNumberBitmap(["2301-A"])
+        self.assertIn("2301-A", bitmap)
+        self.assertEqual(set(bitmap), {"2301-A"})
+
+    def test_iteration_matches_set(self):
+        bitmap = JobNumberBitmap(example_job_numbers)
+        self.assertEqual(set(bitmap), set(example_job_numbers))
+        self.assertTrue(bitmap.issuperset(example_job_numbers[:2]))
+
+
+class TestCompactJobNumbers(unittest.TestCase):
+    def setUp(self):
+        self.job_numbers = CompactJobNumbers()
+
+    def test_add_job_number(self):
+        self.job_numbers.add_job_number(example_job_numbers[0])
+        self.assertIn(
+            example_job_numbers[0], self.job_numbers.get_existing_job_numbers()
+        )
+        self.assertIn(
+            example_job_numbers[0], self.job_numbers.get_active_job_numbers()
+        )
+
+    def test_highest_and_next_free_sequence(self):
+        self.job_numbers.add_current_year_job_numbers(
+            [("23010100",), ("23010101",), ("23010103",)]
+        )
+        self.assertEqual(self.job_numbers.highest_sequence("2301"), 103)
+        self.assertIsNone(self.job_numbers.highest_sequence("2302"))
+        self.assertEqual(self.job_numbers.next_free_sequence("2301", 100), 102)
+        self.assertEqual(self.job_numbers.next_free_sequence("2301", 103), 104)
+
+    def test_missing_sequences(self):
+        self.job_numbers.add_existing_job_numbers(
+            [("23010100",), ("23010103",), ("23010105",)]
+        )
+        self.assertEqual(
+            self.job_numbers.missing_sequences("2301"), [101, 102, 104]
+        )
+
+    def test_uses_less_memory(self):
+        job_numbers = [(f"2301{sequence:04d}",) for sequence in range(5000)]
+        regular_storage = JobNumbers()
+        regular_storage.add_existing_job_numbers(job_numbers)
+        self.job_numbers.add_existing_job_numbers(job_numbers)
+        self.assertLess(
+            self.job_numbers.memory_usage(), regular_storage.memory_usage()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
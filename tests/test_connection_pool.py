@@ -0,0 +1,116 @@
+import threading
+import unittest
+
+from helpers.connection_pool import ConnectionPool, PoolTimeoutError
+
+
+class MockConnection:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class MockConnector:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.connections = []
+
+    def connect(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Share unavailable")
+        connection = MockConnection()
+        self.connections.append(connection)
+        return connection
+
+
+def is_alive(connection):
+    return connection.alive
+
+
+class TestConnectionPool(unittest.TestCase):
+    def create_pool(self, connector, **kwargs):
+        kwargs.setdefault("connect_backoff", 0)
+        kwargs.setdefault("health_check_after", 0)
+        return ConnectionPool(connector.connect, is_alive, **kwargs)
+
+    def test_connections_are_lazy_and_reused(self):
+        connector = MockConnector()
+        pool = self.create_pool(connector)
+        self.assertEqual(connector.connections, [])
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        self.assertIs(first.connection, second.connection)
+        self.assertEqual(pool.stats["connects"], 1)
+        self.assertEqual(pool.stats["checkouts"], 2)
+
+    def test_dead_connection_replaced(self):
+        connector = MockConnector()
+        pool = self.create_pool(connector)
+        with pool.connection() as first:
+            pass
+        first.connection.alive = False
+
+        with pool.connection() as second:
+            pass
+        self.assertIsNot(first.connection, second.connection)
+        self.assertTrue(first.connection.closed)
+        self.assertEqual(pool.stats["health_check_failures"], 1)
+
+    def test_reconnect_with_backoff(self):
+        connector = MockConnector(failures=2)
+        pool = self.create_pool(connector, connect_retries=2)
+        with pool.connection():
+            pass
+        self.assertEqual(pool.stats["connect_failures"], 2)
+
+        connector.failures = 5
+        pool.close_all()
+        with self.assertRaises(ConnectionError):
+            pool.acquire()
+        self.assertEqual(pool.stats["size"], 0)
+
+    def test_failed_block_rolls_back(self):
+        pool = self.create_pool(MockConnector())
+        with self.assertRaises(ValueError):
+            with pool.connection() as connection:
+                raise ValueError
+        self.assertEqual(connection.connection.rollbacks, 1)
+        self.assertEqual(pool.stats["idle"], 1)
+
+    def test_max_size_and_timeout(self):
+        pool = self.create_pool(
+            MockConnector(), max_size=1, checkout_timeout=0.05
+        )
+        connection = pool.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire()
+
+        threading.Timer(0.01, pool.release, [connection]).start()
+        pool.checkout_timeout = 1
+        self.assertIs(pool.acquire(), connection)
+
+    def test_idle_connections_evicted(self):
+        connector = MockConnector()
+        pool = self.create_pool(connector, idle_timeout=0)
+        with pool.connection():
+            pass
+        with pool.connection():
+            pass
+        self.assertEqual(len(connector.connections), 2)
+        self.assertTrue(connector.connections[0].closed)
+        self.assertEqual(pool.stats["idle_evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import unittest
+
+from helpers.instrumentation import (
+    Metrics,
+    configure_logging,
+    instrumented,
+    logger,
+    metrics,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(sample_size=100)
+
+    def test_record_and_percentiles(self):
+        for milliseconds in range(1, 101):
+            self.metrics.record("db.execute_query", milliseconds / 1000, 2)
+        summary = self.metrics.to_dict()["db.execute_query"]
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["rows"], 200)
+        self.assertEqual(summary["p50_ms"], 50)
+        self.assertEqual(summary["p99_ms"], 99)
+        self.assertEqual(summary["max_ms"], 100)
+        self.assertEqual(summary["buckets"]["0.001"], 1)
+        self.assertEqual(summary["buckets"]["+Inf"], 0)
+
+    def test_timed(self):
+        with self.metrics.timed("parcel.lookup") as timing:
+            timing["rows"] = 3
+        with self.assertRaises(ValueError):
+            with self.metrics.timed("parcel.lookup"):
+                raise ValueError("County site is down")
+
+        summary = self.metrics.to_dict()["parcel.lookup"]
+        self.assertEqual(summary["count"], 2)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["rows"], 3)
+
+    def test_timed_generator_closed_early(self):
+        def generate():
+            with self.metrics.timed("db.stream_query"):
+                yield 1
+                yield 2
+
+        batches = generate()
+        next(batches)
+        batches.close()
+        summary = self.metrics.to_dict()["db.stream_query"]
+        self.assertEqual(summary["errors"], 0)
+
+    def test_to_prometheus(self):
+        self.metrics.record("db.execute_query", 0.003, 5)
+        self.metrics.record("db.execute_query", 20.0, error=True)
+        text = self.metrics.to_prometheus()
+        prefix = "job_record_manager_operation"
+        label = 'operation="db.execute_query"'
+        self.assertIn(f'{prefix}_seconds_bucket{{{label},le="0.001"}} 0', text)
+        self.assertIn(f'{prefix}_seconds_bucket{{{label},le="0.005"}} 1', text)
+        self.assertIn(f'{prefix}_seconds_bucket{{{label},le="+Inf"}} 2', text)
+        self.assertIn(f"{prefix}_seconds_count{{{label}}} 2", text)
+        self.assertIn(f"{prefix}_rows_total{{{label}}} 5", text)
+        self.assertIn(f"{prefix}_errors_total{{{label}}} 1", text)
+
+    def test_dump(self):
+        self.metrics.record("action.submit", 0.2)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "metrics.json")
+            prometheus_path = os.path.join(directory, "metrics.prom")
+            self.metrics.dump(json_path)
+            self.metrics.dump(prometheus_path)
+
+            with open(json_path, encoding="utf-8") as json_file:
+                self.assertIn("action.submit", json.load(json_file))
+            with open(prometheus_path, encoding="utf-8") as prometheus_file:
+                self.assertIn("# TYPE", prometheus_file.read())
+
+    def test_timing_log_rotated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "timings.log")
+            level = logger.level
+            handler = configure_logging(
+                log_path, max_bytes=500, backup_count=1
+            )
+            try:
+                for _ in range(50):
+                    self.metrics.record("db.execute_query", 0.001)
+            finally:
+                logger.removeHandler(handler)
+                logger.setLevel(level)
+                handler.close()
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                ["timings.log", "timings.log.1"],
+            )
+            self.assertLessEqual(os.path.getsize(log_path), 500)
+
+    def test_instrumented(self):
+        @instrumented("test.instrumented", count_rows=True)
+        def fetch_rows():
+            return [1, 2, 3]
+
+        metrics.reset()
+        self.assertEqual(fetch_rows(), [1, 2, 3])
+        summary = metrics.to_dict()["test.instrumented"]
+        self.assertEqual(summary["count"], 1)
+        self.assertEqual(summary["rows"], 3)
+        metrics.reset()
+
+
+if __name__ == "__main__":
+    unittest.main()
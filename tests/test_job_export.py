@@ -0,0 +1,85 @@
+import csv
+import datetime
+import os
+import tempfile
+import unittest
+
+from helpers.job_export import JobExporter
+
+example_rows = [
+    (datetime.date(2023, 1, 5), "23010105", "12-34"),
+    (datetime.date(2023, 1, 11), "23010111", None),
+    (datetime.date(2023, 2, 1), "23020100", "56-78"),
+]
+example_description = (
+    ("Job Date", datetime.date),
+    ("Job Number", str),
+    ("Parcel ID", str),
+)
+
+
+class MockDatabase:
+    def __init__(self):
+        self.queries = []
+        self.batch_sizes = []
+
+    def stream_query(self, query, parameters=None, batch_size=1000):
+        self.queries.append((query, parameters))
+
+        def fetch_batches():
+            for start in range(0, len(example_rows), batch_size):
+                self.batch_sizes.append(
+                    len(example_rows[start:start + batch_size])
+                )
+                yield example_rows[start:start + batch_size]
+
+        return example_description, fetch_batches()
+
+
+class TestJobExporter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database = MockDatabase()
+        self.exporter = JobExporter(self.database, batch_size=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_create_export_query(self):
+        query, parameters = JobExporter.create_export_query(
+            "existing",
+            job_number_prefix="2301",
+            start_date=datetime.date(2023, 1, 1),
+        )
+        self.assertEqual(
+            query,
+            "SELECT * FROM [Existing Jobs]"
+            " WHERE [Job Number] LIKE ? AND [Job Date] >= ?",
+        )
+        self.assertEqual(parameters, ("2301%", datetime.date(2023, 1, 1)))
+
+    def test_export_csv_in_batches(self):
+        file_path = os.path.join(self.temp_dir.name, "jobs.csv")
+        row_count = self.exporter.export("active", file_path)
+
+        self.assertEqual(row_count, 3)
+        self.assertEqual(self.database.batch_sizes, [2, 1])
+        with open(file_path, newline="") as csv_file:
+            rows = list(csv.reader(csv_file))
+        self.assertEqual(rows[0], ["Job Date", "Job Number", "Parcel ID"])
+        self.assertEqual(rows[2], ["2023-01-11", "23010111", ""])
+
+    def test_export_parquet(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+
+        file_path = os.path.join(self.temp_dir.name, "jobs.parquet")
+        self.assertEqual(self.exporter.export("existing", file_path), 3)
+        table = pq.read_table(file_path)
+        self.assertEqual(table.column("Job Number").to_pylist()[2], "23020100")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,14 @@ class MockJobNumberStorage(JobNumbers):
     def get_current_year_job_numbers(self):
         return self.job_numbers
 
+    def highest_sequence(self, prefix):
+        sequences = [
+            int(number[4:8])
+            for number in self.job_numbers
+            if number.startswith(prefix)
+        ]
+        return max(sequences, default=None)
+
 
 class TestJobNumberGenerator(unittest.TestCase):
     def test_get_job_number_prefix(self):
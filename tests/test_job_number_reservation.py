@@ -0,0 +1,165 @@
+import datetime
+import unittest
+
+from helpers.job_number_reservation import (
+    JobNumberReservationError,
+    JobNumberReservations,
+)
+from helpers.job_number_storage import JobNumbers
+
+
+class MockDatabase:
+    def __init__(self):
+        self.reservations = {}
+        self.job_numbers = []
+        self.round_trips = 0
+        self.table_created = 0
+
+    def create_reservation_table(self):
+        self.table_created += 1
+
+    def insert_reservation(self, block_start, workstation, now, expires_at):
+        self.round_trips += 1
+        if block_start in self.reservations:
+            return False
+        self.reservations[block_start] = (workstation, expires_at)
+        return True
+
+    def delete_expired_reservation(self, block_start, now):
+        self.round_trips += 1
+        if self.reservations[block_start][1] < now:
+            del self.reservations[block_start]
+            return True
+        return False
+
+    def delete_expired_reservations(self, now):
+        self.round_trips += 1
+        expired = [
+            block_start
+            for block_start, (_, expires_at) in self.reservations.items()
+            if expires_at < now
+        ]
+        for block_start in expired:
+            del self.reservations[block_start]
+        return len(expired)
+
+    def get_job_numbers_between(self, low, high):
+        self.round_trips += 1
+        return [
+            job_number
+            for job_number in self.job_numbers
+            if low <= job_number < high
+        ]
+
+
+class TestJobNumberReservations(unittest.TestCase):
+    def setUp(self):
+        self.database = MockDatabase()
+        self.job_storage = JobNumbers()
+        self.reservations = self.create_reservations("first")
+
+    def create_reservations(self, workstation, job_storage=None):
+        return JobNumberReservations(
+            self.database,
+            job_storage or self.job_storage,
+            workstation=workstation,
+            block_size=5,
+            max_attempts=10,
+        )
+
+    def test_reserve_job_number(self):
+        job_number = self.reservations.reserve_job_number("2301", 102)
+        self.assertEqual(job_number, "23010102")
+        self.assertEqual(list(self.database.reservations), ["23010100"])
+        # The reservation, the check for used numbers and the purge of
+        # expired reservations.
+        self.assertEqual(self.database.round_trips, 3)
+        self.assertEqual(self.database.table_created, 1)
+
+        # The number is kept until it is used.
+        self.assertEqual(
+            self.reservations.reserve_job_number("2301", 102), "23010102"
+        )
+        self.job_storage.add_job_number("23010102")
+        self.assertEqual(
+            self.reservations.reserve_job_number("2301", 103), "23010103"
+        )
+        self.assertEqual(self.database.round_trips, 3)
+        self.assertEqual(self.database.table_created, 1)
+
+    def test_next_block_reserved_when_used_up(self):
+        for job_number in ("23010100", "23010101", "23010102", "23010103"):
+            self.assertEqual(
+                self.reservations.reserve_job_number("2301", 100), job_number
+            )
+            self.job_storage.add_job_number(job_number)
+        self.job_storage.add_job_number("23010104")
+        self.assertEqual(
+            self.reservations.reserve_job_number("2301", 100), "23010105"
+        )
+        self.assertIn("23010105", self.database.reservations)
+
+    def test_workstations_never_share_numbers(self):
+        # Both workstations have the same stale view of the job numbers.
+        other_reservations = self.create_reservations("second", JobNumbers())
+        first = self.reservations.reserve_job_number("2301", 100)
+        second = other_reservations.reserve_job_number("2301", 100)
+        self.assertEqual(first, "23010100")
+        self.assertEqual(second, "23010105")
+
+    def test_expired_reservation_reclaimed(self):
+        expired = datetime.datetime.now() - datetime.timedelta(hours=1)
+        self.database.reservations["23010100"] = ("second", expired)
+        self.database.job_numbers = ["23010100", "23010101"]
+        self.assertEqual(
+            self.reservations.reserve_job_number("2301", 100), "23010102"
+        )
+        self.assertEqual(
+            self.database.reservations["23010100"][0], "first"
+        )
+
+    def test_expired_reservations_deleted(self):
+        expired = datetime.datetime.now() - datetime.timedelta(hours=1)
+        later = datetime.datetime.now() + datetime.timedelta(hours=1)
+        self.database.reservations["22120100"] = ("second", expired)
+        self.database.reservations["23010200"] = ("second", later)
+        self.reservations.reserve_job_number("2301", 100)
+        self.assertEqual(
+            sorted(self.database.reservations), ["23010100", "23010200"]
+        )
+
+    def test_numbers_used_in_deleted_reservation_not_reused(self):
+        # Each workstation only knows the numbers it used itself.
+        first_storage = JobNumbers()
+        first = self.create_reservations("first", first_storage)
+        second = self.create_reservations("second", JobNumbers())
+        job_number = first.reserve_job_number("2301", 100)
+        first_storage.add_job_number(job_number)
+        self.database.job_numbers.append(job_number)
+
+        # The first reservation expires and is purged by another block's
+        # reservation, so the second workstation's INSERT succeeds.
+        expired = datetime.datetime.now() - datetime.timedelta(hours=1)
+        self.database.reservations["23010100"] = ("first", expired)
+        self.database.delete_expired_reservations(datetime.datetime.now())
+        self.assertEqual(second.reserve_job_number("2301", 100), "23010101")
+
+    def test_new_prefix_starts_a_new_block(self):
+        self.reservations.reserve_job_number("2301", 100)
+        self.assertEqual(
+            self.reservations.reserve_job_number("2302", 100), "23020100"
+        )
+
+    def test_no_free_block(self):
+        later = datetime.datetime.now() + datetime.timedelta(hours=1)
+        for sequence in range(100, 150, 5):
+            self.database.reservations[f"2301{sequence:04d}"] = (
+                "second",
+                later,
+            )
+        with self.assertRaises(JobNumberReservationError):
+            self.reservations.reserve_job_number("2301", 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
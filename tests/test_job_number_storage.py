@@ -1,6 +1,8 @@
+import os
+import tempfile
 import unittest
 
-from helpers.job_number_storage import JobNumbers
+from helpers.job_number_storage import JobNumbers, highest_job_number
 
 example_job_numbers = ["16030171", "23010111", "93121259"]
 
@@ -58,6 +60,47 @@ class TestJobNumbers(unittest.TestCase):
         self.assertEqual(len(self.job_numbers.existing_job_numbers), 0)
         self.assertEqual(len(self.job_numbers.active_job_numbers), 0)
 
+    def test_snapshot_round_trip(self):
+        self.job_numbers.add_job_number(example_job_numbers[1])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot_path = os.path.join(temp_dir, "job_numbers.json")
+            self.job_numbers.save_snapshot(snapshot_path)
+
+            loaded_job_numbers = JobNumbers()
+            self.assertTrue(loaded_job_numbers.load_snapshot(snapshot_path))
+        self.assertEqual(
+            loaded_job_numbers.existing_job_numbers, {example_job_numbers[1]}
+        )
+
+    def test_load_missing_snapshot(self):
+        self.assertFalse(self.job_numbers.load_snapshot("missing.json"))
+
+    def test_prefix_index(self):
+        self.job_numbers.add_current_year_job_numbers(
+            [("23010105",), ("23010111",), ("23010107",)]
+        )
+        self.assertEqual(self.job_numbers.highest_sequence("2301"), 111)
+        self.assertIsNone(self.job_numbers.highest_sequence("2302"))
+
+        self.job_numbers.add_existing_job_numbers([("23010112",)])
+        self.assertEqual(self.job_numbers.highest_sequence("2301"), 112)
+
+        self.job_numbers.remove_job_number("23010112")
+        self.assertEqual(self.job_numbers.highest_sequence("2301"), 111)
+
+    def test_next_free_sequence(self):
+        self.job_numbers.add_current_year_job_numbers(
+            [("23010100",), ("23010101",), ("23010103",)]
+        )
+        self.assertEqual(self.job_numbers.next_free_sequence("2301", 100), 102)
+        self.assertEqual(self.job_numbers.next_free_sequence("2301", 103), 104)
+        self.assertEqual(self.job_numbers.next_free_sequence("2302", 100), 100)
+
+    def test_highest_job_number(self):
+        self.assertEqual(
+            highest_job_number(example_job_numbers), example_job_numbers[1]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from helpers.job_number_storage import JobNumbers
+from helpers.job_number_sync import JobNumberSynchronizer
+
+
+class MockDatabase:
+    def __init__(self, active_jobs, existing_jobs):
+        self.tables = {
+            "Active Jobs": active_jobs,
+            "Existing Jobs": existing_jobs,
+        }
+        self.queries = []
+
+    def execute_query(self, query, parameters=None):
+        self.queries.append((query, parameters))
+        table = query.split("[")[2].split("]")[0]
+        job_numbers = self.tables[table]
+        if parameters:
+            job_numbers = [
+                number for number in job_numbers if number > parameters[0]
+            ]
+            if len(parameters) > 1:
+                job_numbers = [
+                    number for number in job_numbers if number < parameters[1]
+                ]
+        return [(number,) for number in job_numbers]
+
+
+class TestJobNumberSynchronizer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.temp_dir.name, "jobs.json")
+        year = datetime.datetime.now().year % 100
+        self.old_number = f"{year:02d}010100"
+        self.new_number = f"{year:02d}010101"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_first_sync_loads_full_tables(self):
+        database = MockDatabase(["93121259"], ["93121259", self.old_number])
+        job_storage = JobNumbers()
+        JobNumberSynchronizer(database, job_storage, self.snapshot_path).sync()
+
+        self.assertEqual(
+            job_storage.existing_job_numbers, {"93121259", self.old_number}
+        )
+        self.assertTrue(os.path.exists(self.snapshot_path))
+        self.assertTrue(all(params is None for _, params in database.queries))
+
+    def test_second_sync_fetches_only_new_rows(self):
+        database = MockDatabase(["93121259"], ["93121259", self.old_number])
+        JobNumberSynchronizer(
+            database, JobNumbers(), self.snapshot_path
+        ).sync()
+
+        database.tables["Existing Jobs"].append(self.new_number)
+        database.queries.clear()
+        job_storage = JobNumbers()
+        JobNumberSynchronizer(database, job_storage, self.snapshot_path).sync()
+
+        self.assertIn(self.new_number, job_storage.existing_job_numbers)
+        self.assertTrue(
+            all(params is not None for _, params in database.queries)
+        )
+
+    def test_full_sync_removes_deleted_job_numbers(self):
+        database = MockDatabase([], [self.old_number, self.new_number])
+        JobNumberSynchronizer(
+            database, JobNumbers(), self.snapshot_path
+        ).sync()
+
+        database.tables["Existing Jobs"].remove(self.old_number)
+        job_storage = JobNumbers()
+        JobNumberSynchronizer(
+            database,
+            job_storage,
+            self.snapshot_path,
+            full_sync_interval=datetime.timedelta(0),
+        ).sync()
+
+        self.assertEqual(job_storage.existing_job_numbers, {self.new_number})
+
+
+if __name__ == "__main__":
+    unittest.main()
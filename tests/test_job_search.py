@@ -0,0 +1,114 @@
+import unittest
+
+from helpers.job_search import JobSearchIndex, tokenize
+
+# job_number, address_number, street, parcel_id, subdivision, contact_info
+example_rows = [
+    ("23010100", "1200", "Oak Ridge Dr", "12-34-56", "Oak Estates", None),
+    ("23020105", "88", "Main St", "78-90-12", "Oakmont", "Jane Smith"),
+    ("99121259", "15", "Oak Ridge Dr", None, "Palm Acres", "Bob Oakley"),
+]
+
+
+class MockDatabase:
+    def __init__(self):
+        self.queries = []
+
+    def stream_query(self, query, parameters=None, batch_size=1000):
+        self.queries.append(query)
+
+        def fetch_batches():
+            for start in range(0, len(example_rows), batch_size):
+                yield example_rows[start:start + batch_size]
+
+        return (), fetch_batches()
+
+
+class TestJobSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = JobSearchIndex()
+        self.index.add_jobs(example_rows)
+
+    def job_numbers(self, query):
+        return [job.job_number for job in self.index.search(query)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Oak Ridge Dr."), ["oak", "ridge", "dr"])
+        self.assertEqual(tokenize(None), [])
+        self.assertEqual(tokenize(1200), ["1200"])
+
+    def test_prefix_search(self):
+        self.assertEqual(self.job_numbers("palm"), ["99121259"])
+        self.assertEqual(self.job_numbers("smi"), ["23020105"])
+        self.assertEqual(self.job_numbers("xyz"), [])
+        self.assertEqual(self.job_numbers(""), [])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.job_numbers("oak 1200"), ["23010100"])
+        self.assertEqual(self.job_numbers("ridge main"), [])
+
+    def test_whole_words_rank_first_then_newest(self):
+        # "oak" is a whole word in the first and third jobs, and only a
+        # prefix of "oakmont" in the second.
+        self.assertEqual(
+            self.job_numbers("oak"), ["23010100", "99121259", "23020105"]
+        )
+
+    def test_short_words_match_whole_words_only(self):
+        self.assertEqual(self.job_numbers("8"), [])
+        self.assertEqual(self.job_numbers("88"), ["23020105"])
+        self.assertEqual(self.job_numbers("oa"), [])
+
+    def test_parcel_id_without_punctuation(self):
+        self.assertEqual(self.job_numbers("123456"), ["23010100"])
+        self.assertEqual(self.job_numbers("12-34"), ["23010100"])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search("oak", limit=1)), 1)
+
+    def test_add_job_replaces_earlier_version(self):
+        self.index.add_job(
+            {"job_number": "23010100", "street": "Cypress Ln"}
+        )
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.job_numbers("cypress"), ["23010100"])
+        self.assertEqual(self.job_numbers("1200"), [])
+        self.assertNotIn("1200", self.index.sorted_tokens)
+
+    def test_remove_job(self):
+        self.index.remove_job("23020105")
+        self.index.remove_job("00000000")
+        self.assertEqual(self.job_numbers("main"), [])
+        self.assertEqual(len(self.index), 2)
+
+    def test_removed_jobs_compacted(self):
+        self.index.remove_job("23010100")
+        self.index.remove_job("23020105")
+        self.assertEqual(self.index.documents, [example_rows[2]])
+        self.assertEqual(self.index.removed_documents, 0)
+        self.assertEqual(self.job_numbers("oak"), ["99121259"])
+        self.index.add_job({"job_number": "23030100", "street": "Oak Ln"})
+        self.assertEqual(self.job_numbers("oak"), ["23030100", "99121259"])
+
+    def test_job_replaced_in_same_batch(self):
+        index = JobSearchIndex()
+        index.add_jobs(
+            [
+                {"job_number": "23010100", "street": "Cypress Ln"},
+                {"job_number": "23010100", "street": "Palm Ln"},
+            ]
+        )
+        self.assertEqual(index.sorted_tokens, sorted(index.postings))
+        self.assertNotIn("cypress", index.sorted_tokens)
+
+    def test_load(self):
+        database = MockDatabase()
+        index = JobSearchIndex()
+        self.assertEqual(index.load(database, batch_size=2, chunk_size=1), 3)
+        self.assertTrue(index.ready.is_set())
+        self.assertIn("[Existing Jobs]", database.queries[0])
+        self.assertEqual(index.sorted_tokens, sorted(index.postings))
+
+
+if __name__ == "__main__":
+    unittest.main()
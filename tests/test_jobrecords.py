@@ -0,0 +1,196 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from helpers.job_number_storage import JobNumbers
+from helpers.sqlite_database import SQLiteDatabaseConnection
+from jobrecords import JobRecords
+from jobrecords.__main__ import main, read_commands
+
+
+class TestJobRecords(unittest.TestCase):
+    def setUp(self):
+        self.database = SQLiteDatabaseConnection()
+        self.job_records = JobRecords(
+            self.database, JobNumbers(), look_up_parcels=False
+        )
+
+    def tearDown(self):
+        self.job_records.close()
+
+    def test_generate_job_numbers(self):
+        first = self.job_records.generate_job_number()
+        second = self.job_records.generate_job_number()
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(first), 8)
+
+    def test_create_and_lookup(self):
+        job = self.job_records.create_job(
+            {"parcel_id": "1", "entry_by": "AB"}
+        )
+        self.assertTrue(job["job_number"])
+        found = self.job_records.lookup_job(job["job_number"])
+        self.assertEqual(found["entry_by"], "AB")
+        self.assertIsNone(self.job_records.lookup_job("99999999"))
+
+    def test_create_taken_job_number(self):
+        job = {"job_number": "23010100", "parcel_id": "1"}
+        self.job_records.create_job(job)
+        result = self.job_records.run_command({"action": "create", **job})
+        self.assertFalse(result["ok"])
+        self.assertIn("taken", result["error"])
+
+    def test_upsert_updates(self):
+        self.job_records.upsert_job({"job_number": "23010100"})
+        self.job_records.upsert_job(
+            {"job_number": "23010100", "entry_by": "CD"}
+        )
+        self.assertEqual(
+            self.job_records.lookup_job("23010100")["entry_by"], "CD"
+        )
+
+    def test_partial_upsert_keeps_other_columns(self):
+        self.job_records.create_job(
+            {"job_number": "23010100", "parcel_id": "1", "entry_by": "AB"}
+        )
+        self.job_records.upsert_job(
+            {"job_number": "23010100", "contact_info": "555-0100"}
+        )
+        job = self.job_records.lookup_job("23010100")
+        self.assertEqual(job["contact_info"], "555-0100")
+        self.assertEqual(job["parcel_id"], "1")
+        self.assertEqual(job["entry_by"], "AB")
+
+    def test_partial_upsert_of_parcel_id_keeps_form_fields(self):
+        self.job_records.create_job(
+            {
+                "job_number": "23010100",
+                "parcel_id": "1",
+                "entry_by": "AB",
+                "contact_info": "555-0100",
+                "additional_info": "notes",
+            }
+        )
+        self.job_records.upsert_job(
+            {"job_number": "23010100", "parcel_id": "2"}
+        )
+        job = self.job_records.lookup_job("23010100")
+        self.assertEqual(job["parcel_id"], "2")
+        self.assertEqual(job["entry_by"], "AB")
+        self.assertEqual(job["contact_info"], "555-0100")
+        self.assertEqual(job["additional_info"], "notes")
+
+    def test_upsert_of_unsynced_job_keeps_other_columns(self):
+        self.job_records.create_job(
+            {"job_number": "23010100", "parcel_id": "1", "entry_by": "AB"}
+        )
+        # A workstation that does not know the job exists.
+        other_job_records = JobRecords(
+            self.database, JobNumbers(), look_up_parcels=False
+        )
+        other_job_records.upsert_job(
+            {"job_number": "23010100", "contact_info": "555-0100"}
+        )
+        job = self.job_records.lookup_job("23010100")
+        self.assertEqual(job["contact_info"], "555-0100")
+        self.assertEqual(job["entry_by"], "AB")
+
+    def test_upsert_without_parcel_id_skips_lookup(self):
+        self.job_records.create_job({"job_number": "23010100"})
+        self.job_records.look_up_parcels = True
+        self.database.fetch_parcel_data = lambda parcel_id: self.fail(
+            "The parcel was looked up."
+        )
+        result = self.job_records.run_command(
+            {"job_number": "23010100", "entry_by": "CD"}
+        )
+        self.assertTrue(result["ok"], result)
+
+    def test_unknown_column(self):
+        result = self.job_records.run_command(
+            {"job_number": "23010100", "bogus": "1"}
+        )
+        self.assertEqual(
+            result, {"ok": False, "error": "Unknown columns: bogus"}
+        )
+
+    def test_run_batch(self):
+        commands = [
+            {"action": "create", "job_number": "23010100"},
+            {"action": "create", "job_number": "23010100"},
+            ValueError("Line 3: expected a JSON object"),
+            {"action": "lookup", "job_number": "23010100"},
+            {"action": "unknown"},
+        ]
+        results = list(self.job_records.run_batch(commands, batch_size=2))
+        self.assertEqual(
+            [result["ok"] for result in results],
+            [True, False, False, True, False],
+        )
+        self.assertEqual(
+            results[2]["error"], "Line 3: expected a JSON object"
+        )
+        self.assertEqual(results[3]["job"]["job_number"], "23010100")
+
+    def test_failed_batch_rolled_back(self):
+        self.database.execute_non_query("DROP TABLE [Active Jobs]")
+        results = list(
+            self.job_records.run_batch(
+                [{"job_number": "23010100"}, {"job_number": "23010101"}]
+            )
+        )
+        self.assertFalse(any(result["ok"] for result in results))
+        self.assertIsNone(self.job_records.lookup_job("23010100"))
+        self.assertFalse(self.job_records.job_numbers_loaded)
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.directory.name, "jobs.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_main(self, *arguments):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(
+                ["--database", self.database_path, "--skip-parcels"]
+                + list(arguments)
+            )
+        results = [
+            json.loads(line) for line in output.getvalue().splitlines()
+        ]
+        return status, results
+
+    def test_create_then_lookup(self):
+        status, results = self.run_main(
+            "create", "job_number=23010100", "entry_by=AB"
+        )
+        self.assertEqual(status, 0)
+        status, results = self.run_main("lookup", "23010100")
+        self.assertEqual(status, 0)
+        self.assertEqual(results[0]["job"]["entry_by"], "AB")
+
+    def test_check_schema(self):
+        self.assertEqual(self.run_main("check-schema"), (0, [{"ok": True}]))
+
+    def test_failure_status(self):
+        status, results = self.run_main("upsert", "bogus=1")
+        self.assertEqual(status, 1)
+        self.assertFalse(results[0]["ok"])
+
+    def test_read_commands(self):
+        commands = list(read_commands(io.StringIO('{"a": 1}\n\n[1]\n{')))
+        self.assertEqual(commands[0], {"a": 1})
+        self.assertEqual(len(commands), 3)
+        self.assertIsInstance(commands[1], ValueError)
+        self.assertTrue(str(commands[2]).startswith("Line 4:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import threading
+import unittest
+
+from helpers.database_connector import JobNumberTakenError
+from helpers.job_number_storage import JobNumbers
+from helpers.sqlite_database import SQLiteDatabaseConnection
+from helpers.submission_journal import JournalFlusher, SubmissionJournal
+from jobrecords import JobRecords
+from jobrecords.client import JobRecordsClient
+from jobrecords.service import JobRecordsService, create_server
+
+
+class LookupDatabase(SQLiteDatabaseConnection):
+    def fetch_parcel_data(self, parcel_id):
+        return {"county": "Lee", "subdivision": f"Subdivision {parcel_id}"}
+
+
+class TestJobRecordsService(unittest.TestCase):
+    def setUp(self):
+        self.database = LookupDatabase()
+        self.database.insert_new_job(
+            {"job_number": "23010100", "parcel_id": "1", "street": "Oak"},
+            parcel_data={},
+        )
+        job_storage = JobNumbers()
+        job_storage.add_job_number("23010100")
+        self.service = JobRecordsService(
+            JobRecords(self.database, job_storage)
+        )
+        self.service.warm_up()
+
+        self.server = create_server(self.service, "127.0.0.1", 0)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,)
+        )
+        self.thread.start()
+        self.client = JobRecordsClient(
+            f"http://127.0.0.1:{self.server.server_port}", timeout=5
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.database.close()
+
+    def test_health(self):
+        health = self.client.health()
+        self.assertTrue(health["ok"])
+        self.assertTrue(health["search_index_ready"])
+
+    def test_job_numbers(self):
+        existing, active = self.client.job_numbers()
+        self.assertEqual(existing, ["23010100"])
+        self.assertEqual(active, ["23010100"])
+
+    def test_generate_job_number(self):
+        first = self.client.generate_job_number()
+        second = self.client.generate_job_number()
+        self.assertNotEqual(first, second)
+
+    def test_get_existing_job(self):
+        job = self.client.get_existing_job("23010100")
+        self.assertEqual(job.parcel_id, "1")
+        self.assertIsNone(self.client.get_existing_job("99999999"))
+
+    def test_search(self):
+        jobs = self.client.search("oak")
+        self.assertEqual([job.job_number for job in jobs], ["23010100"])
+
+    def test_insert_new_job(self):
+        parcel_data = self.client.insert_new_job(
+            {"job_number": "23010101", "parcel_id": "2"},
+            allow_update=False,
+        )
+        self.assertEqual(parcel_data["subdivision"], "Subdivision 2")
+        self.assertEqual(
+            self.database.get_existing_job("23010101").parcel_id, "2"
+        )
+        self.assertEqual(
+            [job.job_number for job in self.client.search("subdivision 2")],
+            ["23010101"],
+        )
+
+    def test_taken_job_number(self):
+        with self.assertRaises(JobNumberTakenError):
+            self.client.insert_new_job(
+                {"job_number": "23010100", "parcel_id": "1"},
+                allow_update=False,
+            )
+
+    def test_changed_fields(self):
+        self.client.insert_new_job(
+            {"job_number": "23010100", "parcel_id": "1", "entry_by": "CD"},
+            parcel_data={},
+            changed_fields=["entry_by"],
+        )
+        job = self.client.get_existing_job("23010100", ("street", "entry_by"))
+        self.assertEqual(job, ("Oak", "CD"))
+
+    def test_invalid_request(self):
+        with self.assertRaises(ValueError):
+            self.client.request("POST", "/jobs", {"parcel_data": {}})
+        self.assertIsNone(self.client.request("GET", "/unknown"))
+
+    def test_run_batch(self):
+        results = self.client.run_batch(
+            [{"action": "create", "parcel_id": "3"}, "not a command"]
+        )
+        self.assertTrue(results[0]["ok"])
+        self.assertFalse(results[1]["ok"])
+
+    def test_journal_flushes_through_client(self):
+        journal = SubmissionJournal(":memory:")
+        journal.append({"job_number": "23010102", "parcel_id": "4"})
+        try:
+            self.assertEqual(JournalFlusher(journal, self.client).flush(), 1)
+        finally:
+            journal.close()
+        existing, _ = self.client.job_numbers()
+        self.assertIn("23010102", existing)
+
+    def test_workload(self):
+        workload = self.client.workload()
+        self.assertEqual(workload["jobs_per_month"], {"2023-01": 1})
+        self.client.insert_new_job(
+            {"job_number": "23020100", "parcel_id": "2"}, parcel_data={}
+        )
+        workload = self.client.workload()
+        self.assertEqual(
+            workload["jobs_per_month"], {"2023-02": 1, "2023-01": 1}
+        )
+        recounted = self.client.workload(recount=True)
+        self.assertEqual(
+            recounted["jobs_per_month"], workload["jobs_per_month"]
+        )
+
+    def test_unreachable_service(self):
+        # Nothing listens on port 1.
+        client = JobRecordsClient("http://127.0.0.1:1", timeout=5)
+        with self.assertRaises(OSError):
+            client.health()
+
+
+if __name__ == "__main__":
+    unittest.main()
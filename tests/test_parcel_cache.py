@@ -0,0 +1,57 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from helpers.parcel_cache import ParcelCache
+
+example_parcel_data = {"subdivision": "Example Estates", "lot": "12"}
+
+
+class TestParcelCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ParcelCache(":memory:", max_entries=2)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("12-34"))
+        self.cache.put("12-34", "Lee", example_parcel_data)
+        self.assertEqual(self.cache.get("12-34"), example_parcel_data)
+        self.assertEqual(self.cache.get("12-34", "Lee"), example_parcel_data)
+        self.assertIsNone(self.cache.get("12-34", "Collier"))
+        self.assertEqual(self.cache.stats["hits"], 2)
+        self.assertEqual(self.cache.stats["misses"], 2)
+
+    def test_least_recently_used_entry_evicted(self):
+        self.cache.put("1", "Lee", example_parcel_data)
+        self.cache.put("2", "Lee", example_parcel_data)
+        self.cache.get("1")
+        self.cache.put("3", "Lee", example_parcel_data)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get("2"))
+        self.assertIsNotNone(self.cache.get("1"))
+
+    def test_expired_entry_is_a_miss(self):
+        cache = ParcelCache(":memory:", time_to_live=datetime.timedelta(0))
+        cache.put("12-34", "Lee", example_parcel_data)
+        self.assertIsNone(cache.get("12-34"))
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_cache_persists_to_disk(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, "parcels.sqlite3")
+            cache = ParcelCache(cache_path)
+            cache.put("12-34", "Lee", example_parcel_data)
+            cache.close()
+
+            cache = ParcelCache(cache_path)
+            self.assertEqual(cache.get("12-34"), example_parcel_data)
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
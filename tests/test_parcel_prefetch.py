@@ -0,0 +1,147 @@
+import datetime
+import threading
+import unittest
+
+from helpers.parcel_prefetch import ParcelPrefetcher
+from helpers.sqlite_database import SQLiteDatabaseConnection
+
+PARCEL_ID = "24-37-01-00-1"
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        del self.timers[timer_id]
+
+    def run_timers(self):
+        timers, self.timers = self.timers, {}
+        for callback in timers.values():
+            callback()
+
+
+class FakeWorker:
+    def __init__(self):
+        self.keys = []
+
+    def submit(self, key, function, *args, on_success=None, on_error=None):
+        self.keys.append(key)
+        on_success(function(*args))
+
+
+class TestParcelPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = FakeScheduler()
+        self.worker = FakeWorker()
+        self.parcel_id = PARCEL_ID
+        self.now = 0.0
+        self.prefetcher = ParcelPrefetcher(
+            self.scheduler,
+            self.worker,
+            lambda: self.parcel_id,
+            lambda parcel_id: {"parcel_id": parcel_id},
+            time_to_live=datetime.timedelta(hours=1),
+            clock=lambda: self.now,
+        )
+
+    def test_debounce(self):
+        for _ in range(5):
+            self.prefetcher.schedule()
+        self.assertEqual(len(self.scheduler.timers), 1)
+        self.scheduler.run_timers()
+        self.assertEqual(self.worker.keys, [f"prefetch:{PARCEL_ID}"])
+
+    def test_incomplete_parcel_id_not_looked_up(self):
+        self.parcel_id = "24-37"
+        self.prefetcher.prefetch()
+        self.assertEqual(self.worker.keys, [])
+
+    def test_held_parcel_not_looked_up_again(self):
+        self.prefetcher.prefetch()
+        self.prefetcher.prefetch()
+        self.assertEqual(len(self.worker.keys), 1)
+
+    def test_take_matching_parcel(self):
+        self.prefetcher.prefetch()
+        self.assertEqual(
+            self.prefetcher.take(f" {PARCEL_ID} "), {"parcel_id": PARCEL_ID}
+        )
+        # Taken once only.
+        self.assertIsNone(self.prefetcher.take(PARCEL_ID))
+
+    def test_take_other_parcel(self):
+        self.prefetcher.prefetch()
+        self.assertIsNone(self.prefetcher.take("24-37-01-00-2"))
+        self.assertIsNone(self.prefetcher.take(PARCEL_ID))
+
+    def test_expired_parcel(self):
+        self.prefetcher.prefetch()
+        self.now += 2 * 60 * 60
+        self.assertIsNone(self.prefetcher.take(PARCEL_ID))
+        # An expired parcel is looked up again.
+        self.prefetcher.prefetch()
+        self.now += 60
+        self.prefetcher.prefetch()
+        self.assertEqual(len(self.worker.keys), 2)
+
+
+class JoinedLookups(dict):
+    """Sets an event when a lookup in progress is found."""
+
+    def __init__(self):
+        super().__init__()
+        self.joined = threading.Event()
+
+    def get(self, key, default=None):
+        lookup = super().get(key, default)
+        if lookup is not None:
+            self.joined.set()
+        return lookup
+
+
+class SlowLookupDatabase(SQLiteDatabaseConnection):
+    def __init__(self):
+        super().__init__()
+        self.parcel_lookups = JoinedLookups()
+        self.lookups = 0
+        self.started = threading.Event()
+
+    def look_up_parcel(self, parcel_id):
+        self.lookups += 1
+        self.started.set()
+        # Finishes only once the second caller has joined the lookup.
+        self.parcel_lookups.joined.wait(5)
+        return {"county": "Lee"}
+
+
+class TestSharedParcelLookup(unittest.TestCase):
+    def test_lookup_in_progress_is_joined(self):
+        database = SlowLookupDatabase()
+        results = []
+
+        def fetch():
+            results.append(database.fetch_parcel_data(PARCEL_ID))
+
+        prefetch = threading.Thread(target=fetch)
+        prefetch.start()
+        database.started.wait(5)
+        submit = threading.Thread(target=fetch)
+        submit.start()
+        prefetch.join(5)
+        submit.join(5)
+        database.close()
+
+        self.assertEqual(database.lookups, 1)
+        self.assertEqual(results, [{"county": "Lee"}] * 2)
+        self.assertIsNot(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from config import ACTIVE_DB_COLUMN_ORDER, EXISTING_DB_COLUMN_ORDER
+from helpers.records import (
+    ActiveJob,
+    ExistingJob,
+    has_fields,
+    project,
+    record_type,
+    to_records,
+)
+from helpers.sql_statements import EXISTING_JOBS
+
+
+class TestRecords(unittest.TestCase):
+    def test_record_types_follow_column_order(self):
+        self.assertEqual(ExistingJob._fields, tuple(EXISTING_DB_COLUMN_ORDER))
+        self.assertEqual(ActiveJob._fields, tuple(ACTIVE_DB_COLUMN_ORDER))
+        self.assertEqual(ExistingJob.__slots__, ())
+
+    def test_record_type_is_reused(self):
+        columns = ("job_number", "parcel_id")
+        self.assertIs(
+            record_type(EXISTING_JOBS, columns),
+            record_type(EXISTING_JOBS, columns),
+        )
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            record_type(EXISTING_JOBS, ("job_number", "fema_map"))
+
+    def test_to_records(self):
+        records = to_records(
+            EXISTING_JOBS,
+            [("23010100", "12-34"), ("23010101", None)],
+            ("job_number", "parcel_id"),
+        )
+        self.assertEqual(records[0].job_number, "23010100")
+        self.assertEqual(records[0].parcel_id, "12-34")
+        self.assertIsNone(records[1].parcel_id)
+
+    def test_project(self):
+        (record,) = to_records(
+            EXISTING_JOBS,
+            [("23010100", "12-34", "PD")],
+            ("job_number", "parcel_id", "entry_by"),
+        )
+        self.assertTrue(has_fields(record, ("entry_by", "job_number")))
+        self.assertFalse(has_fields(record, ("contact_info",)))
+
+        projected = project(record, EXISTING_JOBS, ("entry_by",))
+        self.assertEqual(projected._fields, ("entry_by",))
+        self.assertEqual(projected.entry_by, "PD")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from helpers.row_cache import JobRowCache
+
+example_row = ("23010100", "Example Estates", "12")
+
+
+class TestJobRowCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = JobRowCache(max_entries=2)
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("23010100"))
+        self.cache.put("23010100", example_row)
+        self.assertEqual(self.cache.get("23010100"), example_row)
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertEqual(self.cache.stats["misses"], 1)
+        self.assertEqual(self.cache.stats["hit_rate"], 0.5)
+
+    def test_least_recently_used_row_evicted(self):
+        self.cache.put("1", example_row)
+        self.cache.put("2", example_row)
+        self.cache.get("1")
+        self.cache.put("3", example_row)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get("1"))
+        self.assertIsNone(self.cache.get("2"))
+
+    def test_invalidate(self):
+        self.cache.put("23010100", example_row)
+        self.cache.invalidate("23010100")
+        self.cache.invalidate("23010101")
+        self.assertIsNone(self.cache.get("23010100"))
+
+    def test_row_read_before_invalidation_not_cached(self):
+        generation = self.cache.generation
+        self.cache.invalidate("23010100")
+        self.cache.put("23010100", example_row, since=generation)
+        self.assertIsNone(self.cache.get("23010100"))
+        # Other jobs, and rows read after the invalidation, are cached.
+        self.cache.put("23010101", example_row, since=generation)
+        self.assertIsNotNone(self.cache.get("23010101"))
+        self.cache.put(
+            "23010100", example_row, since=self.cache.generation
+        )
+        self.assertIsNotNone(self.cache.get("23010100"))
+
+    def test_row_read_before_forgotten_invalidation_not_cached(self):
+        generation = self.cache.generation
+        for job_number in ("1", "2", "3"):
+            self.cache.invalidate(job_number)
+        self.cache.put("1", example_row, since=generation)
+        self.assertIsNone(self.cache.get("1"))
+
+    def test_row_read_before_clear_not_cached(self):
+        generation = self.cache.generation
+        self.cache.clear()
+        self.cache.put("1", example_row, since=generation)
+        self.assertIsNone(self.cache.get("1"))
+
+    def test_clear(self):
+        self.cache.put("1", example_row)
+        self.cache.put("2", example_row)
+        self.cache.clear()
+        self.assertEqual(self.cache.stats["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
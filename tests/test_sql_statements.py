@@ -0,0 +1,91 @@
+import unittest
+
+from helpers.sql_statements import (
+    ACTIVE_JOBS,
+    EXISTING_JOBS,
+    RESERVATIONS,
+    count_statement,
+    delete_statement,
+    insert_statement,
+    page_statement,
+    select_statement,
+    update_statement,
+)
+
+
+class TestSqlStatements(unittest.TestCase):
+    def test_insert_statement(self):
+        self.assertEqual(
+            insert_statement(EXISTING_JOBS),
+            "INSERT INTO [Existing Jobs] VALUES (" + ",".join("?" * 16) + ")",
+        )
+        self.assertEqual(insert_statement(ACTIVE_JOBS).count("?"), 18)
+
+    def test_update_statement(self):
+        self.assertEqual(
+            update_statement(EXISTING_JOBS, ("parcel_id", "entry_by")),
+            "UPDATE [Existing Jobs] SET [Parcel ID] = ?, [Entry By] = ?"
+            " WHERE [Job Number] = ?",
+        )
+
+    def test_delete_statement(self):
+        self.assertEqual(
+            delete_statement(
+                RESERVATIONS, (("block_start", "="), ("expires_at", "<"))
+            ),
+            "DELETE FROM [Job Number Reservations]"
+            " WHERE [Block Start] = ? AND [Expires At] < ?",
+        )
+        with self.assertRaises(ValueError):
+            delete_statement(RESERVATIONS, ())
+
+    def test_select_statement(self):
+        self.assertEqual(
+            select_statement(
+                EXISTING_JOBS, ("job_number",), (("job_number", "LIKE"),)
+            ),
+            "SELECT [Job Number] FROM [Existing Jobs]"
+            " WHERE [Job Number] LIKE ?",
+        )
+        self.assertEqual(
+            select_statement(ACTIVE_JOBS), "SELECT * FROM [Active Jobs]"
+        )
+
+    def test_count_statement(self):
+        self.assertEqual(
+            count_statement(ACTIVE_JOBS, (("inhouse_status", "="),)),
+            "SELECT COUNT(*) FROM [Active Jobs] WHERE [Inhouse Status] = ?",
+        )
+
+    def test_page_statement(self):
+        self.assertEqual(
+            page_statement(
+                ACTIVE_JOBS, ("job_number",), (), "job_number", "job_number"
+            ),
+            "SELECT [Job Number] FROM [Active Jobs] ORDER BY [Job Number]",
+        )
+        self.assertEqual(
+            page_statement(
+                ACTIVE_JOBS,
+                ("job_number",),
+                (("invoice_status", "="),),
+                "fieldwork_date",
+                "job_number",
+                after="value",
+            ),
+            "SELECT [Job Number] FROM [Active Jobs]"
+            " WHERE [Invoice Status] = ?"
+            " AND ([Fieldwork Date] > ? OR ([Fieldwork Date] = ?"
+            " AND [Job Number] > ?))"
+            " ORDER BY [Fieldwork Date], [Job Number]",
+        )
+
+    def test_statements_are_built_once(self):
+        self.assertIs(
+            select_statement(EXISTING_JOBS, ("job_number",)),
+            select_statement(EXISTING_JOBS, ("job_number",)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
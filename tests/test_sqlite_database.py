@@ -0,0 +1,245 @@
+import datetime
+import unittest
+
+from config import ACTIVE_DB_COLUMN_ORDER, EXISTING_DB_COLUMN_ORDER
+from helpers.database_connector import JobNumberTakenError, changed_columns
+from helpers.sql_statements import ACTIVE_JOBS, EXISTING_JOBS, insert_statement
+from helpers.sqlite_database import SQLiteDatabaseConnection
+
+example_job = {
+    "job_number": "23010100",
+    "parcel_id": "24-37-01-00-1",
+    "entry_by": "AB",
+    "contact_info": "555-0100",
+}
+
+
+class TestSQLiteDatabaseConnection(unittest.TestCase):
+    def setUp(self):
+        self.database = SQLiteDatabaseConnection()
+
+    def tearDown(self):
+        self.database.close()
+
+    def test_insert_new_job(self):
+        self.database.insert_new_job(dict(example_job), parcel_data={})
+        job = self.database.get_existing_job("23010100")
+        self.assertEqual(job.parcel_id, "24-37-01-00-1")
+        self.assertEqual(
+            self.database.get_job_numbers_with_prefix("2301", "Active Jobs"),
+            [("23010100",)],
+        )
+
+    def test_insert_new_job_updates_existing_job(self):
+        self.database.insert_new_job(dict(example_job), parcel_data={})
+        self.database.insert_new_job(
+            {**example_job, "entry_by": "CD"}, parcel_data={}
+        )
+        self.assertEqual(
+            self.database.get_existing_job("23010100").entry_by, "CD"
+        )
+
+    def test_insert_new_job_updates_active_job(self):
+        self.database.insert_new_job(dict(example_job), parcel_data={})
+        self.database.insert_new_job(
+            {**example_job, "contact_info": "555-0199"},
+            parcel_data={},
+            in_existing_jobs=True,
+            in_active_jobs=True,
+        )
+        self.assertEqual(
+            self.database.execute_query(
+                "SELECT [Customer Contact Information] FROM [Active Jobs]"
+            ),
+            [("555-0199",)],
+        )
+
+    def test_insert_new_job_commits_once(self):
+        self.database.insert_new_job(dict(example_job), parcel_data={})
+        self.database.job_cache.clear()
+        commits = []
+        with self.database.checkout() as connection:
+            connection.commit = lambda: commits.append(True)
+            self.database.insert_new_job(
+                dict(example_job),
+                parcel_data={},
+                in_existing_jobs=True,
+                in_active_jobs=True,
+            )
+        self.assertEqual(commits, [])
+        with self.database.transaction() as connection:
+            connection.commit = lambda: commits.append(True)
+            self.database.insert_new_job(
+                dict(example_job),
+                parcel_data={},
+                in_existing_jobs=True,
+                in_active_jobs=True,
+            )
+        self.assertEqual(commits, [True])
+
+    def test_insert_new_job_with_stale_job_numbers(self):
+        # Known to exist, but missing: the update changes nothing, so the
+        # job is inserted instead.
+        self.database.insert_new_job(
+            dict(example_job),
+            parcel_data={},
+            in_existing_jobs=True,
+            in_active_jobs=True,
+        )
+        self.assertIsNotNone(self.database.get_existing_job("23010100"))
+        # Known to be new, but already there: the insert clashes, so the
+        # job is updated instead.
+        self.database.insert_new_job(
+            {**example_job, "entry_by": "CD"},
+            parcel_data={},
+            in_existing_jobs=False,
+            in_active_jobs=False,
+        )
+        self.assertEqual(
+            self.database.get_existing_job("23010100").entry_by, "CD"
+        )
+
+    def test_insert_new_job_updates_changed_columns_only(self):
+        self.database.insert_new_job(dict(example_job), parcel_data={})
+        statements = []
+        with self.database.checkout() as connection:
+            connection.set_trace_callback(statements.append)
+            self.database.insert_new_job(
+                {**example_job, "entry_by": "CD", "contact_info": "other"},
+                parcel_data={},
+                in_existing_jobs=True,
+                in_active_jobs=True,
+                changed_fields=["entry_by"],
+            )
+            connection.set_trace_callback(None)
+        updates = [
+            statement
+            for statement in statements
+            if statement.startswith("UPDATE [Existing Jobs]")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("[Entry By]", updates[0])
+        self.assertNotIn("[Parcel ID]", updates[0])
+        self.database.job_cache.clear()
+        job = self.database.get_existing_job("23010100")
+        self.assertEqual(job.entry_by, "CD")
+        self.assertEqual(job.contact_info, "555-0100")
+        # entry_by is not an Active Jobs column, so nothing is rewritten
+        # there.
+        self.assertFalse(
+            [
+                statement
+                for statement in statements
+                if statement.startswith("UPDATE [Active Jobs]")
+            ]
+        )
+
+    def test_unchanged_job_missing_from_table_is_inserted(self):
+        self.database.insert_new_job(
+            dict(example_job),
+            parcel_data={},
+            in_existing_jobs=True,
+            in_active_jobs=True,
+            changed_fields=[],
+        )
+        self.assertIsNotNone(self.database.get_existing_job("23010100"))
+
+    def test_changed_columns(self):
+        self.assertIsNone(changed_columns(EXISTING_JOBS, None))
+        self.assertEqual(
+            changed_columns(EXISTING_JOBS, ["entry_by"]), ("entry_by",)
+        )
+        # A new parcel ID brings new parcel data with it, but form fields
+        # that were not given are kept.
+        columns = changed_columns(EXISTING_JOBS, ["parcel_id"])
+        self.assertIn("parcel_id", columns)
+        self.assertIn("subdivision", columns)
+        self.assertNotIn("entry_by", columns)
+        self.assertNotIn("contact_info", columns)
+
+    def test_job_number_taken(self):
+        self.database.insert_new_job(dict(example_job), parcel_data={})
+        with self.assertRaises(JobNumberTakenError):
+            self.database.insert_new_job(
+                {**example_job, "entry_by": "CD"},
+                parcel_data={},
+                allow_update=False,
+            )
+        # Nothing is written when the job number is taken.
+        self.assertEqual(
+            self.database.get_existing_job("23010100").entry_by, "AB"
+        )
+
+    def test_insert_jobs(self):
+        rows = [
+            {
+                **dict.fromkeys(EXISTING_DB_COLUMN_ORDER),
+                **dict.fromkeys(ACTIVE_DB_COLUMN_ORDER),
+                **example_job,
+                "job_number": f"2301{sequence:04d}",
+            }
+            for sequence in range(5)
+        ]
+        self.database.insert_jobs(rows)
+        self.assertEqual(
+            self.database.get_job_numbers_between("23010001", "23010004"),
+            ["23010001", "23010002", "23010003"],
+        )
+
+    def test_job_numbers_between_include_active_jobs(self):
+        self.database.insert_new_job(dict(example_job), parcel_data={})
+        # A job that is only in Active Jobs.
+        self.database.execute_non_query(
+            insert_statement(ACTIVE_JOBS),
+            [
+                "23010101" if column == "job_number" else None
+                for column in ACTIVE_DB_COLUMN_ORDER
+            ],
+        )
+        self.assertEqual(
+            self.database.get_job_numbers_between("23010100", "23010110"),
+            ["23010100", "23010101"],
+        )
+
+    def test_reservations(self):
+        now = datetime.datetime(2023, 1, 1)
+        self.database.create_reservation_table()
+        self.assertTrue(
+            self.database.insert_reservation(
+                "23010100", "desk", now, now + datetime.timedelta(hours=1)
+            )
+        )
+        self.assertFalse(
+            self.database.insert_reservation(
+                "23010100", "desk", now, now + datetime.timedelta(hours=1)
+            )
+        )
+        later = now + datetime.timedelta(hours=2)
+        self.assertTrue(
+            self.database.delete_expired_reservation("23010100", later)
+        )
+        self.database.insert_reservation(
+            "23010110", "desk", now, now + datetime.timedelta(hours=1)
+        )
+        self.database.insert_reservation(
+            "23010120", "desk", now, now + datetime.timedelta(hours=3)
+        )
+        self.assertEqual(self.database.delete_expired_reservations(later), 1)
+
+    def test_missing_columns(self):
+        self.assertEqual(self.database.missing_columns(), {})
+        self.database.execute_non_query(
+            "ALTER TABLE [Active Jobs] RENAME COLUMN"
+            " [Customer Contact Information] TO [Contact Information]"
+        )
+        self.assertIn(
+            "Contact Information", self.database.table_columns("Active Jobs")
+        )
+        self.assertEqual(
+            self.database.missing_columns(),
+            {"Active Jobs": ["Customer Contact Information"]},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
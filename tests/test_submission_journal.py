@@ -0,0 +1,211 @@
+import sqlite3
+import unittest
+
+from helpers.sqlite_database import SQLiteDatabaseConnection
+from helpers.submission_journal import JournalFlusher, SubmissionJournal
+
+
+class LookupDatabase(SQLiteDatabaseConnection):
+    def fetch_parcel_data(self, parcel_id):
+        if parcel_id == "bad":
+            raise ValueError("Parcel not found")
+        return {"county": "Lee", "subdivision": f"Subdivision {parcel_id}"}
+
+
+class TruncatingDatabase(LookupDatabase):
+    """Rejects a job whose additional information is too long."""
+
+    def insert_new_job(self, user_inputs, *args, **kwargs):
+        parcel_data = super().insert_new_job(user_inputs, *args, **kwargs)
+        if len(user_inputs.get("additional_info") or "") > 255:
+            raise sqlite3.DataError("String data, right truncation")
+        return parcel_data
+
+
+def example_inputs(job_number="23010100", **values):
+    return {"job_number": job_number, "parcel_id": "1", **values}
+
+
+class TestSubmissionJournal(unittest.TestCase):
+    def setUp(self):
+        self.journal = SubmissionJournal(":memory:")
+
+    def tearDown(self):
+        self.journal.close()
+
+    def test_append_and_pending(self):
+        self.journal.append(example_inputs("23010100"), {"county": "Lee"})
+        self.journal.append(example_inputs("23010101"), in_existing_jobs=True)
+        entries = self.journal.pending()
+        self.assertEqual(
+            [entry.job_number for entry in entries], ["23010100", "23010101"]
+        )
+        self.assertEqual(entries[0].parcel_data, {"county": "Lee"})
+        self.assertIsNone(entries[0].in_existing_jobs)
+        self.assertTrue(entries[1].in_existing_jobs)
+        self.assertEqual(self.journal.depth, 2)
+
+    def test_resubmission_replaces_waiting_entry(self):
+        self.journal.append(example_inputs("23010100"), allow_update=False)
+        self.journal.append(example_inputs("23010101"))
+        self.journal.append(
+            example_inputs("23010100", entry_by="CD"), allow_update=True
+        )
+        entries = self.journal.pending()
+        self.assertEqual(self.journal.depth, 2)
+        self.assertEqual(entries[0].user_inputs["entry_by"], "CD")
+        # The entry keeps its place and how the job was first found.
+        self.assertEqual(entries[0].job_number, "23010100")
+        self.assertFalse(entries[0].allow_update)
+
+    def test_changed_fields(self):
+        self.journal.append(example_inputs(), changed_fields={"entry_by"})
+        self.assertEqual(
+            self.journal.pending()[0].changed_fields, ["entry_by"]
+        )
+        # A replaced entry rewrites every column, so no change is lost.
+        self.journal.append(example_inputs(), changed_fields={"lot"})
+        self.assertIsNone(self.journal.pending()[0].changed_fields)
+
+    def test_replaced_entry_not_removed(self):
+        self.journal.append(example_inputs())
+        entries = self.journal.pending()
+        self.journal.append(example_inputs(entry_by="CD"))
+        self.journal.remove(entries)
+        self.assertEqual(self.journal.depth, 1)
+        self.journal.remove(self.journal.pending())
+        self.assertEqual(self.journal.depth, 0)
+
+
+class TestJournalFlusher(unittest.TestCase):
+    def setUp(self):
+        self.journal = SubmissionJournal(":memory:")
+        self.database = LookupDatabase()
+        self.flusher = JournalFlusher(
+            self.journal, self.database, batch_size=2, max_attempts=2
+        )
+
+    def tearDown(self):
+        self.journal.close()
+        self.database.close()
+
+    def results(self):
+        results = []
+        while not self.flusher.results.empty():
+            results.append(self.flusher.results.get())
+        return results
+
+    def test_flush_writes_batches(self):
+        for sequence in range(5):
+            self.journal.append(example_inputs(f"2301{sequence:04d}"))
+        self.assertEqual(self.flusher.flush(), 5)
+        self.assertEqual(self.journal.depth, 0)
+        self.assertEqual(
+            self.database.execute_query("SELECT COUNT(*) FROM [Active Jobs]"),
+            [(5,)],
+        )
+        self.assertEqual(
+            self.database.get_existing_job("23010000").parcel_id, "1"
+        )
+        results = self.results()
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0][0]["subdivision"], "Subdivision 1")
+
+    def test_flushing_twice_is_harmless(self):
+        self.journal.append(example_inputs())
+        entries = self.journal.pending()
+        self.flusher.flush()
+        # Written again, e.g. after the journal could not be updated.
+        self.flusher.write_batch(entries)
+        self.assertEqual(
+            self.database.get_job_numbers_with_prefix("2301"),
+            [("23010100",)],
+        )
+
+    def test_taken_job_number_set_aside(self):
+        self.database.insert_new_job(
+            example_inputs(entry_by="AB"), parcel_data={}
+        )
+        self.journal.append(example_inputs(), allow_update=False)
+        self.journal.append(example_inputs("23010101"))
+        self.assertEqual(self.flusher.flush(), 1)
+        self.assertEqual(self.journal.depth, 0)
+        self.assertEqual(
+            [job_number for job_number, _ in self.journal.failed()],
+            ["23010100"],
+        )
+        failures = [
+            (result, error) for result, error in self.results() if error
+        ]
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0][0], "23010100")
+
+    def test_new_job_written_before_is_not_set_aside(self):
+        # The entry was committed, but not removed from the journal.
+        self.journal.append(example_inputs(entry_by="AB"), allow_update=False)
+        self.database.insert_new_job(
+            example_inputs(entry_by="AB"), self.database.fetch_parcel_data("1")
+        )
+        self.assertEqual(self.flusher.flush(), 1)
+        self.assertEqual(self.journal.depth, 0)
+        self.assertEqual(self.journal.failed(), [])
+        self.assertEqual([error for _, error in self.results()], [None])
+
+    def test_failed_lookup_retried_then_set_aside(self):
+        self.journal.append({"job_number": "23010100", "parcel_id": "bad"})
+        self.assertEqual(self.flusher.flush(), 0)
+        self.assertEqual(self.journal.depth, 1)
+        self.assertEqual(self.flusher.flush(), 0)
+        self.assertEqual(self.journal.depth, 0)
+        self.assertEqual(len(self.journal.failed()), 1)
+
+    def test_bad_entry_does_not_block_batch(self):
+        self.database.close()
+        self.database = TruncatingDatabase()
+        self.flusher.database = self.database
+        self.journal.append(example_inputs("23010100"))
+        self.journal.append(
+            example_inputs("23010101", additional_info="x" * 300)
+        )
+        self.journal.append(example_inputs("23010102"))
+        self.assertEqual(self.flusher.flush(), 2)
+        self.assertEqual(self.journal.depth, 1)
+        self.assertEqual(
+            self.database.get_job_numbers_with_prefix("2301"),
+            [("23010100",), ("23010102",)],
+        )
+        # The bad entry is tried again, then set aside.
+        self.assertEqual(self.flusher.flush(), 0)
+        self.assertEqual(self.journal.depth, 0)
+        self.assertEqual(
+            [job_number for job_number, _ in self.journal.failed()],
+            ["23010101"],
+        )
+
+    def test_taken_job_number_in_rewritten_batch_reported_once(self):
+        self.database.close()
+        self.database = TruncatingDatabase()
+        self.flusher.database = self.database
+        self.database.insert_new_job(
+            example_inputs(entry_by="AB"), parcel_data={}
+        )
+        self.journal.append(example_inputs(), allow_update=False)
+        self.journal.append(
+            example_inputs("23010101", additional_info="x" * 300)
+        )
+        self.assertEqual(self.flusher.flush(), 0)
+        failures = [result for result, error in self.results() if error]
+        self.assertEqual(failures, ["23010100"])
+
+    def test_database_error_keeps_batch(self):
+        self.journal.append(example_inputs())
+        self.database.execute_non_query("DROP TABLE [Active Jobs]")
+        with self.assertRaises(Exception):
+            self.flusher.flush()
+        self.assertEqual(self.journal.depth, 1)
+        # The transaction was rolled back, so nothing was half written.
+        self.assertIsNone(self.database.get_existing_job("23010100"))
+
+
+if __name__ == "__main__":
+    unittest.main()
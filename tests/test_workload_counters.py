@@ -0,0 +1,130 @@
+import unittest
+
+from config import ACTIVE_DB_COLUMN_ORDER, EXISTING_DB_COLUMN_ORDER
+from helpers.sqlite_database import SQLiteDatabaseConnection
+from helpers.workload_counters import BLANK, WorkloadCounters, job_month
+
+
+def make_job(job_number, inhouse_status=None, invoice_status=None):
+    job = dict.fromkeys(EXISTING_DB_COLUMN_ORDER + ACTIVE_DB_COLUMN_ORDER)
+    job["job_number"] = job_number
+    job["inhouse_status"] = inhouse_status
+    job["invoice_status"] = invoice_status
+    return job
+
+
+class TestWorkloadCounters(unittest.TestCase):
+    def setUp(self):
+        self.database = SQLiteDatabaseConnection()
+        self.database.insert_jobs(
+            [
+                make_job("23010100", "Drafting", "Unpaid"),
+                make_job("23010101", "Field", "Unpaid"),
+                make_job("23020100", "Drafting"),
+            ]
+        )
+        self.workload = self.database.workload
+        self.workload.build(self.database, batch_size=2)
+
+    def tearDown(self):
+        self.database.close()
+
+    def test_job_month(self):
+        self.assertEqual(job_month("23010105"), "2023-01")
+        self.assertEqual(job_month("23130105"), BLANK)
+        self.assertEqual(job_month("F-100"), BLANK)
+
+    def test_build(self):
+        workload = self.workload.snapshot()
+        self.assertEqual(
+            workload["jobs_per_month"], {"2023-02": 1, "2023-01": 2}
+        )
+        self.assertEqual(
+            workload["inhouse_status"], {"Drafting": 2, "Field": 1}
+        )
+        self.assertEqual(workload["invoice_status"], {"Unpaid": 2, BLANK: 1})
+        self.assertEqual(workload["active_jobs"], 3)
+
+    def test_not_built(self):
+        workload = WorkloadCounters()
+        workload.record("Active Jobs", "23010100", {"inhouse_status": "A"})
+        self.assertIsNone(workload.snapshot())
+
+    def test_insert_new_job(self):
+        self.database.insert_new_job(
+            {"job_number": "23020101", "inhouse_status": "Field"},
+            parcel_data={},
+        )
+        workload = self.workload.snapshot()
+        self.assertEqual(workload["jobs_per_month"]["2023-02"], 2)
+        self.assertEqual(workload["inhouse_status"]["Field"], 2)
+        self.assertEqual(workload["invoice_status"][BLANK], 2)
+
+    def test_status_change_moves_job(self):
+        self.database.insert_new_job(
+            {"job_number": "23010100", "inhouse_status": "Field"},
+            parcel_data={},
+            in_existing_jobs=True,
+            in_active_jobs=True,
+            changed_fields=["inhouse_status"],
+        )
+        workload = self.workload.snapshot()
+        self.assertEqual(
+            workload["inhouse_status"], {"Field": 2, "Drafting": 1}
+        )
+        # The invoice status was not written, so it is still counted.
+        self.assertEqual(workload["invoice_status"], {"Unpaid": 2, BLANK: 1})
+        self.assertEqual(workload["jobs_per_month"]["2023-01"], 2)
+        self.assertEqual(self.workload.snapshot(), self.rebuilt())
+
+    def test_update_existing_job(self):
+        self.database.update_existing_job(make_job("23010100"))
+        self.assertEqual(self.workload.snapshot(), self.rebuilt())
+
+    def test_rolled_back_write_is_not_counted(self):
+        with self.assertRaises(RuntimeError):
+            with self.database.transaction():
+                self.database.insert_new_job(
+                    {"job_number": "23030100", "inhouse_status": "Field"},
+                    parcel_data={},
+                )
+                raise RuntimeError("Rolled back")
+        self.assertEqual(self.workload.snapshot(), self.rebuilt())
+        self.assertNotIn("2023-03", self.workload.snapshot()["jobs_per_month"])
+
+    def test_write_during_build(self):
+        class WritingDatabase:
+            """Writes a job after the build has read the tables."""
+
+            def __init__(self, database):
+                self.database = database
+
+            def stream_query(self, *args, **kwargs):
+                description, batches = self.database.stream_query(
+                    *args, **kwargs
+                )
+                rows = list(batches)
+                if "Active Jobs" in args[0]:
+                    self.database.insert_new_job(
+                        {"job_number": "23030100", "inhouse_status": "New"},
+                        parcel_data={},
+                    )
+                return description, iter(rows)
+
+        self.workload.build(WritingDatabase(self.database))
+        workload = self.workload.snapshot()
+        self.assertEqual(workload["jobs_per_month"]["2023-03"], 1)
+        self.assertEqual(workload["inhouse_status"]["New"], 1)
+        self.assertEqual(workload, self.rebuilt())
+
+    def rebuilt(self) -> dict:
+        """Returns the counts taken from the tables as they are now."""
+        workload = WorkloadCounters()
+        workload.build(self.database)
+        snapshot = workload.snapshot()
+        snapshot["counted_at"] = self.workload.snapshot()["counted_at"]
+        return snapshot
+
+
+if __name__ == "__main__":
+    unittest.main()